@@ -2,7 +2,6 @@
 FinOps360 Cost Analysis - Main Entry Point
 Run with: python -m app
 """
-import uvicorn
 import os
 import sys
 import argparse
@@ -24,9 +23,17 @@ def main():
     parser.add_argument(
         "--reload", action="store_true", help="Enable auto-reload for development"
     )
+    parser.add_argument(
+        "--no-cache", action="store_true", help="Always run BigQuery queries instead of using cached results"
+    )
     
     args = parser.parse_args()
     
+    # Workers are separate processes, so pass the cache switch through the environment
+    if args.no_cache:
+        from app.utils.db import NO_QUERY_CACHE_ENV
+        os.environ[NO_QUERY_CACHE_ENV] = "1"
+    
     # Set default workers based on CPU count
     if args.workers is None:
         import multiprocessing
@@ -38,8 +45,12 @@ def main():
     print(f"Starting server on http://{args.host}:{args.port}")
     print(f"Workers: {args.workers}")
     print(f"Auto-reload: {'Enabled' if args.reload else 'Disabled'}")
+    print(f"Query cache: {'Disabled' if args.no_cache else 'Enabled'}")
     print()
     
+    # Imported only once the arguments are parsed, so --help returns immediately
+    import uvicorn
+    
     # Run the server
     uvicorn.run(
         "app.core.app:app", 
@@ -3,6 +3,8 @@ FastAPI application for FinOps360 cost analysis dashboard.
 """
 import os
 import logging
+import threading
+from contextlib import asynccontextmanager
 from pathlib import Path
 from typing import Dict, Any, Optional
 
@@ -13,8 +15,9 @@ from fastapi.staticfiles import StaticFiles
 from google.cloud import bigquery
 
 from app.utils.config_loader import load_config
+from app.utils.db import get_bqstorage_client
 from app.utils.chart.config import are_charts_enabled
-from app.core.dashboard import generate_html_report_async
+from app.core.dashboard import generate_html_report_async, preload_template
 from app.utils.filter_utils import get_filter_defaults_from_config
 
 # Configure logging
@@ -24,17 +27,28 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Setup paths
+BASE_DIR = Path(__file__).resolve().parent.parent
+APP_DIR = BASE_DIR
+DASHBOARD_TEMPLATE_PATH = str(APP_DIR / "templates" / "dashboard_template.html")
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Compile the dashboard template at startup so the first request does not pay for it"""
+    try:
+        preload_template(DASHBOARD_TEMPLATE_PATH)
+    except Exception as e:
+        logger.warning(f"Could not preload dashboard template: {e}")
+    yield
+
 # Initialize FastAPI app
 app = FastAPI(
     title="FinOps360 Cost Analysis Dashboard",
     description="FastAPI application for cost analysis dashboard",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan
 )
 
-# Setup paths
-BASE_DIR = Path(__file__).resolve().parent.parent
-APP_DIR = BASE_DIR
-
 # Setup templates
 templates = Jinja2Templates(directory=str(APP_DIR / "templates"))
 
@@ -44,14 +58,25 @@ if not static_dir.exists():
     static_dir.mkdir(exist_ok=True)
 app.mount("/static", StaticFiles(directory=str(static_dir)), name="static")
 
+# BigQuery client shared by all requests, so its authorized HTTP session and
+# connection pool (and the TLS connections in it) are reused across renders
+_bigquery_client: Optional[bigquery.Client] = None
+_bigquery_client_lock = threading.Lock()
+
 # BigQuery client dependency
 def get_bigquery_client():
     """Dependency to get authorized BigQuery client"""
+    global _bigquery_client
     try:
-        # For production, use credentials from GOOGLE_APPLICATION_CREDENTIALS env var
-        client = bigquery.Client()
-        logger.info(f"Successfully connected to BigQuery with project: {client.project}")
-        return client
+        with _bigquery_client_lock:
+            if _bigquery_client is None:
+                # For production, use credentials from GOOGLE_APPLICATION_CREDENTIALS env var
+                _bigquery_client = bigquery.Client()
+                logger.info(f"Successfully connected to BigQuery with project: {_bigquery_client.project}")
+                # Open the shared Storage API client now rather than inside
+                # the first render's query downloads
+                get_bqstorage_client()
+        return _bigquery_client
     except Exception as e:
         # Instead of raising an exception, return a mock client that will trigger fallback to sample data
         logger.warning(f"Using sample data - BigQuery connection error: {e}")
@@ -107,6 +132,9 @@ async def dashboard(
         # Always get BigQuery configuration directly from config without defaults
         dataset = data_config.get('dataset', '')
         cost_table = data_config.get('cost_table', '')
+        # Prefer the copy of the cost table with a precomputed environment_type
+        # column when one has been created (app/data/create_cost_by_env_table.sql)
+        cost_table = data_config.get('cost_by_env_table') or cost_table
         avg_table = data_config.get('avg_table', '')
         
         # Generate in-memory report
@@ -121,7 +149,7 @@ async def dashboard(
             dataset=dataset,
             cost_table=cost_table,
             avg_table=avg_table,
-            template_path=str(APP_DIR / "templates" / "dashboard_template.html"),
+            template_path=DASHBOARD_TEMPLATE_PATH,
             output_path=str(output_path),
             use_interactive_charts=interactive_charts,
             filters={
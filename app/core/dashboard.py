@@ -2,19 +2,27 @@
 FastAPI-compatible async dashboard generation for FinOps360 cost analysis.
 """
 import os
+import hashlib
+import functools
 import logging
+import threading
+from concurrent.futures import ProcessPoolExecutor
 import jinja2
+import numpy as np
 import pandas as pd
-import asyncio
+from dataclasses import asdict
 from datetime import datetime, timedelta
-from typing import Dict, Any, Optional, Union, List, Tuple
+from typing import Callable, Dict, Any, Iterable, Optional, Union, List, Tuple
 from pathlib import Path
 
 from google.cloud import bigquery
 
+from app.models.dashboard import ChartOutput, DashboardScorecard
 from app.utils.config_loader import FinOpsConfig, load_config
 from app.utils.chart.config import are_charts_enabled
-from app.utils.filter_utils import format_sql_filters, get_filter_values, validate_filters
+from app.utils.filter_utils import format_sql_filters, filter_query_params, get_filter_values, validate_filters
+from app.utils.db import index_by_environment
+from app.utils.kernels import cost_totals
 
 # Import interactive chart functionality
 from app.utils.chart.generator import (
@@ -25,18 +33,7 @@ from app.utils.chart.generator import (
 )
 
 # Import async data access functions
-from app.core.data_access import (
-    get_ytd_costs_async,
-    get_fy26_ytd_costs_async,
-    get_fy26_costs_async,
-    get_fy25_costs_async,
-    get_recent_comparisons_async,
-    get_product_costs_async,
-    get_cto_costs_async,
-    get_pillar_costs_async,
-    get_daily_trend_data_async,
-    create_sample_date_info
-)
+from app.core.data_access import fetch_dashboard_data_async
 
 # Import sample data for when BigQuery is not available
 from app.utils.data_generator import (
@@ -50,11 +47,375 @@ from app.utils.data_generator import (
     create_sample_product_costs,
     create_sample_cto_costs,
     create_sample_pillar_costs,
-    create_sample_daily_trend_data
+    create_sample_daily_trend_data,
+    create_sample_date_info
 )
 
 logger = logging.getLogger(__name__)
 
+# Write buffer for report output (fewer write syscalls for large reports)
+WRITE_BUFFER_SIZE = 1 << 20
+
+# Number of template output chunks Jinja2 groups into one write
+TEMPLATE_STREAM_BUFFER = 64
+
+# Minimal product data used when even the sample product costs are empty
+_FALLBACK_PRODUCT_COSTS = pd.DataFrame({
+    'display_id': ['Platform - PROD-1000', 'Customer - PROD-1001'],
+    'product_name': ['Product 1', 'Product 2'],
+    'pillar_team': ['Platform', 'Customer'],
+    'prod_ytd_cost': [100000.0, 92000.0],
+    'nonprod_ytd_cost': [40000.0, 37000.0],
+    'total_ytd_cost': [140000.0, 129000.0]
+})
+
+# Low-cardinality label columns stored as categoricals
+CATEGORICAL_COLUMNS = ('environment_type', 'cto_org', 'pillar_team', 'pillar_name')
+
+# CSS classes for percentage changes: up is red (warning), down is green (good)
+PERCENT_CLASS_UP = "positive-change"
+PERCENT_CLASS_DOWN = "negative-change"
+PERCENT_CLASS_NEUTRAL = "neutral-change"
+
+# Template CSS class variables and the scorecard field each one is derived from
+PERCENT_CLASS_FIELDS = {
+    'prod_ytd_percent_class': 'prod_ytd_percent',
+    'nonprod_ytd_percent_class': 'nonprod_ytd_percent',
+    'fy26_percent_class': 'fy26_percent',
+    'fy26_ytd_percent_class': 'fy26_ytd_percent',
+    'nonprod_percentage_change_class': 'nonprod_percentage_change',
+    'day_prod_percent_class': 'day_prod_percent_calculated',
+    'day_nonprod_percent_class': 'day_nonprod_percent_calculated',
+    'week_prod_percent_class': 'week_prod_percent_calculated',
+    'week_nonprod_percent_class': 'week_nonprod_percent_calculated',
+    'month_prod_percent_class': 'month_prod_percent_calculated',
+    'month_nonprod_percent_class': 'month_nonprod_percent_calculated',
+}
+
+# Current / previous cost columns returned by each recent comparison query
+COMPARISON_COLUMNS = {
+    'day': ('day_current_cost', 'day_previous_cost'),
+    'week': ('this_week_cost', 'prev_week_cost'),
+    'month': ('this_month_cost', 'prev_month_cost'),
+}
+
+# Environment types shown in the recent comparison cards, by scorecard field prefix
+COMPARISON_ENVIRONMENTS = (('prod', 'PROD'), ('nonprod', 'NON-PROD'))
+
+
+def _categorize_labels(df: pd.DataFrame) -> None:
+    """
+    Convert the low-cardinality label columns of a DataFrame to categoricals in place.
+    
+    Args:
+        df: DataFrame to convert
+    """
+    for column in CATEGORICAL_COLUMNS:
+        if column in df.columns and not isinstance(df[column].dtype, pd.CategoricalDtype):
+            df[column] = df[column].astype('category')
+
+
+def _percent_classes(scorecard: DashboardScorecard) -> Dict[str, str]:
+    """
+    Get the CSS class for every percentage change on the scorecard.
+    
+    Args:
+        scorecard: Populated dashboard scorecard
+        
+    Returns:
+        Mapping of template class key to positive-change, negative-change or
+        neutral-change
+    """
+    percents = np.array([getattr(scorecard, field) for field in PERCENT_CLASS_FIELDS.values()], dtype=float)
+    classes = np.select(
+        [percents > 0, percents < 0],
+        [PERCENT_CLASS_UP, PERCENT_CLASS_DOWN],
+        default=PERCENT_CLASS_NEUTRAL
+    )
+    return dict(zip(PERCENT_CLASS_FIELDS, classes.tolist()))
+
+
+def _comparison_rows(comparisons: Dict[str, pd.DataFrame]) -> Dict[Tuple[str, str], Dict[str, Any]]:
+    """
+    Pivot the recent comparison DataFrames into a single lookup table.
+    
+    Each period's current / previous cost columns are renamed to common names
+    so the day, week and month frames stack into one frame that is indexed once.
+    
+    Args:
+        comparisons: Mapping of period ('day', 'week', 'month') to its comparison DataFrame
+        
+    Returns:
+        Mapping of (period, environment type) to a dict with current_cost,
+        previous_cost and percent_change (missing values are 0)
+    """
+    frames = {}
+    for period, df in comparisons.items():
+        if df.empty or 'environment_type' not in df.columns:
+            continue
+        current, previous = COMPARISON_COLUMNS[period]
+        frames[period] = df.rename(columns={current: 'current_cost', previous: 'previous_cost'}).reindex(
+            columns=['environment_type', 'current_cost', 'previous_cost', 'percent_change'], fill_value=0
+        )
+    if not frames:
+        return {}
+    combined = pd.concat(frames, names=['period', None]).reset_index(level='period')
+    combined['environment_type'] = combined['environment_type'].astype(str)
+    combined = combined.drop_duplicates(['period', 'environment_type'])
+    return combined.set_index(['period', 'environment_type']).to_dict('index')
+
+def _env_value(env_rows: Dict[str, Dict[str, Dict[str, Any]]], source: str, environment_type: str, column: str) -> Any:
+    """
+    Look up one value in the per-environment dispatch table.
+    
+    Args:
+        env_rows: Mapping of source name to its index_by_environment() index
+        source: Source frame name (e.g. 'ytd', 'fy25')
+        environment_type: Environment type ('PROD' or 'NON-PROD')
+        column: Column name
+        
+    Returns:
+        The value, or 0 if the source has no row or column for it
+    """
+    return env_rows[source].get(environment_type, {}).get(column, 0)
+
+
+def _column(df: pd.DataFrame, column: str, default: Any) -> pd.Series:
+    """
+    Get a column of a DataFrame, or a constant Series if it is missing.
+    
+    Args:
+        df: Source DataFrame
+        column: Column name
+        default: Value to use when the column does not exist
+        
+    Returns:
+        Series aligned with the DataFrame index
+    """
+    if column in df.columns:
+        return df[column]
+    return pd.Series(default, index=df.index)
+
+
+def _with_cost_totals(df: pd.DataFrame, forecast_days: int) -> pd.DataFrame:
+    """
+    Fill in derived cost columns for a cost breakdown table.
+    
+    Totals of 0 are replaced with prod + nonprod where either is positive,
+    nonprod_percentage is computed from the totals, and forecasted_cost is
+    projected from the YTD total when the query did not return one.
+    
+    Args:
+        df: DataFrame with prod_ytd_cost / nonprod_ytd_cost / total_ytd_cost columns
+        forecast_days: Number of days the YTD total covers
+        
+    Returns:
+        Copy of the DataFrame with the derived columns set
+    """
+    prod = _column(df, 'prod_ytd_cost', 0.0)
+    nonprod = _column(df, 'nonprod_ytd_cost', 0.0)
+    total = _column(df, 'total_ytd_cost', 0.0)
+    total, nonprod_percentage = cost_totals(prod.to_numpy(), nonprod.to_numpy(), total.to_numpy())
+    return df.assign(
+        prod_ytd_cost=prod,
+        nonprod_ytd_cost=nonprod,
+        total_ytd_cost=total,
+        nonprod_percentage=nonprod_percentage,
+        forecasted_cost=df['forecasted_cost'] if 'forecasted_cost' in df.columns else total * 365 / forecast_days
+    )
+
+
+def _percent_change(current: float, previous: float) -> float:
+    """
+    Calculate the percentage change from previous to current.
+    
+    Args:
+        current: Current period value
+        previous: Previous period value
+        
+    Returns:
+        Percentage change, or 0 if there is no positive previous value
+    """
+    if previous > 0:
+        return (current / previous - 1) * 100
+    return 0
+
+
+@functools.lru_cache(maxsize=8)
+def _load_template(template_path: str, mtime: float, bytecode_cache_dir: Optional[str] = None) -> jinja2.Template:
+    """
+    Build a Jinja2 environment and compile a template.
+    
+    Cached per (path, mtime), so the template is parsed once and recompiled
+    only when the file changes on disk. The environment never re-stats the
+    template itself (auto_reload=False) and keeps every loaded template
+    (cache_size=-1). With a bytecode cache directory, the compiled template
+    is also persisted so new processes skip parsing it.
+    
+    Args:
+        template_path: Path to the HTML template
+        mtime: Modification time of the template file
+        bytecode_cache_dir: Optional directory for Jinja2's bytecode cache
+        
+    Returns:
+        Compiled Jinja2 template
+    """
+    template_dir = os.path.dirname(template_path)
+    template_file = os.path.basename(template_path)
+    
+    bytecode_cache = None
+    if bytecode_cache_dir:
+        os.makedirs(bytecode_cache_dir, exist_ok=True)
+        bytecode_cache = jinja2.FileSystemBytecodeCache(bytecode_cache_dir)
+    
+    env = jinja2.Environment(
+        loader=jinja2.FileSystemLoader(template_dir),
+        auto_reload=False,
+        cache_size=-1,
+        optimized=True,
+        bytecode_cache=bytecode_cache
+    )
+    logger.info(f"Compiling dashboard template: {template_path}")
+    return env.get_template(template_file)
+
+
+def _get_template(template_path: str) -> jinja2.Template:
+    """
+    Get the compiled template for a path, reusing the cached one if unchanged.
+    
+    Args:
+        template_path: Path to the HTML template
+        
+    Returns:
+        Compiled Jinja2 template
+    """
+    bytecode_cache_dir = load_config("config.yaml").get('dashboard', {}).get('template_cache_dir')
+    return _load_template(template_path, os.path.getmtime(template_path), bytecode_cache_dir)
+
+
+def preload_template(template_path: str) -> None:
+    """
+    Compile a dashboard template ahead of the first render.
+    
+    Args:
+        template_path: Path to the HTML template
+    """
+    _get_template(template_path)
+    logger.info(f"Preloaded dashboard template: {template_path}")
+
+
+# Worker processes for chart rendering, created on first use when
+# charts.render_processes is above 1
+_chart_pool: Optional[ProcessPoolExecutor] = None
+_chart_pool_lock = threading.Lock()
+
+
+def _get_chart_pool() -> Optional[ProcessPoolExecutor]:
+    """
+    Get the shared chart rendering process pool, if one is configured.
+    
+    Returns:
+        ProcessPoolExecutor, or None to render charts in this process
+    """
+    global _chart_pool
+    processes = int(load_config("config.yaml").get('charts', {}).get('render_processes', 0) or 0)
+    if processes <= 1:
+        return None
+    with _chart_pool_lock:
+        if _chart_pool is None:
+            _chart_pool = ProcessPoolExecutor(max_workers=min(processes, os.cpu_count() or 1))
+        return _chart_pool
+
+
+def _render_charts(charts: Dict[str, Tuple[Callable[[pd.DataFrame], ChartOutput], pd.DataFrame]]) -> Dict[str, ChartOutput]:
+    """
+    Render independent charts, in worker processes when a pool is configured.
+    
+    Chart building and figure serialization are pure Python and hold the
+    GIL, so separate processes are what lets the charts render in parallel.
+    If the pool fails, the charts are rendered in this process instead.
+    
+    Args:
+        charts: Chart name mapped to its (chart function, data) pair
+        
+    Returns:
+        Chart name mapped to the rendered chart
+    """
+    pool = _get_chart_pool()
+    if pool is not None:
+        try:
+            futures = {name: pool.submit(func, df) for name, (func, df) in charts.items()}
+            return {name: future.result() for name, future in futures.items()}
+        except Exception as e:
+            logger.warning(f"Parallel chart rendering failed, rendering in process: {e}")
+    return {name: func(df) for name, (func, df) in charts.items()}
+
+
+def _compute_report_etag(frames: Tuple[pd.DataFrame, ...], template_path: str, settings: Tuple[Any, ...]) -> str:
+    """
+    Compute a content hash of everything that goes into a rendered report.
+    
+    Args:
+        frames: Source DataFrames fetched for the report
+        template_path: Path to the HTML template (its mtime is hashed)
+        settings: Other inputs that affect the output (filters, display settings, ...)
+        
+    Returns:
+        Hex digest identifying the report content
+    """
+    h = hashlib.blake2b(digest_size=16)
+    for df in frames:
+        h.update(repr(list(df.columns)).encode())
+        h.update(pd.util.hash_pandas_object(df, index=False).values.tobytes())
+    h.update(str(os.path.getmtime(template_path)).encode())
+    h.update(repr(settings).encode())
+    return h.hexdigest()
+
+
+def _read_etag(etag_path: str) -> Optional[str]:
+    """
+    Read a report's sidecar ETag file.
+    
+    Args:
+        etag_path: Path to the sidecar file
+        
+    Returns:
+        Stored ETag, or None if the file does not exist
+    """
+    try:
+        with open(etag_path, 'r', encoding='utf-8') as f:
+            return f.read().strip()
+    except OSError:
+        return None
+
+
+def _atomic_write(path: str, content: Union[str, Iterable[str]]) -> None:
+    """
+    Atomically replace a text file.
+    
+    The content is written to a temporary file in the same directory and
+    moved over the target with os.replace, so readers never see a partially
+    written file and concurrent writers cannot interleave.
+    
+    Args:
+        path: Destination file path
+        content: Text to write, or an iterable of text chunks (such as a
+            Jinja2 TemplateStream) written as they are produced
+    """
+    tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    try:
+        with open(tmp_path, 'w', encoding='utf-8', buffering=WRITE_BUFFER_SIZE) as f:
+            if isinstance(content, str):
+                f.write(content)
+            else:
+                f.writelines(content)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.unlink(tmp_path)
+        raise
+
+
 async def generate_html_report_async(
     client: bigquery.Client,
     project_id: str,
@@ -83,6 +444,9 @@ async def generate_html_report_async(
         Path to the generated HTML report
     """
     try:
+        # Single clock snapshot so every date on the report is consistent
+        now = datetime.now()
+        
         # Initialize filters if not provided
         if filters is None:
             filters = {
@@ -104,6 +468,7 @@ async def generate_html_report_async(
         cto_filter = sql_filters['cto_filter']
         pillar_filter = sql_filters['pillar_filter']
         product_filter = sql_filters['product_filter']
+        filter_params = filter_query_params(selected_cto, selected_pillar, selected_product)
         
         # Log filter conditions
         if selected_cto or selected_pillar or selected_product:
@@ -120,21 +485,6 @@ async def generate_html_report_async(
         # Get dashboard title from config
         dashboard_title = dashboard_config.get('title') or 'FinOps360 Cost Analysis Dashboard'
         
-        # Get configured comparison settings directly from config without defaults
-        # Fixed dates for comparisons
-        day_current_date = data_config.get('day_current_date', '')
-        day_previous_date = data_config.get('day_previous_date', '')
-        
-        # Fixed week periods (start and end dates)
-        week_current_start = data_config.get('week_current_start', '')
-        week_current_end = data_config.get('week_current_end', '')
-        week_previous_start = data_config.get('week_previous_start', '')
-        week_previous_end = data_config.get('week_previous_end', '')
-        
-        # Fixed month periods
-        month_current = data_config.get('month_current', '')
-        month_previous = data_config.get('month_previous', '')
-        
         # Display settings
         top_products = data_config.get('top_products_count', 0)
         nonprod_threshold = data_config.get('nonprod_percentage_threshold', 0)
@@ -146,60 +496,13 @@ async def generate_html_report_async(
             logger.warning("Using SAMPLE DATA for dashboard generation")
 
         try:
-            # Run all data fetching tasks in parallel for better performance
-            # Apply filters to all queries
-            # Core metrics tasks
-            ytd_costs_task = get_ytd_costs_async(client, project_id, dataset, cost_table, 
-                cto_filter=cto_filter, pillar_filter=pillar_filter, product_filter=product_filter)
-            
-            fy26_ytd_costs_task = get_fy26_ytd_costs_async(client, project_id, dataset, cost_table,
-                cto_filter=cto_filter, pillar_filter=pillar_filter, product_filter=product_filter)
-            
-            fy26_costs_task = get_fy26_costs_async(client, project_id, dataset, cost_table,
-                cto_filter=cto_filter, pillar_filter=pillar_filter, product_filter=product_filter)
-            
-            fy25_costs_task = get_fy25_costs_async(client, project_id, dataset, cost_table,
-                cto_filter=cto_filter, pillar_filter=pillar_filter, product_filter=product_filter)
-            
-            recent_comparisons_task = get_recent_comparisons_async(
-                client, project_id, dataset, cost_table, 
-                day_current_date=day_current_date,
-                day_previous_date=day_previous_date,
-                week_current_start=week_current_start,
-                week_current_end=week_current_end,
-                week_previous_start=week_previous_start,
-                week_previous_end=week_previous_end,
-                month_current=month_current,
-                month_previous=month_previous,
-                cto_filter=cto_filter,
-                pillar_filter=pillar_filter,
-                product_filter=product_filter
-            )
-            
-            # Breakdown cost tasks with filters
-            product_costs_task = get_product_costs_async(
-                client, project_id, dataset, cost_table,
-                top_n=top_products,
-                nonprod_pct_threshold=nonprod_threshold,
-                cto_filter=cto_filter,
-                pillar_filter=pillar_filter,
-                product_filter=product_filter
-            )
-            
-            cto_costs_task = get_cto_costs_async(
-                client, project_id, dataset, cost_table,
-                top_n=top_products,
-                cto_filter=cto_filter,
-                pillar_filter=pillar_filter,
-                product_filter=product_filter
-            )
-            
-            pillar_costs_task = get_pillar_costs_async(
-                client, project_id, dataset, cost_table,
-                top_n=top_products,
+            # Run all data fetching queries in parallel, with filters applied
+            data = await fetch_dashboard_data_async(
+                client, project_id, dataset, cost_table, avg_table, data_config,
                 cto_filter=cto_filter,
                 pillar_filter=pillar_filter,
-                product_filter=product_filter
+                product_filter=product_filter,
+                filter_params=filter_params
             )
             
             # If show_sql is enabled, save the queries
@@ -209,7 +512,6 @@ async def generate_html_report_async(
                     project_id=project_id, 
                     dataset=dataset, 
                     table=cost_table,
-                    top_n=top_products,
                     cto_filter=cto_filter,
                     pillar_filter=pillar_filter,
                     product_filter=product_filter
@@ -220,7 +522,6 @@ async def generate_html_report_async(
                     project_id=project_id, 
                     dataset=dataset, 
                     table=cost_table,
-                    top_n=top_products,
                     cto_filter=cto_filter,
                     pillar_filter=pillar_filter,
                     product_filter=product_filter
@@ -231,55 +532,23 @@ async def generate_html_report_async(
                     project_id=project_id, 
                     dataset=dataset, 
                     table=cost_table,
-                    top_n=top_products,
                     cto_filter=cto_filter,
                     pillar_filter=pillar_filter,
                     product_filter=product_filter
                 )
             
-            daily_trend_data_task = get_daily_trend_data_async(
-                client, 
-                project_id, 
-                dataset, 
-                avg_table,
-                cto_filter=cto_filter,
-                pillar_filter=pillar_filter,
-                product_filter=product_filter
-            )
-            
-            # Wait for all data fetching tasks to complete
-            results = await asyncio.gather(
-                ytd_costs_task,
-                fy26_ytd_costs_task,
-                fy26_costs_task,
-                fy25_costs_task,
-                recent_comparisons_task,
-                product_costs_task,
-                cto_costs_task,
-                pillar_costs_task,
-                daily_trend_data_task,
-                return_exceptions=True  # Don't let one task failure fail all tasks
-            )
-            
-            # Extract results
-            ytd_costs = results[0] if not isinstance(results[0], Exception) else create_sample_ytd_costs()
-            fy26_ytd_costs = results[1] if not isinstance(results[1], Exception) else create_sample_fy26_ytd_costs()
-            fy26_costs = results[2] if not isinstance(results[2], Exception) else create_sample_fy26_costs()
-            fy25_costs = results[3] if not isinstance(results[3], Exception) else create_sample_fy25_costs()
-            
-            # Extract comparison results
-            if not isinstance(results[4], Exception):
-                day_comparison, week_comparison, month_comparison, date_info = results[4]
-            else:
-                day_comparison = create_sample_day_comparison()
-                week_comparison = create_sample_week_comparison()
-                month_comparison = create_sample_month_comparison()
-                date_info = create_sample_date_info()
-            
-            product_costs = results[5] if not isinstance(results[5], Exception) else create_sample_product_costs()
-            cto_costs = results[6] if not isinstance(results[6], Exception) else create_sample_cto_costs()
-            pillar_costs = results[7] if not isinstance(results[7], Exception) else create_sample_pillar_costs()
-            daily_trend_data = results[8] if not isinstance(results[8], Exception) else create_sample_daily_trend_data()
+            ytd_costs = data['ytd_costs']
+            fy26_ytd_costs = data['fy26_ytd_costs']
+            fy26_costs = data['fy26_costs']
+            fy25_costs = data['fy25_costs']
+            day_comparison = data['day_comparison']
+            week_comparison = data['week_comparison']
+            month_comparison = data['month_comparison']
+            date_info = data['date_info']
+            product_costs = data['product_costs']
+            cto_costs = data['cto_costs']
+            pillar_costs = data['pillar_costs']
+            daily_trend_data = data['daily_trend_data']
             
             logger.info("Successfully retrieved data for dashboard")
             
@@ -301,281 +570,217 @@ async def generate_html_report_async(
             daily_trend_data = create_sample_daily_trend_data()
             date_info = create_sample_date_info()
             
-            # Create a simple fallback product data if needed
+            # Use the simple fallback product data if needed
             if product_costs.empty:
-                product_costs = pd.DataFrame({
-                    'display_id': ['Platform - PROD-1000', 'Customer - PROD-1001'],
-                    'product_name': ['Product 1', 'Product 2'],
-                    'pillar_team': ['Platform', 'Customer'],
-                    'prod_ytd_cost': [100000.0, 92000.0],
-                    'nonprod_ytd_cost': [40000.0, 37000.0],
-                    'total_ytd_cost': [140000.0, 129000.0]
-                })
-                logger.info(f"Created fallback product costs with {len(product_costs)} rows")
-        
-        # Extract and process data (same regardless of source)
-        prod_ytd = ytd_costs[ytd_costs['environment_type'] == 'PROD'] if not ytd_costs.empty and 'PROD' in ytd_costs['environment_type'].values else pd.DataFrame()
-        nonprod_ytd = ytd_costs[ytd_costs['environment_type'] == 'NON-PROD'] if not ytd_costs.empty and 'NON-PROD' in ytd_costs['environment_type'].values else pd.DataFrame()
-
-        # Extract FY26 YTD cost data
-        prod_fy26_ytd = fy26_ytd_costs[fy26_ytd_costs['environment_type'] == 'PROD'] if not fy26_ytd_costs.empty and 'PROD' in fy26_ytd_costs['environment_type'].values else pd.DataFrame()
-        nonprod_fy26_ytd = fy26_ytd_costs[fy26_ytd_costs['environment_type'] == 'NON-PROD'] if not fy26_ytd_costs.empty and 'NON-PROD' in fy26_ytd_costs['environment_type'].values else pd.DataFrame()
-
-        prod_fy26 = fy26_costs[fy26_costs['environment_type'] == 'PROD'] if not fy26_costs.empty and 'PROD' in fy26_costs['environment_type'].values else pd.DataFrame()
-        nonprod_fy26 = fy26_costs[fy26_costs['environment_type'] == 'NON-PROD'] if not fy26_costs.empty and 'NON-PROD' in fy26_costs['environment_type'].values else pd.DataFrame()
-
-        prod_fy25 = fy25_costs[fy25_costs['environment_type'] == 'PROD'] if not fy25_costs.empty and 'PROD' in fy25_costs['environment_type'].values else pd.DataFrame()
-        nonprod_fy25 = fy25_costs[fy25_costs['environment_type'] == 'NON-PROD'] if not fy25_costs.empty and 'NON-PROD' in fy25_costs['environment_type'].values else pd.DataFrame()
+                product_costs = _FALLBACK_PRODUCT_COSTS.copy()
+                logger.info(f"Using fallback product costs with {len(product_costs)} rows")
+        
+        # Breakdown results may arrive as lists of dicts; normalise them to DataFrames
+        if isinstance(product_costs, list):
+            product_costs = pd.DataFrame([item for item in product_costs if isinstance(item, dict)])
+        if isinstance(cto_costs, list):
+            cto_costs = pd.DataFrame([item for item in cto_costs if isinstance(item, dict)])
+        if isinstance(pillar_costs, list):
+            pillar_costs = pd.DataFrame([item for item in pillar_costs if isinstance(item, dict)])
+
+        # Store low-cardinality label columns as categoricals so equality
+        # filters on them compare integer codes instead of Python strings
+        for df in (ytd_costs, fy26_ytd_costs, fy26_costs, fy25_costs,
+                   day_comparison, week_comparison, month_comparison,
+                   product_costs, cto_costs, pillar_costs, daily_trend_data):
+            _categorize_labels(df)
+        
+        # Skip re-rendering if the inputs are unchanged since the last report
+        report_etag = _compute_report_etag(
+            frames=(ytd_costs, fy26_ytd_costs, fy26_costs, fy25_costs,
+                    day_comparison, week_comparison, month_comparison,
+                    product_costs, cto_costs, pillar_costs, daily_trend_data),
+            template_path=template_path,
+            settings=(now.date(), date_info, selected_cto, selected_pillar, selected_product,
+                      show_sql, use_interactive_charts, are_charts_enabled(), using_sample_data,
+                      dashboard_title, display_millions, nonprod_threshold, top_products,
+                      project_id, dataset, cost_table, avg_table)
+        )
+        etag_path = f"{output_path}.etag"
+        if os.path.exists(output_path) and _read_etag(etag_path) == report_etag:
+            logger.info(f"Report inputs unchanged, reusing existing report: {output_path}")
+            return output_path
+        
+        # Dispatch table of the YTD per-environment frames, indexed once (same
+        # regardless of source); each scalar below is a single dict lookup
+        env_rows = {
+            'ytd': index_by_environment(ytd_costs),
+            'fy26_ytd': index_by_environment(fy26_ytd_costs),
+            'fy25': index_by_environment(fy25_costs),
+        }
         
         # Get the YTD cost values first
-        prod_ytd_cost = prod_ytd['ytd_cost'].iloc[0] if not prod_ytd.empty and 'ytd_cost' in prod_ytd.columns else 0
-        nonprod_ytd_cost = nonprod_ytd['ytd_cost'].iloc[0] if not nonprod_ytd.empty and 'ytd_cost' in nonprod_ytd.columns else 0
+        prod_ytd_cost = _env_value(env_rows, 'ytd', 'PROD', 'ytd_cost')
+        nonprod_ytd_cost = _env_value(env_rows, 'ytd', 'NON-PROD', 'ytd_cost')
 
         # Get the FY26 YTD cost values
-        prod_fy26_ytd_cost = prod_fy26_ytd['ytd_cost'].iloc[0] if not prod_fy26_ytd.empty and 'ytd_cost' in prod_fy26_ytd.columns else 0
-        nonprod_fy26_ytd_cost = nonprod_fy26_ytd['ytd_cost'].iloc[0] if not nonprod_fy26_ytd.empty and 'ytd_cost' in nonprod_fy26_ytd.columns else 0
+        prod_fy26_ytd_cost = _env_value(env_rows, 'fy26_ytd', 'PROD', 'ytd_cost')
+        nonprod_fy26_ytd_cost = _env_value(env_rows, 'fy26_ytd', 'NON-PROD', 'ytd_cost')
 
         # Calculate total FY26 YTD cost
         total_fy26_ytd_cost = prod_fy26_ytd_cost + nonprod_fy26_ytd_cost
 
-        # Get FY25 costs for comparison - now directly from the ytd_cost column
-        prod_fy25_cost = 0
-        nonprod_fy25_cost = 0
-
         # Get FY25 YTD costs for direct comparison with current YTD
-        if not fy25_costs.empty and not prod_fy25.empty and 'ytd_cost' in prod_fy25.columns:
-            prod_fy25_cost = prod_fy25['ytd_cost'].iloc[0]
-            if prod_fy25_cost > 0:
-                prod_ytd_percent = ((prod_ytd_cost - prod_fy25_cost) / prod_fy25_cost) * 100
-            else:
-                prod_ytd_percent = 0
-        else:
-            prod_ytd_percent = 0
-            
-        if not fy25_costs.empty and not nonprod_fy25.empty and 'ytd_cost' in nonprod_fy25.columns:
-            nonprod_fy25_cost = nonprod_fy25['ytd_cost'].iloc[0]
-            if nonprod_fy25_cost > 0:
-                nonprod_ytd_percent = ((nonprod_ytd_cost - nonprod_fy25_cost) / nonprod_fy25_cost) * 100
-            else:
-                nonprod_ytd_percent = 0
-        else:
-            nonprod_ytd_percent = 0
+        prod_fy25_cost = _env_value(env_rows, 'fy25', 'PROD', 'ytd_cost')
+        nonprod_fy25_cost = _env_value(env_rows, 'fy25', 'NON-PROD', 'ytd_cost')
         
         # Calculate total FY26 cost with percentage change vs FY25 YTD (not total FY25)
         total_fy26_cost = fy26_costs['total_cost'].sum() if not fy26_costs.empty and 'total_cost' in fy26_costs.columns else 0
 
         # Use FY25 YTD for percentage comparison, not total FY25
-        total_fy25_ytd_cost = 0
         if not fy25_costs.empty and 'ytd_cost' in fy25_costs.columns:
             total_fy25_ytd_cost = fy25_costs['ytd_cost'].sum()
         else:
             total_fy25_ytd_cost = prod_fy25_cost + nonprod_fy25_cost
 
-        # Store total FY25 cost for display - also use YTD cost, not total cost
-        total_fy25_cost = total_fy25_ytd_cost
-
-        # Calculate percentage change vs FY25 YTD
-        fy26_ytd_percent = 0
-        if total_fy25_ytd_cost > 0:
-            fy26_ytd_percent = ((total_fy26_ytd_cost - total_fy25_ytd_cost) / total_fy25_ytd_cost) * 100
-
-        # Calculate percentage change for Total FY26 Projected Cost vs FY25 YTD
-        fy26_percent = 0
-        if total_fy25_ytd_cost > 0:
-            fy26_percent = ((total_fy26_cost - total_fy25_ytd_cost) / total_fy25_ytd_cost) * 100
-        
         # Calculate overall nonprod percentage
-        total_ytd_cost = 0
-        if not ytd_costs.empty and 'ytd_cost' in ytd_costs.columns:
-            total_ytd_cost = ytd_costs['ytd_cost'].sum()
-            
-        nonprod_ytd_cost = 0
-        if not nonprod_ytd.empty and 'ytd_cost' in nonprod_ytd.columns:
-            nonprod_ytd_cost = nonprod_ytd['ytd_cost'].iloc[0]
-            
-        # Calculate nonprod percentage
-        if total_ytd_cost > 0:
-            nonprod_percentage = (nonprod_ytd_cost / total_ytd_cost) * 100
-        else:
-            nonprod_percentage = 0
+        total_ytd_cost = ytd_costs['ytd_cost'].sum() if not ytd_costs.empty and 'ytd_cost' in ytd_costs.columns else 0
+        nonprod_percentage = (nonprod_ytd_cost / total_ytd_cost) * 100 if total_ytd_cost > 0 else 0
             
         # Calculate nonprod percentage change compared to FY25 - using YTD costs for both
-        # We already have total_fy25_ytd_cost calculated above
-        nonprod_fy25_ytd_cost = nonprod_fy25['ytd_cost'].iloc[0] if not nonprod_fy25.empty and 'ytd_cost' in nonprod_fy25.columns else 0
-        
         if total_fy25_ytd_cost > 0:
-            fy25_nonprod_percentage = (nonprod_fy25_ytd_cost / total_fy25_ytd_cost) * 100
+            fy25_nonprod_percentage = (nonprod_fy25_cost / total_fy25_ytd_cost) * 100
             nonprod_percentage_change = nonprod_percentage - fy25_nonprod_percentage
         else:
             nonprod_percentage_change = 0
-        
-        # Process product cost table data
+
+        # Recent comparison values, pivoted into one (period, environment) lookup
+        comparison_rows = _comparison_rows({
+            'day': day_comparison,
+            'week': week_comparison,
+            'month': month_comparison,
+        })
+        comparison_values = {}
+        for period in COMPARISON_COLUMNS:
+            for prefix, environment_type in COMPARISON_ENVIRONMENTS:
+                row = comparison_rows.get((period, environment_type), {})
+                current_cost = row.get('current_cost', 0)
+                previous_cost = row.get('previous_cost', 0)
+                comparison_values[f'{period}_{prefix}_cost'] = current_cost
+                comparison_values[f'{period}_{prefix}_previous_cost'] = previous_cost
+                comparison_values[f'{period}_{prefix}_percent'] = row.get('percent_change', 0)
+                comparison_values[f'{period}_{prefix}_percent_calculated'] = _percent_change(current_cost, previous_cost)
+
+        # Populate the scorecard once; every template value is read from it
+        scorecard = DashboardScorecard(
+            prod_ytd_cost=prod_ytd_cost,
+            nonprod_ytd_cost=nonprod_ytd_cost,
+            prod_fy26_ytd_cost=prod_fy26_ytd_cost,
+            nonprod_fy26_ytd_cost=nonprod_fy26_ytd_cost,
+            total_fy26_ytd_cost=total_fy26_ytd_cost,
+            total_fy25_ytd_cost=total_fy25_ytd_cost,
+            prod_fy25_cost=prod_fy25_cost,
+            nonprod_fy25_cost=nonprod_fy25_cost,
+            total_fy26_cost=total_fy26_cost,
+            # Store total FY25 cost for display - also use YTD cost, not total cost
+            total_fy25_cost=total_fy25_ytd_cost,
+            prod_ytd_percent=_percent_change(prod_ytd_cost, prod_fy25_cost),
+            nonprod_ytd_percent=_percent_change(nonprod_ytd_cost, nonprod_fy25_cost),
+            fy26_ytd_percent=_percent_change(total_fy26_ytd_cost, total_fy25_ytd_cost),
+            fy26_percent=_percent_change(total_fy26_cost, total_fy25_ytd_cost),
+            nonprod_percentage=nonprod_percentage,
+            nonprod_percentage_change=nonprod_percentage_change,
+            **comparison_values,
+        )
+
+        
+        # Days elapsed in FY26, used to project forecasts that the query did not return
+        forecast_days = max((now.date() - datetime(2025, 2, 1).date()).days, 1)
+
+        # Process product cost table data (vectorized over the whole frame)
         if not product_costs.empty:
-            product_cost_table = []
-            for _, row in product_costs.iterrows():
-                # Calculate nonprod percentage
-                prod_cost = row.get('prod_ytd_cost', 0.0)
-                nonprod_cost = row.get('nonprod_ytd_cost', 0.0)
-                total_cost = row.get('total_ytd_cost', 0.0)
-                if total_cost == 0 and (prod_cost > 0 or nonprod_cost > 0):
-                    total_cost = prod_cost + nonprod_cost
-                
-                nonprod_percentage = (nonprod_cost / total_cost * 100) if total_cost > 0 else 0
-                
-                product_cost_table.append({
-                    'product_id': row.get('display_id', ''),
-                    'product_name': row.get('product_name', ''),
-                    'pillar_team': row.get('pillar_team', ''),
-                    'prod_ytd_cost': prod_cost,
-                    'nonprod_ytd_cost': nonprod_cost,
-                    'total_ytd_cost': total_cost,
-                    'forecasted_cost': row.get('forecasted_cost', total_cost * 365 / max((datetime.now().date() - datetime(2025, 2, 1).date()).days, 1)),
-                    'nonprod_percentage': nonprod_percentage
-                })
+            product_table_df = _with_cost_totals(product_costs, forecast_days)
+            product_table_df = pd.DataFrame({
+                'product_id': _column(product_table_df, 'display_id', ''),
+                'product_name': _column(product_table_df, 'product_name', ''),
+                'pillar_team': _column(product_table_df, 'pillar_team', ''),
+                'prod_ytd_cost': product_table_df['prod_ytd_cost'],
+                'nonprod_ytd_cost': product_table_df['nonprod_ytd_cost'],
+                'total_ytd_cost': product_table_df['total_ytd_cost'],
+                'forecasted_cost': product_table_df['forecasted_cost'],
+                'nonprod_percentage': product_table_df['nonprod_percentage']
+            })
         else:
             # Empty fallback instead of hardcoded data
-            product_cost_table = []
+            product_table_df = pd.DataFrame()
+        product_cost_table = product_table_df.to_dict('records')
             
         # Process CTO cost table data
-        cto_cost_table = []
-        if isinstance(cto_costs, pd.DataFrame) and not cto_costs.empty:
-            for _, row in cto_costs.iterrows():
-                cto_cost_table.append({
-                    'cto_org': row.get('cto_org', ''),
-                    'prod_ytd_cost': row.get('prod_ytd_cost', 0.0),
-                    'nonprod_ytd_cost': row.get('nonprod_ytd_cost', 0.0),
-                    'total_ytd_cost': row.get('total_ytd_cost', 0.0),
-                    'forecasted_cost': row.get('forecasted_cost', row.get('total_ytd_cost', 0.0) * 365 / max((datetime.now().date() - datetime(2025, 2, 1).date()).days, 1)),
-                    'nonprod_percentage': row.get('nonprod_percentage', 0.0)
-                })
-        elif isinstance(cto_costs, list) and cto_costs:
-            for item in cto_costs:
-                if isinstance(item, dict):
-                    cto_cost_table.append({
-                        'cto_org': item.get('cto_org', ''),
-                        'prod_ytd_cost': item.get('prod_ytd_cost', 0.0),
-                        'nonprod_ytd_cost': item.get('nonprod_ytd_cost', 0.0),
-                        'total_ytd_cost': item.get('total_ytd_cost', 0.0),
-                        'forecasted_cost': item.get('forecasted_cost', item.get('total_ytd_cost', 0.0) * 365 / max((datetime.now().date() - datetime(2025, 2, 1).date()).days, 1)),
-                        'nonprod_percentage': item.get('nonprod_percentage', 0.0)
-                    })
+        if not cto_costs.empty:
+            cto_total = _column(cto_costs, 'total_ytd_cost', 0.0)
+            cto_table_df = pd.DataFrame({
+                'cto_org': _column(cto_costs, 'cto_org', ''),
+                'prod_ytd_cost': _column(cto_costs, 'prod_ytd_cost', 0.0),
+                'nonprod_ytd_cost': _column(cto_costs, 'nonprod_ytd_cost', 0.0),
+                'total_ytd_cost': cto_total,
+                'forecasted_cost': cto_costs['forecasted_cost'] if 'forecasted_cost' in cto_costs.columns else cto_total * 365 / forecast_days,
+                'nonprod_percentage': _column(cto_costs, 'nonprod_percentage', 0.0)
+            })
+        else:
+            cto_table_df = pd.DataFrame()
+        cto_cost_table = cto_table_df.to_dict('records')
             
         # Process pillar cost table data
-        pillar_cost_table = []
-        if isinstance(pillar_costs, pd.DataFrame) and not pillar_costs.empty:
-            for _, row in pillar_costs.iterrows():
-                # Calculate nonprod percentage
-                prod_cost = row.get('prod_ytd_cost', 0.0)
-                nonprod_cost = row.get('nonprod_ytd_cost', 0.0)
-                total_cost = row.get('total_ytd_cost', 0.0)
-                if total_cost == 0 and (prod_cost > 0 or nonprod_cost > 0):
-                    total_cost = prod_cost + nonprod_cost
-                
-                nonprod_percentage = (nonprod_cost / total_cost * 100) if total_cost > 0 else 0
-                
-                pillar_cost_table.append({
-                    'pillar_name': row.get('pillar_name', ''),
-                    'product_count': row.get('product_count', 0),
-                    'prod_ytd_cost': prod_cost,
-                    'nonprod_ytd_cost': nonprod_cost,
-                    'total_ytd_cost': total_cost,
-                    'forecasted_cost': row.get('forecasted_cost', total_cost * 365 / max((datetime.now().date() - datetime(2025, 2, 1).date()).days, 1)),
-                    'nonprod_percentage': nonprod_percentage
-                })
-        elif isinstance(pillar_costs, list) and pillar_costs:
-            for item in pillar_costs:
-                if isinstance(item, dict):
-                    # Calculate nonprod percentage
-                    prod_cost = item.get('prod_ytd_cost', 0.0)
-                    nonprod_cost = item.get('nonprod_ytd_cost', 0.0)
-                    total_cost = item.get('total_ytd_cost', 0.0)
-                    if total_cost == 0 and (prod_cost > 0 or nonprod_cost > 0):
-                        total_cost = prod_cost + nonprod_cost
-                    
-                    nonprod_percentage = (nonprod_cost / total_cost * 100) if total_cost > 0 else 0
-                    
-                    pillar_cost_table.append({
-                        'pillar_name': item.get('pillar_name', ''),
-                        'product_count': item.get('product_count', 0),
-                        'prod_ytd_cost': prod_cost,
-                        'nonprod_ytd_cost': nonprod_cost,
-                        'total_ytd_cost': total_cost,
-                        'forecasted_cost': item.get('forecasted_cost', total_cost * 365 / max((datetime.now().date() - datetime(2025, 2, 1).date()).days, 1)),
-                        'nonprod_percentage': nonprod_percentage
-                    })
+        if not pillar_costs.empty:
+            pillar_table_df = _with_cost_totals(pillar_costs, forecast_days)
+            pillar_table_df = pd.DataFrame({
+                'pillar_name': _column(pillar_table_df, 'pillar_name', ''),
+                'product_count': _column(pillar_table_df, 'product_count', 0),
+                'prod_ytd_cost': pillar_table_df['prod_ytd_cost'],
+                'nonprod_ytd_cost': pillar_table_df['nonprod_ytd_cost'],
+                'total_ytd_cost': pillar_table_df['total_ytd_cost'],
+                'forecasted_cost': pillar_table_df['forecasted_cost'],
+                'nonprod_percentage': pillar_table_df['nonprod_percentage']
+            })
+        else:
+            pillar_table_df = pd.DataFrame()
+        pillar_cost_table = pillar_table_df.to_dict('records')
         
         logger.info(f"Product cost table with {len(product_cost_table)} items")
-        try:
-            logger.info(f"CTO cost table with {len(cto_cost_table)} items")
-            logger.info(f"Pillar cost table with {len(pillar_cost_table)} items")
-        except NameError:
-            # If the tables don't exist, create empty ones
-            cto_cost_table = []
-            pillar_cost_table = []
+        logger.info(f"CTO cost table with {len(cto_cost_table)} items")
+        logger.info(f"Pillar cost table with {len(pillar_cost_table)} items")
         
         # Generate charts if enabled
-        daily_trend_chart = {"html": "", "json_data": "{}"}
-        cto_costs_chart = {"html": "", "json_data": "{}"}
-        pillar_costs_chart = {"html": "", "json_data": "{}"}
-        product_costs_chart = {"html": "", "json_data": "{}"}
+        daily_trend_chart = ChartOutput()
+        cto_costs_chart = ChartOutput()
+        pillar_costs_chart = ChartOutput()
+        product_costs_chart = ChartOutput()
         
         if use_interactive_charts and are_charts_enabled():
+            chart_inputs = {}
+            
             # Format daily trend data for charting
             if not daily_trend_data.empty:
-                daily_trend_chart = create_enhanced_daily_trend_chart(daily_trend_data)
+                chart_inputs['daily_trend'] = (create_enhanced_daily_trend_chart, daily_trend_data)
             
-            # Format and create CTO costs chart
-            if cto_cost_table:
-                # Convert all values to numeric to avoid type errors
-                cto_df = pd.DataFrame(cto_cost_table)
-                numeric_columns = ['prod_ytd_cost', 'nonprod_ytd_cost', 'total_ytd_cost', 'nonprod_percentage']
-                for col in numeric_columns:
-                    if col in cto_df.columns:
-                        cto_df[col] = pd.to_numeric(cto_df[col], errors='coerce').fillna(0)
-                cto_costs_chart = create_enhanced_cto_costs_chart(cto_df)
+            # Create CTO and pillar costs charts straight from the table frames
+            if not cto_table_df.empty:
+                chart_inputs['cto_costs'] = (create_enhanced_cto_costs_chart, cto_table_df)
             
-            # Format and create pillar costs chart
-            if pillar_cost_table:
-                # Convert all values to numeric to avoid type errors
-                pillar_df = pd.DataFrame(pillar_cost_table)
-                numeric_columns = ['prod_ytd_cost', 'nonprod_ytd_cost', 'total_ytd_cost', 'product_count']
-                for col in numeric_columns:
-                    if col in pillar_df.columns:
-                        pillar_df[col] = pd.to_numeric(pillar_df[col], errors='coerce').fillna(0)
-                pillar_costs_chart = create_enhanced_pillar_costs_chart(pillar_df)
-            else:
-                # Create sample pillar data if none exists
-                sample_pillar_data = create_sample_pillar_costs()
-                pillar_costs_chart = create_enhanced_pillar_costs_chart(sample_pillar_data)
+            # Create sample pillar and product data if none exists; the product
+            # table frame is already numeric
+            chart_inputs['pillar_costs'] = (
+                create_enhanced_pillar_costs_chart,
+                pillar_table_df if not pillar_table_df.empty else create_sample_pillar_costs()
+            )
+            chart_inputs['product_costs'] = (
+                create_enhanced_product_costs_chart,
+                product_table_df if not product_table_df.empty else create_sample_product_costs()
+            )
             
-            # Format and create product costs chart
-            if product_cost_table:
-                # Convert all values to numeric to avoid type errors
-                product_df = pd.DataFrame(product_cost_table)
-                numeric_columns = ['prod_ytd_cost', 'nonprod_ytd_cost', 'total_ytd_cost', 'nonprod_percentage']
-                for col in numeric_columns:
-                    if col in product_df.columns:
-                        product_df[col] = pd.to_numeric(product_df[col], errors='coerce').fillna(0)
-                product_costs_chart = create_enhanced_product_costs_chart(product_df)
-            else:
-                # Create sample product data if none exists
-                sample_product_data = create_sample_product_costs()
-                product_costs_chart = create_enhanced_product_costs_chart(sample_product_data)
-        
-        # Load Jinja2 template
-        template_dir = os.path.dirname(template_path)
-        template_file = os.path.basename(template_path)
-        env = jinja2.Environment(loader=jinja2.FileSystemLoader(template_dir))
-        template = env.get_template(template_file)
-        
-        # Helper function to determine CSS class for percentage changes
-        def get_percent_class(percent_change):
-            if percent_change > 0:
-                return "positive-change"  # Up/red (warning)
-            elif percent_change < 0:
-                return "negative-change"  # Down/green (good)
-            else:
-                return "neutral-change"   # No change
+            rendered = _render_charts(chart_inputs)
+            daily_trend_chart = rendered.get('daily_trend', daily_trend_chart)
+            cto_costs_chart = rendered.get('cto_costs', cto_costs_chart)
+            pillar_costs_chart = rendered['pillar_costs']
+            product_costs_chart = rendered['product_costs']
+        
+        # Load Jinja2 template (compiled once and reused across reports)
+        template = _get_template(template_path)
         
         # Create lists of CTO organizations, pillar teams, and products for filtering
         cto_list = []
@@ -583,72 +788,51 @@ async def generate_html_report_async(
         product_list = []
         pillar_to_cto = {}  # Mapping of pillar to CTO for dropdown filtering
         
-        # Extract unique CTOs from CTO costs
-        # Handle both DataFrame and list of dictionaries format
-        if isinstance(cto_costs, pd.DataFrame):
-            if 'cto_org' in cto_costs.columns:
-                cto_list = cto_costs['cto_org'].unique().tolist()
-        else:
-            # Original list handling
-            for item in cto_costs:
-                if isinstance(item, dict) and 'cto_org' in item and item['cto_org'] not in cto_list:
-                    cto_list.append(item['cto_org'])
-        
-        # Extract unique pillars from pillar costs
-        # Handle both DataFrame and list of dictionaries format
-        if isinstance(pillar_costs, pd.DataFrame):
-            if 'pillar_name' in pillar_costs.columns:
-                pillar_list = pillar_costs['pillar_name'].unique().tolist()
-        else:
-            # Original list handling
-            for item in pillar_costs:
-                if isinstance(item, dict) and 'pillar_name' in item and item['pillar_name'] not in pillar_list:
-                    pillar_list.append(item['pillar_name'])
-        
-        # Create product list with additional details for filtering
-        # Handle both DataFrame and list of dictionaries format
-        if isinstance(product_costs, pd.DataFrame):
-            if all(col in product_costs.columns for col in ['product_name', 'pillar_team', 'product_id']):
-                for _, row in product_costs.iterrows():
-                    product_list.append({
-                        'id': row.get('product_id', ''),
-                        'name': row.get('product_name', ''),
-                        'pillar': row.get('pillar_team', ''),
-                        'display': row.get('display_id', f"{row.get('pillar_team', '')} - {row.get('product_id', '')}")
-                    })
-                    
-                    # Build pillar to CTO mapping if both fields exist
-                    if 'pillar_team' in product_costs.columns and 'cto_org' in product_costs.columns:
-                        pillar_to_cto[row['pillar_team']] = row['cto_org']
-        else:
-            # Original list handling
-            for item in product_costs:
-                if isinstance(item, dict) and 'product_name' in item and 'pillar_team' in item and 'product_id' in item:
-                    product_list.append({
-                        'id': item.get('product_id', ''),
-                        'name': item.get('product_name', ''),
-                        'pillar': item.get('pillar_team', ''),
-                        'display': item.get('display_id', f"{item.get('pillar_team', '')} - {item.get('product_id', '')}")
-                    })
-                    
-                    # Build pillar to CTO mapping
-                    if 'pillar_team' in item and 'cto_org' in item:
-                        pillar_to_cto[item['pillar_team']] = item['cto_org']
+        # Extract unique CTOs and pillars from their cost tables
+        if 'cto_org' in cto_costs.columns:
+            cto_list = cto_costs['cto_org'].unique().tolist()
+        if 'pillar_name' in pillar_costs.columns:
+            pillar_list = pillar_costs['pillar_name'].unique().tolist()
+        
+        # Create product list with additional details for filtering, reading
+        # plain tuples with pre-bound column positions
+        if all(col in product_costs.columns for col in ['product_name', 'pillar_team', 'product_id']):
+            positions = {col: i for i, col in enumerate(product_costs.columns)}
+            id_pos = positions['product_id']
+            name_pos = positions['product_name']
+            pillar_pos = positions['pillar_team']
+            display_pos = positions.get('display_id')
+            cto_pos = positions.get('cto_org')
+            for rec in product_costs.itertuples(index=False, name=None):
+                product_list.append({
+                    'id': rec[id_pos],
+                    'name': rec[name_pos],
+                    'pillar': rec[pillar_pos],
+                    'display': rec[display_pos] if display_pos is not None else f"{rec[pillar_pos]} - {rec[id_pos]}"
+                })
+                
+                # Build pillar to CTO mapping if both fields exist
+                if cto_pos is not None:
+                    pillar_to_cto[rec[pillar_pos]] = rec[cto_pos]
         
         # Sort the lists for easier selection
         cto_list.sort()
         pillar_list.sort()
         product_list.sort(key=lambda x: x['display'])
         
-        # Prepare template data
-        # Check if we're using sample data
-        using_sample_data = hasattr(client, "__class__") and client.__class__.__name__ == "MagicMock"
+        # CSS classes for every percentage change, computed in one pass
+        percent_classes = _percent_classes(scorecard)
         
+        # Prepare template data: the scorecard in one asdict call plus the
+        # non-scorecard extras
         template_data = {
+            **asdict(scorecard),
+            **percent_classes,
+
             'dashboard_title': dashboard_title,
-            'report_start_date': (datetime.now() - timedelta(days=90)).strftime('%Y-%m-%d'),
-            'report_end_date': (datetime.now() - timedelta(days=3)).strftime('%Y-%m-%d'),
-            'report_generation_date': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+            'report_start_date': (now - timedelta(days=90)).strftime('%Y-%m-%d'),
+            'report_end_date': (now - timedelta(days=3)).strftime('%Y-%m-%d'),
+            'report_generation_date': now.strftime('%Y-%m-%d %H:%M:%S'),
             'using_sample_data': using_sample_data,
 
             # Add BigQuery integration data
@@ -658,7 +842,7 @@ async def generate_html_report_async(
             'avg_table': avg_table,
 
             # Interactive charts flag
-            'use_interactive_charts': use_interactive_charts,
+            'use_interactive_charts': use_interactive_charts and are_charts_enabled(),
             
             # Filter information
             'cto_list': cto_list,
@@ -671,158 +855,6 @@ async def generate_html_report_async(
             'show_sql': show_sql,
             'sql_queries': sql_queries,
 
-            # Scorecard data
-            'prod_ytd_cost': prod_ytd_cost,
-            'nonprod_ytd_cost': nonprod_ytd_cost,
-            'prod_fy26_ytd_cost': prod_fy26_ytd_cost,
-            'nonprod_fy26_ytd_cost': nonprod_fy26_ytd_cost,
-            'total_fy26_ytd_cost': total_fy26_ytd_cost,
-            'total_fy25_ytd_cost': total_fy25_ytd_cost,
-            'prod_fy25_cost': prod_fy25_cost,
-            'nonprod_fy25_cost': nonprod_fy25_cost,
-            'total_fy26_cost': total_fy26_cost,
-            'total_fy25_cost': total_fy25_cost,
-            'prod_ytd_percent': prod_ytd_percent,
-            'nonprod_ytd_percent': nonprod_ytd_percent,
-            'fy26_ytd_percent': fy26_ytd_percent,
-            'fy26_percent': fy26_percent,
-            'nonprod_percentage': nonprod_percentage,
-            'nonprod_percentage_change': nonprod_percentage_change,
-
-            # Add CSS classes for percentage changes
-            'prod_ytd_percent_class': get_percent_class(prod_ytd_percent),
-            'nonprod_ytd_percent_class': get_percent_class(nonprod_ytd_percent),
-            'fy26_percent_class': get_percent_class(fy26_percent),
-            'fy26_ytd_percent_class': get_percent_class(fy26_ytd_percent),
-            'nonprod_percentage_change_class': get_percent_class(nonprod_percentage_change),
-
-            # Recent comparisons
-            'day_prod_cost': day_comparison[day_comparison['environment_type'] == 'PROD']['day_current_cost'].iloc[0] if not day_comparison.empty and 'PROD' in day_comparison['environment_type'].values and 'day_current_cost' in day_comparison.columns else 0,
-            'day_nonprod_cost': day_comparison[day_comparison['environment_type'] == 'NON-PROD']['day_current_cost'].iloc[0] if not day_comparison.empty and 'NON-PROD' in day_comparison['environment_type'].values and 'day_current_cost' in day_comparison.columns else 0,
-            'day_prod_previous_cost': day_comparison[day_comparison['environment_type'] == 'PROD']['day_previous_cost'].iloc[0] if not day_comparison.empty and 'PROD' in day_comparison['environment_type'].values and 'day_previous_cost' in day_comparison.columns else 0,
-            'day_nonprod_previous_cost': day_comparison[day_comparison['environment_type'] == 'NON-PROD']['day_previous_cost'].iloc[0] if not day_comparison.empty and 'NON-PROD' in day_comparison['environment_type'].values and 'day_previous_cost' in day_comparison.columns else 0,
-            'day_prod_percent': day_comparison[day_comparison['environment_type'] == 'PROD']['percent_change'].iloc[0] if not day_comparison.empty and 'PROD' in day_comparison['environment_type'].values and 'percent_change' in day_comparison.columns else 0,
-            'day_nonprod_percent': day_comparison[day_comparison['environment_type'] == 'NON-PROD']['percent_change'].iloc[0] if not day_comparison.empty and 'NON-PROD' in day_comparison['environment_type'].values and 'percent_change' in day_comparison.columns else 0,
-
-            'week_prod_cost': week_comparison[week_comparison['environment_type'] == 'PROD']['this_week_cost'].iloc[0] if not week_comparison.empty and 'PROD' in week_comparison['environment_type'].values and 'this_week_cost' in week_comparison.columns else 0,
-            'week_nonprod_cost': week_comparison[week_comparison['environment_type'] == 'NON-PROD']['this_week_cost'].iloc[0] if not week_comparison.empty and 'NON-PROD' in week_comparison['environment_type'].values and 'this_week_cost' in week_comparison.columns else 0,
-            'week_prod_previous_cost': week_comparison[week_comparison['environment_type'] == 'PROD']['prev_week_cost'].iloc[0] if not week_comparison.empty and 'PROD' in week_comparison['environment_type'].values and 'prev_week_cost' in week_comparison.columns else 0,
-            'week_nonprod_previous_cost': week_comparison[week_comparison['environment_type'] == 'NON-PROD']['prev_week_cost'].iloc[0] if not week_comparison.empty and 'NON-PROD' in week_comparison['environment_type'].values and 'prev_week_cost' in week_comparison.columns else 0,
-            'week_prod_percent': week_comparison[week_comparison['environment_type'] == 'PROD']['percent_change'].iloc[0] if not week_comparison.empty and 'PROD' in week_comparison['environment_type'].values and 'percent_change' in week_comparison.columns else 0,
-            'week_nonprod_percent': week_comparison[week_comparison['environment_type'] == 'NON-PROD']['percent_change'].iloc[0] if not week_comparison.empty and 'NON-PROD' in week_comparison['environment_type'].values and 'percent_change' in week_comparison.columns else 0,
-
-            'month_prod_cost': month_comparison[month_comparison['environment_type'] == 'PROD']['this_month_cost'].iloc[0] if not month_comparison.empty and 'PROD' in month_comparison['environment_type'].values and 'this_month_cost' in month_comparison.columns else 0,
-            'month_nonprod_cost': month_comparison[month_comparison['environment_type'] == 'NON-PROD']['this_month_cost'].iloc[0] if not month_comparison.empty and 'NON-PROD' in month_comparison['environment_type'].values and 'this_month_cost' in month_comparison.columns else 0,
-            'month_prod_previous_cost': month_comparison[month_comparison['environment_type'] == 'PROD']['prev_month_cost'].iloc[0] if not month_comparison.empty and 'PROD' in month_comparison['environment_type'].values and 'prev_month_cost' in month_comparison.columns else 0,
-            'month_nonprod_previous_cost': month_comparison[month_comparison['environment_type'] == 'NON-PROD']['prev_month_cost'].iloc[0] if not month_comparison.empty and 'NON-PROD' in month_comparison['environment_type'].values and 'prev_month_cost' in month_comparison.columns else 0,
-            'month_prod_percent': month_comparison[month_comparison['environment_type'] == 'PROD']['percent_change'].iloc[0] if not month_comparison.empty and 'PROD' in month_comparison['environment_type'].values and 'percent_change' in month_comparison.columns else 0,
-            'month_nonprod_percent': month_comparison[month_comparison['environment_type'] == 'NON-PROD']['percent_change'].iloc[0] if not month_comparison.empty and 'NON-PROD' in month_comparison['environment_type'].values and 'percent_change' in month_comparison.columns else 0,
-
-            # Calculate percentage changes if not in original data
-            # For day comparison
-            'day_prod_percent_calculated': ((day_comparison[day_comparison['environment_type'] == 'PROD']['day_current_cost'].iloc[0] /
-                                      day_comparison[day_comparison['environment_type'] == 'PROD']['day_previous_cost'].iloc[0] - 1) * 100
-                                     if not day_comparison.empty and 'PROD' in day_comparison['environment_type'].values and
-                                     'day_current_cost' in day_comparison.columns and
-                                     'day_previous_cost' in day_comparison.columns and
-                                     day_comparison[day_comparison['environment_type'] == 'PROD']['day_previous_cost'].iloc[0] > 0
-                                     else 0),
-            'day_nonprod_percent_calculated': ((day_comparison[day_comparison['environment_type'] == 'NON-PROD']['day_current_cost'].iloc[0] /
-                                          day_comparison[day_comparison['environment_type'] == 'NON-PROD']['day_previous_cost'].iloc[0] - 1) * 100
-                                         if not day_comparison.empty and 'NON-PROD' in day_comparison['environment_type'].values and
-                                         'day_current_cost' in day_comparison.columns and
-                                         'day_previous_cost' in day_comparison.columns and
-                                         day_comparison[day_comparison['environment_type'] == 'NON-PROD']['day_previous_cost'].iloc[0] > 0
-                                         else 0),
-
-            # For week comparison
-            'week_prod_percent_calculated': ((week_comparison[week_comparison['environment_type'] == 'PROD']['this_week_cost'].iloc[0] /
-                                       week_comparison[week_comparison['environment_type'] == 'PROD']['prev_week_cost'].iloc[0] - 1) * 100
-                                      if not week_comparison.empty and 'PROD' in week_comparison['environment_type'].values and
-                                      'this_week_cost' in week_comparison.columns and
-                                      'prev_week_cost' in week_comparison.columns and
-                                      week_comparison[week_comparison['environment_type'] == 'PROD']['prev_week_cost'].iloc[0] > 0
-                                      else 0),
-            'week_nonprod_percent_calculated': ((week_comparison[week_comparison['environment_type'] == 'NON-PROD']['this_week_cost'].iloc[0] /
-                                          week_comparison[week_comparison['environment_type'] == 'NON-PROD']['prev_week_cost'].iloc[0] - 1) * 100
-                                         if not week_comparison.empty and 'NON-PROD' in week_comparison['environment_type'].values and
-                                         'this_week_cost' in week_comparison.columns and
-                                         'prev_week_cost' in week_comparison.columns and
-                                         week_comparison[week_comparison['environment_type'] == 'NON-PROD']['prev_week_cost'].iloc[0] > 0
-                                         else 0),
-
-            # For month comparison
-            'month_prod_percent_calculated': ((month_comparison[month_comparison['environment_type'] == 'PROD']['this_month_cost'].iloc[0] /
-                                        month_comparison[month_comparison['environment_type'] == 'PROD']['prev_month_cost'].iloc[0] - 1) * 100
-                                       if not month_comparison.empty and 'PROD' in month_comparison['environment_type'].values and
-                                       'this_month_cost' in month_comparison.columns and
-                                       'prev_month_cost' in month_comparison.columns and
-                                       month_comparison[month_comparison['environment_type'] == 'PROD']['prev_month_cost'].iloc[0] > 0
-                                       else 0),
-            'month_nonprod_percent_calculated': ((month_comparison[month_comparison['environment_type'] == 'NON-PROD']['this_month_cost'].iloc[0] /
-                                           month_comparison[month_comparison['environment_type'] == 'NON-PROD']['prev_month_cost'].iloc[0] - 1) * 100
-                                          if not month_comparison.empty and 'NON-PROD' in month_comparison['environment_type'].values and
-                                          'this_month_cost' in month_comparison.columns and
-                                          'prev_month_cost' in month_comparison.columns and
-                                          month_comparison[month_comparison['environment_type'] == 'NON-PROD']['prev_month_cost'].iloc[0] > 0
-                                          else 0),
-
-            # Add CSS classes for percentage changes in comparisons
-            'day_prod_percent_class': get_percent_class(
-                ((day_comparison[day_comparison['environment_type'] == 'PROD']['day_current_cost'].iloc[0] /
-                  day_comparison[day_comparison['environment_type'] == 'PROD']['day_previous_cost'].iloc[0] - 1) * 100
-                 if not day_comparison.empty and 'PROD' in day_comparison['environment_type'].values and
-                 'day_current_cost' in day_comparison.columns and
-                 'day_previous_cost' in day_comparison.columns and
-                 day_comparison[day_comparison['environment_type'] == 'PROD']['day_previous_cost'].iloc[0] > 0
-                 else 0)
-            ),
-            'day_nonprod_percent_class': get_percent_class(
-                ((day_comparison[day_comparison['environment_type'] == 'NON-PROD']['day_current_cost'].iloc[0] /
-                  day_comparison[day_comparison['environment_type'] == 'NON-PROD']['day_previous_cost'].iloc[0] - 1) * 100
-                 if not day_comparison.empty and 'NON-PROD' in day_comparison['environment_type'].values and
-                 'day_current_cost' in day_comparison.columns and
-                 'day_previous_cost' in day_comparison.columns and
-                 day_comparison[day_comparison['environment_type'] == 'NON-PROD']['day_previous_cost'].iloc[0] > 0
-                 else 0)
-            ),
-            'week_prod_percent_class': get_percent_class(
-                ((week_comparison[week_comparison['environment_type'] == 'PROD']['this_week_cost'].iloc[0] /
-                  week_comparison[week_comparison['environment_type'] == 'PROD']['prev_week_cost'].iloc[0] - 1) * 100
-                 if not week_comparison.empty and 'PROD' in week_comparison['environment_type'].values and
-                 'this_week_cost' in week_comparison.columns and
-                 'prev_week_cost' in week_comparison.columns and
-                 week_comparison[week_comparison['environment_type'] == 'PROD']['prev_week_cost'].iloc[0] > 0
-                 else 0)
-            ),
-            'week_nonprod_percent_class': get_percent_class(
-                ((week_comparison[week_comparison['environment_type'] == 'NON-PROD']['this_week_cost'].iloc[0] /
-                  week_comparison[week_comparison['environment_type'] == 'NON-PROD']['prev_week_cost'].iloc[0] - 1) * 100
-                 if not week_comparison.empty and 'NON-PROD' in week_comparison['environment_type'].values and
-                 'this_week_cost' in week_comparison.columns and
-                 'prev_week_cost' in week_comparison.columns and
-                 week_comparison[week_comparison['environment_type'] == 'NON-PROD']['prev_week_cost'].iloc[0] > 0
-                 else 0)
-            ),
-            'month_prod_percent_class': get_percent_class(
-                ((month_comparison[month_comparison['environment_type'] == 'PROD']['this_month_cost'].iloc[0] /
-                  month_comparison[month_comparison['environment_type'] == 'PROD']['prev_month_cost'].iloc[0] - 1) * 100
-                 if not month_comparison.empty and 'PROD' in month_comparison['environment_type'].values and
-                 'this_month_cost' in month_comparison.columns and
-                 'prev_month_cost' in month_comparison.columns and
-                 month_comparison[month_comparison['environment_type'] == 'PROD']['prev_month_cost'].iloc[0] > 0
-                 else 0)
-            ),
-            'month_nonprod_percent_class': get_percent_class(
-                ((month_comparison[month_comparison['environment_type'] == 'NON-PROD']['this_month_cost'].iloc[0] /
-                  month_comparison[month_comparison['environment_type'] == 'NON-PROD']['prev_month_cost'].iloc[0] - 1) * 100
-                 if not month_comparison.empty and 'NON-PROD' in month_comparison['environment_type'].values and
-                 'this_month_cost' in month_comparison.columns and
-                 'prev_month_cost' in month_comparison.columns and
-                 month_comparison[month_comparison['environment_type'] == 'NON-PROD']['prev_month_cost'].iloc[0] > 0
-                 else 0)
-            ),
-
             # Date information for comparison section
             'day_current_date': date_info.get('day_current_date', ''),
             'day_previous_date': date_info.get('day_previous_date', ''),
@@ -831,11 +863,15 @@ async def generate_html_report_async(
             'month_current_date_range': date_info.get('month_current_date_range', ''),
             'month_previous_date_range': date_info.get('month_previous_date_range', ''),
 
-            # Display in millions flag
+            # Display settings
             'display_in_millions': display_millions,
+            'nonprod_percentage_threshold': nonprod_threshold,
 
-            # Static charts
+            # Interactive charts
             'daily_trend_chart': daily_trend_chart,
+            'cto_costs_chart': cto_costs_chart,
+            'pillar_costs_chart': pillar_costs_chart,
+            'product_costs_chart': product_costs_chart,
 
             # Tables
             'product_cost_table': product_cost_table,
@@ -843,32 +879,28 @@ async def generate_html_report_async(
             'pillar_cost_table': pillar_cost_table
         }
         
-        # Add the non-prod percentage threshold to template data
-        template_data['nonprod_percentage_threshold'] = nonprod_threshold
-        
-        # Add interactive charts to template data
-        template_data['use_interactive_charts'] = use_interactive_charts and are_charts_enabled()
-        template_data['daily_trend_chart'] = daily_trend_chart
-        template_data['cto_costs_chart'] = cto_costs_chart
-        template_data['pillar_costs_chart'] = pillar_costs_chart
-        template_data['product_costs_chart'] = product_costs_chart
-        
-        # Add sample data flag to template data
-        template_data['using_sample_data'] = using_sample_data
-        
         # Debug template data
         logger.info(f"Template data product_cost_table length: {len(template_data.get('product_cost_table', []))}")
         
-        # Render template and save to file
-        html_output = template.render(**template_data)
-        
         # Create output directory if it doesn't exist
         output_dir = os.path.dirname(output_path)
         if output_dir and not os.path.exists(output_dir):
             os.makedirs(output_dir)
             
-        with open(output_path, 'w', encoding='utf-8') as f:
-            f.write(html_output)
+        # Stream the rendered template straight into the file instead of
+        # building the whole document as one string first
+        html_stream = template.stream(**template_data)
+        html_stream.enable_buffering(size=TEMPLATE_STREAM_BUFFER)
+        # The output path is shared by every filter combination: drop the old
+        # ETag before replacing the report and write the new one last, so a
+        # render that fails in between cannot leave an ETag describing a
+        # different report
+        try:
+            os.unlink(etag_path)
+        except FileNotFoundError:
+            pass
+        _atomic_write(output_path, html_stream)
+        _atomic_write(etag_path, report_etag)
             
         logger.info(f"HTML report generated successfully: {output_path}")
         return output_path
@@ -876,5 +908,3 @@ async def generate_html_report_async(
     except Exception as e:
         logger.error(f"Error generating HTML report: {e}")
         raise
-
-# Asyncio imported at the top of the file
\ No newline at end of file
@@ -1,8 +1,12 @@
 """
 Asynchronous data access functions for FinOps360 cost analysis FastAPI dashboard.
 """
+import calendar
+import functools
 import logging
-from datetime import datetime, timedelta
+import threading
+from collections import OrderedDict
+from datetime import date, timedelta
 from typing import Tuple, Dict, List, Any, Optional
 
 import pandas as pd
@@ -10,7 +14,8 @@ from google.cloud import bigquery
 import asyncio
 from concurrent.futures import ThreadPoolExecutor
 
-from app.utils.db import run_query, load_sql_query
+from app.utils.config_loader import load_config
+from app.utils.db import date_params, query_params, run_query, load_sql_query
 from app.utils.data_generator import (
     create_sample_ytd_costs,
     create_sample_fy26_ytd_costs,
@@ -22,13 +27,120 @@ from app.utils.data_generator import (
     create_sample_product_costs,
     create_sample_cto_costs,
     create_sample_pillar_costs,
-    create_sample_daily_trend_data
+    create_sample_daily_trend_data,
+    create_sample_date_info
 )
 
 logger = logging.getLogger(__name__)
 
-# Thread pool for running BigQuery queries in async functions
-_thread_pool = ThreadPoolExecutor(max_workers=5)
+# Number of BigQuery queries a dashboard render issues at once: eight
+# single-query getters plus the combined recent-comparison query
+DASHBOARD_QUERY_COUNT = 9
+
+# Thread pool for running BigQuery queries in async functions. It is sized so
+# that every query of a render runs concurrently instead of queueing behind
+# the first few, which keeps render latency close to the slowest query.
+_thread_pool = ThreadPoolExecutor(max_workers=DASHBOARD_QUERY_COUNT, thread_name_prefix="bigquery")
+
+# Query results are reused for the rest of the day: the cost tables are
+# loaded daily, so re-running an identical query within a day returns the
+# same rows. Keyed by project, query text, parameters and today's date.
+QUERY_CACHE_SIZE = 32
+_query_cache: "OrderedDict[Tuple, pd.DataFrame]" = OrderedDict()
+_query_cache_lock = threading.Lock()
+
+def _run_query_cached(
+    client: bigquery.Client,
+    query: str,
+    params: Optional[List[bigquery.ScalarQueryParameter]] = None,
+    use_bqstorage: bool = True
+) -> pd.DataFrame:
+    """
+    Run a query, reusing the result of an identical query run earlier today.
+    
+    Empty results are not cached, so sample-data fallbacks and failed
+    queries are retried on the next render.
+    
+    Args:
+        client: BigQuery client
+        query: SQL query to execute
+        params: Query parameters (optional)
+        use_bqstorage: Download results through the BigQuery Storage API
+        
+    Returns:
+        DataFrame with query results (a copy, safe for callers to modify)
+    """
+    key = (
+        getattr(client, "project", None),
+        query,
+        tuple((p.name, p.type_, str(p.value)) for p in params or ()),
+        date.today().isoformat()
+    )
+    with _query_cache_lock:
+        cached = _query_cache.get(key)
+        if cached is not None:
+            _query_cache.move_to_end(key)
+    if cached is not None:
+        logger.info("Using cached query result from earlier today")
+        return cached.copy()
+    
+    result = run_query(client, query, params, use_bqstorage)
+    if not result.empty:
+        with _query_cache_lock:
+            _query_cache[key] = result.copy()
+            while len(_query_cache) > QUERY_CACHE_SIZE:
+                _query_cache.popitem(last=False)
+    return result
+
+# Expression that derives environment_type from the raw environment column
+ENVIRONMENT_TYPE_CASE = "CASE WHEN environment = 'PROD' THEN 'PROD' ELSE 'NON-PROD' END"
+
+def _environment_type_sql(table: str) -> str:
+    """
+    Get the SQL expression for environment_type when querying a cost table.
+    
+    The table configured as bigquery.cost_by_env_table (see
+    app/data/create_cost_by_env_table.sql) stores environment_type as a
+    clustered column, so it is read directly instead of being derived per row.
+    
+    Args:
+        table: Cost table name
+        
+    Returns:
+        SQL expression for the environment type
+    """
+    cost_by_env_table = load_config("config.yaml").get('bigquery', {}).get('cost_by_env_table')
+    if cost_by_env_table and table == cost_by_env_table:
+        return "environment_type"
+    return ENVIRONMENT_TYPE_CASE
+
+def _ytd_params() -> List[bigquery.ScalarQueryParameter]:
+    """
+    Query parameters for the YTD queries, which run from the fiscal year start
+    (data.fy_start_date) up to today minus 3 days.
+    
+    The end date is computed here rather than with CURRENT_DATE() in SQL so
+    BigQuery can serve repeated runs on the same day from its result cache.
+    """
+    # Never pass an empty string as a date
+    start_date = load_config("config.yaml").get('data', {}).get('fy_start_date') or '2025-02-01'
+    return date_params(start_date=start_date, ytd_end=date.today() - timedelta(days=3))
+
+def _fy25_params() -> List[bigquery.ScalarQueryParameter]:
+    """
+    Query parameters for the FY25 query, whose YTD window ends one year ago today.
+    """
+    return date_params(fy25_ytd_end=(pd.Timestamp.today().normalize() - pd.DateOffset(years=1)).date())
+
+@functools.cache
+def _format_week_range(start: str, end: str) -> str:
+    """
+    Format an ISO week range as a display label, e.g. "Apr 27 - May 03, 2025".
+    
+    The comparison weeks come from fixed config dates, so each label is
+    formatted once per process.
+    """
+    return f"{date.fromisoformat(start):%b %d} - {date.fromisoformat(end):%b %d, %Y}"
 
 async def get_ytd_costs_async(
     client: bigquery.Client, 
@@ -37,7 +149,8 @@ async def get_ytd_costs_async(
     table: str,
     cto_filter: str = "",
     pillar_filter: str = "",
-    product_filter: str = ""
+    product_filter: str = "",
+    filter_params: Optional[List[bigquery.ScalarQueryParameter]] = None
 ) -> pd.DataFrame:
     """
     Get year-to-date costs for production and non-production (async version).
@@ -47,6 +160,7 @@ async def get_ytd_costs_async(
         project_id=project_id, 
         dataset=dataset, 
         table=table,
+        environment_type=_environment_type_sql(table),
         cto_filter=cto_filter,
         pillar_filter=pillar_filter,
         product_filter=product_filter
@@ -56,7 +170,7 @@ async def get_ytd_costs_async(
         # Run the query in a thread to not block the event loop
         result = await asyncio.get_event_loop().run_in_executor(
             _thread_pool, 
-            lambda: run_query(client, query)
+            lambda: _run_query_cached(client, query, _ytd_params() + (filter_params or []), use_bqstorage=False)
         )
         return result
     except Exception as e:
@@ -71,17 +185,19 @@ async def get_fy26_ytd_costs_async(
     table: str,
     cto_filter: str = "",
     pillar_filter: str = "",
-    product_filter: str = ""
+    product_filter: str = "",
+    filter_params: Optional[List[bigquery.ScalarQueryParameter]] = None
 ) -> pd.DataFrame:
     """
     Get FY26 year-to-date costs for production and non-production (async version).
-    This represents actual costs from the beginning of FY26 (2025-02-01) to current date - 3 days.
+    This represents actual costs from the beginning of FY26 (data.fy_start_date) to current date - 3 days.
     """
     query = load_sql_query(
         "fy26_ytd_costs", 
         project_id=project_id, 
         dataset=dataset, 
         table=table,
+        environment_type=_environment_type_sql(table),
         cto_filter=cto_filter,
         pillar_filter=pillar_filter,
         product_filter=product_filter
@@ -90,7 +206,7 @@ async def get_fy26_ytd_costs_async(
     try:
         result = await asyncio.get_event_loop().run_in_executor(
             _thread_pool, 
-            lambda: run_query(client, query)
+            lambda: _run_query_cached(client, query, _ytd_params() + (filter_params or []), use_bqstorage=False)
         )
         return result
     except Exception as e:
@@ -104,7 +220,8 @@ async def get_fy26_costs_async(
     table: str,
     cto_filter: str = "",
     pillar_filter: str = "",
-    product_filter: str = ""
+    product_filter: str = "",
+    filter_params: Optional[List[bigquery.ScalarQueryParameter]] = None
 ) -> pd.DataFrame:
     """
     Get projected FY26 costs for production and non-production (async version).
@@ -114,6 +231,7 @@ async def get_fy26_costs_async(
         project_id=project_id, 
         dataset=dataset, 
         table=table,
+        environment_type=_environment_type_sql(table),
         cto_filter=cto_filter,
         pillar_filter=pillar_filter,
         product_filter=product_filter
@@ -122,7 +240,7 @@ async def get_fy26_costs_async(
     try:
         result = await asyncio.get_event_loop().run_in_executor(
             _thread_pool, 
-            lambda: run_query(client, query)
+            lambda: _run_query_cached(client, query, filter_params, use_bqstorage=False)
         )
         return result
     except Exception as e:
@@ -136,7 +254,8 @@ async def get_fy25_costs_async(
     table: str,
     cto_filter: str = "",
     pillar_filter: str = "",
-    product_filter: str = ""
+    product_filter: str = "",
+    filter_params: Optional[List[bigquery.ScalarQueryParameter]] = None
 ) -> pd.DataFrame:
     """
     Get FY25 costs for year-over-year comparison (async version).
@@ -146,6 +265,7 @@ async def get_fy25_costs_async(
         project_id=project_id, 
         dataset=dataset, 
         table=table,
+        environment_type=_environment_type_sql(table),
         cto_filter=cto_filter,
         pillar_filter=pillar_filter,
         product_filter=product_filter
@@ -154,7 +274,7 @@ async def get_fy25_costs_async(
     try:
         result = await asyncio.get_event_loop().run_in_executor(
             _thread_pool, 
-            lambda: run_query(client, query)
+            lambda: _run_query_cached(client, query, _fy25_params() + (filter_params or []), use_bqstorage=False)
         )
         return result
     except Exception as e:
@@ -176,166 +296,80 @@ async def get_recent_comparisons_async(
     month_previous: str = "2025-03",
     cto_filter: str = "",
     pillar_filter: str = "",
-    product_filter: str = ""
+    product_filter: str = "",
+    filter_params: Optional[List[bigquery.ScalarQueryParameter]] = None
 ) -> Tuple[pd.DataFrame, pd.DataFrame, pd.DataFrame, Dict[str, str]]:
     """
     Get recent day, week, and month comparisons using fixed dates from configuration (async version).
     """
     # Log comparison dates for debugging
-    logger.debug(f"Running comparisons with the following dates:")
-    logger.debug(f"Day: {day_current_date} vs {day_previous_date}")
-    logger.debug(f"Week: {week_current_start}-{week_current_end} vs {week_previous_start}-{week_previous_end}")
-    logger.debug(f"Month: {month_current} vs {month_previous}")
+    logger.debug("Running comparisons with the following dates:")
+    logger.debug("Day: %s vs %s", day_current_date, day_previous_date)
+    logger.debug("Week: %s-%s vs %s-%s", week_current_start, week_current_end, week_previous_start, week_previous_end)
+    logger.debug("Month: %s vs %s", month_current, month_previous)
     
     try:
-        # Day comparison
-        day_query = load_sql_query(
-            "day_comparison",
-            project_id=project_id,
-            dataset=dataset,
-            table=table,
-            day_current=day_current_date,
-            day_previous=day_previous_date,
-            cto_filter=cto_filter,
-            pillar_filter=pillar_filter,
-            product_filter=product_filter
-        )
-        
-        # Week comparison
-        week_query = load_sql_query(
-            "week_comparison",
-            project_id=project_id,
-            dataset=dataset,
-            table=table,
-            this_week_start=week_current_start,
-            this_week_end=week_current_end,
-            prev_week_start=week_previous_start,
-            prev_week_end=week_previous_end,
-            cto_filter=cto_filter,
-            pillar_filter=pillar_filter,
-            product_filter=product_filter
-        )
-        
         # Parse month strings to get start and end dates
         this_month_year, this_month_month = map(int, month_current.split('-'))
         prev_month_year, prev_month_month = map(int, month_previous.split('-'))
         
-        logger.info(f"Calculating month ranges:")
-        logger.info(f"Current month: {month_current} (Year: {this_month_year}, Month: {this_month_month})")
-        logger.info(f"Previous month: {month_previous} (Year: {prev_month_year}, Month: {prev_month_month})")
-        
-        # First day of each month
+        # First and last day of each month
         this_month_start = f"{month_current}-01"
         prev_month_start = f"{month_previous}-01"
+        this_month_end = date(this_month_year, this_month_month, calendar.monthrange(this_month_year, this_month_month)[1]).isoformat()
+        prev_month_end = date(prev_month_year, prev_month_month, calendar.monthrange(prev_month_year, prev_month_month)[1]).isoformat()
         
-        logger.info(f"Month start dates: Current={this_month_start}, Previous={prev_month_start}")
+        logger.debug("Month ranges: Current=%s to %s, Previous=%s to %s",
+                     this_month_start, this_month_end, prev_month_start, prev_month_end)
         
-        # Calculate last day of each month
-        if this_month_month == 12:
-            next_month_year = this_month_year + 1
-            next_month_month = 1
-        else:
-            next_month_year = this_month_year
-            next_month_month = this_month_month + 1
-            
-        if prev_month_month == 12:
-            next_prev_month_year = prev_month_year + 1
-            next_prev_month_month = 1
-        else:
-            next_prev_month_year = prev_month_year
-            next_prev_month_month = prev_month_month + 1
-        
-        # Calculate end dates as first day of next month minus one day
-        this_month_date = datetime(this_month_year, this_month_month, 1)
-        next_month_date = datetime(next_month_year, next_month_month, 1)
-        this_month_end = (next_month_date - timedelta(days=1)).strftime('%Y-%m-%d')
-        
-        prev_month_date = datetime(prev_month_year, prev_month_month, 1)
-        next_prev_month_date = datetime(next_prev_month_year, next_prev_month_month, 1)
-        prev_month_end = (next_prev_month_date - timedelta(days=1)).strftime('%Y-%m-%d')
-        
-        logger.info(f"Month end dates: Current={this_month_end}, Previous={prev_month_end}")
-        logger.info(f"Full month ranges: Current={this_month_start} to {this_month_end}, Previous={prev_month_start} to {prev_month_end}")
-        
-        # Month comparison query
-        month_query = load_sql_query(
-            "month_comparison",
+        # Day, week and month comparisons in a single query over the union of
+        # their date ranges (ISO dates compare correctly as strings)
+        comparison_query = load_sql_query(
+            "recent_comparisons",
             project_id=project_id,
             dataset=dataset,
             table=table,
-            this_month_start=this_month_start,
-            this_month_end=this_month_end,
-            prev_month_start=prev_month_start,
-            prev_month_end=prev_month_end,
+            environment_type=_environment_type_sql(table),
             cto_filter=cto_filter,
             pillar_filter=pillar_filter,
             product_filter=product_filter
         )
         
-        # Run all queries in parallel using thread pool
-        day_task = asyncio.get_event_loop().run_in_executor(
-            _thread_pool, 
-            lambda: run_query(client, day_query)
-        )
-        
-        week_task = asyncio.get_event_loop().run_in_executor(
-            _thread_pool, 
-            lambda: run_query(client, week_query)
+        comparison_params = date_params(
+            day_current=day_current_date,
+            day_previous=day_previous_date,
+            this_week_start=week_current_start,
+            this_week_end=week_current_end,
+            prev_week_start=week_previous_start,
+            prev_week_end=week_previous_end,
+            this_month_start=this_month_start,
+            this_month_end=this_month_end,
+            prev_month_start=prev_month_start,
+            prev_month_end=prev_month_end,
+            min_date=min(day_previous_date, day_current_date, week_previous_start, prev_month_start, this_month_start),
+            max_date=max(day_previous_date, day_current_date, week_current_end, prev_month_end, this_month_end)
         )
         
-        month_task = asyncio.get_event_loop().run_in_executor(
+        comparisons = await asyncio.get_event_loop().run_in_executor(
             _thread_pool, 
-            lambda: run_query(client, month_query)
+            lambda: _run_query_cached(client, comparison_query, comparison_params + (filter_params or []), use_bqstorage=False)
         )
         
-        # Wait for all queries to complete
-        day_comparison, week_comparison, month_comparison = await asyncio.gather(
-            day_task, week_task, month_task
-        )
-        
-        # Create formatted month names for display
-        this_month_display = datetime(this_month_year, this_month_month, 1).strftime('%b %Y')
-        prev_month_display = datetime(prev_month_year, prev_month_month, 1).strftime('%b %Y')
+        # Split the combined result into the per-period frames
+        day_comparison = comparisons.reindex(columns=['environment_type', 'day_current_cost', 'day_previous_cost'])
+        week_comparison = comparisons.reindex(columns=['environment_type', 'this_week_cost', 'prev_week_cost'])
+        month_comparison = comparisons.reindex(columns=['environment_type', 'this_month_cost', 'prev_month_cost'])
         
         # Create a dictionary with date information for the template
         date_info = {
             'day_current_date': day_current_date,
             'day_previous_date': day_previous_date,
-            'week_current_date_range': f"{datetime.strptime(week_current_start, '%Y-%m-%d').strftime('%b %d')} - {datetime.strptime(week_current_end, '%Y-%m-%d').strftime('%b %d, %Y')}",
-            'week_previous_date_range': f"{datetime.strptime(week_previous_start, '%Y-%m-%d').strftime('%b %d')} - {datetime.strptime(week_previous_end, '%Y-%m-%d').strftime('%b %d, %Y')}",
-            'month_current_date_range': this_month_display,
-            'month_previous_date_range': prev_month_display
+            'week_current_date_range': _format_week_range(week_current_start, week_current_end),
+            'week_previous_date_range': _format_week_range(week_previous_start, week_previous_end),
+            'month_current_date_range': f"{date(this_month_year, this_month_month, 1):%b %Y}",
+            'month_previous_date_range': f"{date(prev_month_year, prev_month_month, 1):%b %Y}"
         }
         
-        # Always use the provided day_current_date
-        date_info['day_current_date'] = day_current_date 
-                
-        # If we have special date fields in week comparison, use them
-        if not week_comparison.empty:
-            if 'this_week_start' in week_comparison.columns and 'this_week_end' in week_comparison.columns:
-                this_week_start = week_comparison['this_week_start'].iloc[0]
-                this_week_end = week_comparison['this_week_end'].iloc[0]
-                if this_week_start and this_week_end:
-                    date_info['week_current_date_range'] = f"{this_week_start} - {this_week_end}"
-                    
-            if 'prev_week_start' in week_comparison.columns and 'prev_week_end' in week_comparison.columns:
-                prev_week_start = week_comparison['prev_week_start'].iloc[0]
-                prev_week_end = week_comparison['prev_week_end'].iloc[0]
-                if prev_week_start and prev_week_end:
-                    date_info['week_previous_date_range'] = f"{prev_week_start} - {prev_week_end}"
-                    
-        # If we have month fields in the month comparison, use them
-        if not month_comparison.empty:
-            if 'this_month' in month_comparison.columns:
-                this_month = month_comparison['this_month'].iloc[0]
-                if this_month:
-                    date_info['month_current_date_range'] = this_month
-                    
-            if 'prev_month' in month_comparison.columns:
-                prev_month = month_comparison['prev_month'].iloc[0]
-                if prev_month:
-                    date_info['month_previous_date_range'] = prev_month
-        
         return day_comparison, week_comparison, month_comparison, date_info
     
     except Exception as e:
@@ -366,7 +400,8 @@ async def get_product_costs_async(
     nonprod_pct_threshold: int = 30,
     cto_filter: str = "",
     pillar_filter: str = "",
-    product_filter: str = ""
+    product_filter: str = "",
+    filter_params: Optional[List[bigquery.ScalarQueryParameter]] = None
 ) -> pd.DataFrame:
     """
     Get costs by product ID with prod/nonprod breakdown (async version).
@@ -376,7 +411,6 @@ async def get_product_costs_async(
         project_id=project_id, 
         dataset=dataset, 
         table=table,
-        top_n=top_n,
         cto_filter=cto_filter,
         pillar_filter=pillar_filter,
         product_filter=product_filter
@@ -385,13 +419,50 @@ async def get_product_costs_async(
     try:
         result = await asyncio.get_event_loop().run_in_executor(
             _thread_pool, 
-            lambda: run_query(client, query)
+            lambda: _run_query_cached(client, query, _ytd_params() + query_params(top_n=top_n) + (filter_params or []))
         )
         return result
     except Exception as e:
         logger.error(f"Error in get_product_costs_async: {e}")
         return create_sample_product_costs()
 
+async def get_product_breakdown_async(
+    client: bigquery.Client, 
+    project_id: str, 
+    dataset: str, 
+    table: str, 
+    top_n: int = 10,
+    cto_filter: str = "",
+    pillar_filter: str = "",
+    product_filter: str = "",
+    filter_params: Optional[List[bigquery.ScalarQueryParameter]] = None
+) -> pd.DataFrame:
+    """
+    Get the top products by total cost, one row per product (async version).
+    
+    Products are summed and ranked in BigQuery, so the result is ready to
+    plot with create_product_breakdown_chart.
+    """
+    query = load_sql_query(
+        "product_breakdown", 
+        project_id=project_id, 
+        dataset=dataset, 
+        table=table,
+        cto_filter=cto_filter,
+        pillar_filter=pillar_filter,
+        product_filter=product_filter
+    )
+    
+    try:
+        result = await asyncio.get_event_loop().run_in_executor(
+            _thread_pool, 
+            lambda: _run_query_cached(client, query, _ytd_params() + query_params(top_n=top_n) + (filter_params or []))
+        )
+        return result
+    except Exception as e:
+        logger.error(f"Error in get_product_breakdown_async: {e}")
+        return create_sample_product_costs()
+
 async def get_cto_costs_async(
     client: bigquery.Client, 
     project_id: str, 
@@ -400,7 +471,8 @@ async def get_cto_costs_async(
     top_n: int = 10,
     cto_filter: str = "",
     pillar_filter: str = "",
-    product_filter: str = ""
+    product_filter: str = "",
+    filter_params: Optional[List[bigquery.ScalarQueryParameter]] = None
 ) -> pd.DataFrame:
     """
     Get costs by CTO organization with prod/nonprod breakdown (async version).
@@ -410,7 +482,6 @@ async def get_cto_costs_async(
         project_id=project_id, 
         dataset=dataset, 
         table=table,
-        top_n=top_n,
         cto_filter=cto_filter,
         pillar_filter=pillar_filter,
         product_filter=product_filter
@@ -419,7 +490,7 @@ async def get_cto_costs_async(
     try:
         result = await asyncio.get_event_loop().run_in_executor(
             _thread_pool, 
-            lambda: run_query(client, query)
+            lambda: _run_query_cached(client, query, _ytd_params() + query_params(top_n=top_n) + (filter_params or []))
         )
         return result
     except Exception as e:
@@ -434,7 +505,8 @@ async def get_pillar_costs_async(
     top_n: int = 10,
     cto_filter: str = "",
     pillar_filter: str = "",
-    product_filter: str = ""
+    product_filter: str = "",
+    filter_params: Optional[List[bigquery.ScalarQueryParameter]] = None
 ) -> pd.DataFrame:
     """
     Get costs by product pillar team with prod/nonprod breakdown (async version).
@@ -444,7 +516,6 @@ async def get_pillar_costs_async(
         project_id=project_id, 
         dataset=dataset, 
         table=table,
-        top_n=top_n,
         cto_filter=cto_filter,
         pillar_filter=pillar_filter,
         product_filter=product_filter
@@ -453,7 +524,7 @@ async def get_pillar_costs_async(
     try:
         result = await asyncio.get_event_loop().run_in_executor(
             _thread_pool, 
-            lambda: run_query(client, query)
+            lambda: _run_query_cached(client, query, _ytd_params() + query_params(top_n=top_n) + (filter_params or []))
         )
         return result
     except Exception as e:
@@ -468,32 +539,24 @@ async def get_daily_trend_data_async(
     days: int = 90,
     cto_filter: str = "",
     pillar_filter: str = "",
-    product_filter: str = ""
+    product_filter: str = "",
+    filter_params: Optional[List[bigquery.ScalarQueryParameter]] = None
 ) -> pd.DataFrame:
     """
     Get daily trend data from avg_table (async version).
     """
-    # Get date range from config
-    from app.utils.config_loader import load_config
-    config = load_config("config.yaml")
-    data_config = config.get('data', {})
-    
-    # Get fiscal year start and end dates from config with defaults
-    fy_start_date_str = data_config.get('fy_start_date', '2025-02-01')
-    fy_end_date_str = data_config.get('fy_end_date', '2026-01-31')
+    data_config = load_config("config.yaml").get('data', {})
     
-    # Ensure we never pass empty strings as dates
-    start_date_str = fy_start_date_str if fy_start_date_str else '2025-02-01'
-    # Use current date minus 3 days as a safe default if end date is empty
-    end_date_str = fy_end_date_str if fy_end_date_str else ''
+    # Days per trend point; values above 1 trade daily detail for fewer rows
+    bucket_days = max(1, int(data_config.get('trend_bucket_days', 1) or 1))
+    # The trend window starts at the same @start_date as the YTD queries
+    params = _ytd_params() + query_params(bucket_days=bucket_days) + (filter_params or [])
     
     query = load_sql_query(
         "daily_trend_data",
         project_id=project_id,
         dataset=dataset,
         avg_table=avg_table,
-        start_date=start_date_str,
-        end_date=end_date_str,
         cto_filter=cto_filter,
         pillar_filter=pillar_filter,
         product_filter=product_filter
@@ -502,34 +565,128 @@ async def get_daily_trend_data_async(
     try:
         result = await asyncio.get_event_loop().run_in_executor(
             _thread_pool, 
-            lambda: run_query(client, query)
+            lambda: _run_query_cached(client, query, params)
         )
         return result
     except Exception as e:
         logger.error(f"Error in get_daily_trend_data_async: {e}")
         return create_sample_daily_trend_data()
 
-# Helper function to create a sample date_info dictionary
-def create_sample_date_info() -> Dict[str, str]:
-    """Create sample date information for templates when real data is unavailable."""
-    today = datetime.now()
-    yesterday = today - timedelta(days=1)
+async def fetch_dashboard_data_async(
+    client: bigquery.Client,
+    project_id: str,
+    dataset: str,
+    cost_table: str,
+    avg_table: str,
+    data_config: Dict[str, Any],
+    cto_filter: str = "",
+    pillar_filter: str = "",
+    product_filter: str = "",
+    filter_params: Optional[List[bigquery.ScalarQueryParameter]] = None
+) -> Dict[str, Any]:
+    """
+    Fetch every dataset the dashboard needs, running all queries concurrently.
+    
+    The queries have no dependencies on each other, so they are started
+    together and the render waits only for the slowest one. A query that
+    fails is replaced with its sample data without affecting the others.
+    
+    Args:
+        client: BigQuery client
+        project_id: Google Cloud project ID
+        dataset: BigQuery dataset
+        cost_table: Cost analysis table name
+        avg_table: Average daily cost table name
+        data_config: The 'data' section of the configuration
+        cto_filter: SQL condition for the CTO filter
+        pillar_filter: SQL condition for the pillar filter
+        product_filter: SQL condition for the product filter
+        filter_params: Query parameters referenced by the filter conditions
+        
+    Returns:
+        Dictionary of DataFrames keyed by dataset name, plus 'date_info'
+    """
+    # Sample data mode: no query could return rows, so skip building and
+    # running them and use the sample frames directly
+    if hasattr(client, "__class__") and client.__class__.__name__ == "MagicMock":
+        logger.info("Using sample data - skipping BigQuery queries")
+        return {
+            'ytd_costs': create_sample_ytd_costs(),
+            'fy26_ytd_costs': create_sample_fy26_ytd_costs(),
+            'fy26_costs': create_sample_fy26_costs(),
+            'fy25_costs': create_sample_fy25_costs(),
+            'day_comparison': create_sample_day_comparison(),
+            'week_comparison': create_sample_week_comparison(),
+            'month_comparison': create_sample_month_comparison(),
+            'date_info': create_sample_date_info(),
+            'product_costs': create_sample_product_costs(),
+            'cto_costs': create_sample_cto_costs(),
+            'pillar_costs': create_sample_pillar_costs(),
+            'daily_trend_data': create_sample_daily_trend_data()
+        }
     
-    # Calculate current and previous weeks
-    current_week_end = today - timedelta(days=today.weekday() + 1)  # Last Sunday
-    current_week_start = current_week_end - timedelta(days=6)  # Last Monday
-    previous_week_end = current_week_start - timedelta(days=1)  # Sunday before last
-    previous_week_start = previous_week_end - timedelta(days=6)  # Monday before last
+    filters = dict(cto_filter=cto_filter, pillar_filter=pillar_filter, product_filter=product_filter,
+                   filter_params=filter_params)
+    top_products = data_config.get('top_products_count', 0)
     
-    # Calculate current and previous months
-    current_month = today.replace(day=1)
-    previous_month = (current_month - timedelta(days=1)).replace(day=1)
+    results = await asyncio.gather(
+        get_ytd_costs_async(client, project_id, dataset, cost_table, **filters),
+        get_fy26_ytd_costs_async(client, project_id, dataset, cost_table, **filters),
+        get_fy26_costs_async(client, project_id, dataset, cost_table, **filters),
+        get_fy25_costs_async(client, project_id, dataset, cost_table, **filters),
+        get_recent_comparisons_async(
+            client, project_id, dataset, cost_table,
+            day_current_date=data_config.get('day_current_date', ''),
+            day_previous_date=data_config.get('day_previous_date', ''),
+            week_current_start=data_config.get('week_current_start', ''),
+            week_current_end=data_config.get('week_current_end', ''),
+            week_previous_start=data_config.get('week_previous_start', ''),
+            week_previous_end=data_config.get('week_previous_end', ''),
+            month_current=data_config.get('month_current', ''),
+            month_previous=data_config.get('month_previous', ''),
+            **filters
+        ),
+        get_product_costs_async(
+            client, project_id, dataset, cost_table,
+            top_n=top_products,
+            nonprod_pct_threshold=data_config.get('nonprod_percentage_threshold', 0),
+            **filters
+        ),
+        get_cto_costs_async(client, project_id, dataset, cost_table, top_n=top_products, **filters),
+        get_pillar_costs_async(client, project_id, dataset, cost_table, top_n=top_products, **filters),
+        get_daily_trend_data_async(client, project_id, dataset, avg_table, **filters),
+        return_exceptions=True  # Don't let one task failure fail all tasks
+    )
+    
+    def _result(index: int, sample_factory):
+        if isinstance(results[index], Exception):
+            logger.error(f"Dashboard query {index} failed, using sample data: {results[index]}")
+            return sample_factory()
+        return results[index]
+    
+    if isinstance(results[4], Exception):
+        logger.error(f"Recent comparisons query failed, using sample data: {results[4]}")
+        comparisons = (
+            create_sample_day_comparison(),
+            create_sample_week_comparison(),
+            create_sample_month_comparison(),
+            create_sample_date_info()
+        )
+    else:
+        comparisons = results[4]
+    day_comparison, week_comparison, month_comparison, date_info = comparisons
     
     return {
-        'day_current_date': today.strftime('%Y-%m-%d'),
-        'day_previous_date': yesterday.strftime('%Y-%m-%d'),
-        'week_current_date_range': f"{current_week_start.strftime('%b %d')} - {current_week_end.strftime('%b %d, %Y')}",
-        'week_previous_date_range': f"{previous_week_start.strftime('%b %d')} - {previous_week_end.strftime('%b %d, %Y')}",
-        'month_current_date_range': current_month.strftime('%b %Y'),
-        'month_previous_date_range': previous_month.strftime('%b %Y')
-    }
\ No newline at end of file
+        'ytd_costs': _result(0, create_sample_ytd_costs),
+        'fy26_ytd_costs': _result(1, create_sample_fy26_ytd_costs),
+        'fy26_costs': _result(2, create_sample_fy26_costs),
+        'fy25_costs': _result(3, create_sample_fy25_costs),
+        'day_comparison': day_comparison,
+        'week_comparison': week_comparison,
+        'month_comparison': month_comparison,
+        'date_info': date_info,
+        'product_costs': _result(5, create_sample_product_costs),
+        'cto_costs': _result(6, create_sample_cto_costs),
+        'pillar_costs': _result(7, create_sample_pillar_costs),
+        'daily_trend_data': _result(8, create_sample_daily_trend_data)
+    }
@@ -0,0 +1,24 @@
+-- Create the cost table with a precomputed environment_type column
+-- Variables will be replaced by script with values from config.yaml
+-- Re-run (or schedule as a nightly query) after each cost table load
+DECLARE PROJECT_ID STRING DEFAULT '{project_id}';
+DECLARE DATASET STRING DEFAULT '{dataset}';
+DECLARE COST_TABLE STRING DEFAULT '{cost_table}';
+DECLARE COST_BY_ENV_TABLE STRING DEFAULT '{cost_by_env_table}';
+
+-- Partitioned by date and clustered by environment type and product so the
+-- dashboard queries prune on both instead of evaluating a CASE on every row
+EXECUTE IMMEDIATE FORMAT("""
+CREATE OR REPLACE TABLE `%s.%s.%s`
+PARTITION BY date
+CLUSTER BY environment_type, tr_product_id
+AS
+SELECT 
+    *,
+    CASE 
+        WHEN environment = 'PROD' THEN 'PROD'
+        ELSE 'NON-PROD'
+    END AS environment_type
+FROM 
+    `%s.%s.%s`
+""", PROJECT_ID, DATASET, COST_BY_ENV_TABLE, PROJECT_ID, DATASET, COST_TABLE);
\ No newline at end of file
@@ -4,16 +4,83 @@ Generate sample data for FinOps360 cost analysis.
 """
 import os
 import sys
-import csv
 import json
-import random
 import argparse
-from datetime import datetime, timedelta
+from datetime import datetime
 
-def date_range(start_date, end_date):
-    """Generate a range of dates"""
-    for n in range(int((end_date - start_date).days) + 1):
-        yield start_date + timedelta(n)
+import numpy as np
+import pandas as pd
+
+# Line terminator of the csv module's default dialect, kept for the sample files
+CSV_LINE_TERMINATOR = '\r\n'
+
+# Rows formatted per write, bounding the size of the formatted text in memory
+CSV_CHUNK_ROWS = 100_000
+
+# Cloud provider, CTO and environment configuration
+CLOUD_PROVIDERS = np.array(["AWS", "GCP", "Azure"])
+CTO_ORGS = np.array(["Technology", "Engineering", "Infrastructure"])
+ENV_TYPES = np.array(["PROD", "NON-PROD"])
+
+# Product data
+PRODUCTS = [
+    {"id": "P1001", "name": "Commerce Platform", "pillar": "Platform", "subpillar": "Core"},
+    {"id": "P1002", "name": "Identity Service", "pillar": "Platform", "subpillar": "Identity"},
+    {"id": "P1003", "name": "Data Analytics", "pillar": "Data", "subpillar": "Analytics"},
+    {"id": "P1004", "name": "Payment Gateway", "pillar": "Financial", "subpillar": "Payments"},
+    {"id": "P1005", "name": "Content API", "pillar": "Content", "subpillar": "API"},
+    {"id": "P1006", "name": "Mobile App", "pillar": "Mobile", "subpillar": "Apps"},
+    {"id": "P1007", "name": "Search Engine", "pillar": "Platform", "subpillar": "Search"},
+    {"id": "P1008", "name": "Recommendation Engine", "pillar": "AI", "subpillar": "Recommendations"},
+    {"id": "P1009", "name": "Marketing Analytics", "pillar": "Marketing", "subpillar": "Analytics"},
+    {"id": "P1010", "name": "Customer Database", "pillar": "Data", "subpillar": "Storage"},
+    {"id": "P1011", "name": "Security Service", "pillar": "Security", "subpillar": "Core"},
+    {"id": "P1012", "name": "Notification Service", "pillar": "Platform", "subpillar": "Messaging"},
+]
+
+# Product attributes as parallel arrays, indexed by product number
+PRODUCT_IDS = np.array([product["id"] for product in PRODUCTS])
+PRODUCT_NAMES = np.array([product["name"] for product in PRODUCTS])
+PRODUCT_PILLARS = np.array([product["pillar"] for product in PRODUCTS])
+PRODUCT_SUBPILLARS = np.array([product["subpillar"] for product in PRODUCTS])
+
+# Managed services
+MANAGED_SERVICES = {
+    "AWS": ["EC2", "S3", "RDS", "Lambda", "Fargate", "DynamoDB", "Redshift"],
+    "GCP": ["Compute Engine", "Cloud Storage", "BigQuery", "Cloud Functions", "Cloud Run", "Firestore"],
+    "Azure": ["Virtual Machines", "Blob Storage", "SQL Database", "Functions", "CosmosDB", "Synapse"]
+}
+
+# Managed services as one ragged array: the services of cloud i are
+# ALL_SERVICES[SERVICE_OFFSETS[i]:SERVICE_OFFSETS[i] + SERVICE_COUNTS[i]]
+SERVICE_COUNTS = np.array([len(MANAGED_SERVICES[cloud]) for cloud in CLOUD_PROVIDERS])
+SERVICE_OFFSETS = np.concatenate(([0], np.cumsum(SERVICE_COUNTS)[:-1]))
+ALL_SERVICES = np.array([service for cloud in CLOUD_PROVIDERS for service in MANAGED_SERVICES[cloud]])
+
+def write_csv_files(df, output_file, output_file_no_header, with_header=True):
+    """
+    Write a DataFrame to its CSV file and the no-header copy used for BigQuery loading.
+    
+    Both files are written in a single pass: each chunk of rows is formatted
+    once and the same text is written to both, so only one chunk of formatted
+    text is held in memory at a time.
+    
+    Args:
+        df: DataFrame to write
+        output_file: Path of the CSV file
+        output_file_no_header: Path of the no-header CSV file
+        with_header: Whether to include a header row in output_file
+    """
+    with open(output_file, 'w', newline='') as f, open(output_file_no_header, 'w', newline='') as f_no_header:
+        if with_header:
+            f.write(','.join(df.columns) + CSV_LINE_TERMINATOR)
+        
+        for start in range(0, len(df), CSV_CHUNK_ROWS):
+            chunk = df.iloc[start:start + CSV_CHUNK_ROWS].to_csv(
+                index=False, header=False, lineterminator=CSV_LINE_TERMINATOR
+            )
+            f.write(chunk)
+            f_no_header.write(chunk)
 
 def generate_cost_analysis_data(with_header=True):
     """
@@ -39,103 +106,60 @@ def generate_cost_analysis_data(with_header=True):
     start_date = datetime(2024, 2, 1)
     end_date = datetime(2025, 5, 4)  # Current date - 3 days
     
-    # Cloud provider, CTO and environment configuration
-    cloud_providers = ["AWS", "GCP", "Azure"]
-    cto_orgs = ["Technology", "Engineering", "Infrastructure"]
-    
-    # Product data
-    products = [
-        {"id": "P1001", "name": "Commerce Platform", "pillar": "Platform", "subpillar": "Core"},
-        {"id": "P1002", "name": "Identity Service", "pillar": "Platform", "subpillar": "Identity"},
-        {"id": "P1003", "name": "Data Analytics", "pillar": "Data", "subpillar": "Analytics"},
-        {"id": "P1004", "name": "Payment Gateway", "pillar": "Financial", "subpillar": "Payments"},
-        {"id": "P1005", "name": "Content API", "pillar": "Content", "subpillar": "API"},
-        {"id": "P1006", "name": "Mobile App", "pillar": "Mobile", "subpillar": "Apps"},
-        {"id": "P1007", "name": "Search Engine", "pillar": "Platform", "subpillar": "Search"},
-        {"id": "P1008", "name": "Recommendation Engine", "pillar": "AI", "subpillar": "Recommendations"},
-        {"id": "P1009", "name": "Marketing Analytics", "pillar": "Marketing", "subpillar": "Analytics"},
-        {"id": "P1010", "name": "Customer Database", "pillar": "Data", "subpillar": "Storage"},
-        {"id": "P1011", "name": "Security Service", "pillar": "Security", "subpillar": "Core"},
-        {"id": "P1012", "name": "Notification Service", "pillar": "Platform", "subpillar": "Messaging"},
-    ]
-    
-    # Managed services
-    managed_services = {
-        "AWS": ["EC2", "S3", "RDS", "Lambda", "Fargate", "DynamoDB", "Redshift"],
-        "GCP": ["Compute Engine", "Cloud Storage", "BigQuery", "Cloud Functions", "Cloud Run", "Firestore"],
-        "Azure": ["Virtual Machines", "Blob Storage", "SQL Database", "Functions", "CosmosDB", "Synapse"]
-    }
-    
-    # Open the file and write data
-    with open(output_file, 'w', newline='') as f:
-        writer = csv.writer(f)
-        
-        # Write header if requested
-        if with_header:
-            writer.writerow(header)
-        
-        # Generate data for each date
-        rows = []
-        for date in date_range(start_date, end_date):
-            date_str = date.strftime('%Y-%m-%d')
-            
-            # Generate data points for each environment and product combination
-            for product in products:
-                for env in ["PROD", "NON-PROD"]:
-                    for cloud in cloud_providers:
-                        if random.random() > 0.3:  # 70% chance to include this combination
-                            continue
-                            
-                        cto = random.choice(cto_orgs)
-                        managed_service = random.choice(managed_services[cloud])
-                        
-                        # Base cost with some randomness
-                        base_cost = 100 + random.uniform(-20, 200) if env == "PROD" else 40 + random.uniform(-10, 80)
-                        
-                        # Add weekly pattern - weekends cost less
-                        if date.weekday() >= 5:  # Saturday and Sunday
-                            base_cost *= 0.6
-                            
-                        # Add monthly pattern - costs rise toward end of month
-                        day_of_month = date.day
-                        days_in_month = (date.replace(month=date.month+1, day=1) if date.month < 12 
-                                      else date.replace(year=date.year+1, month=1, day=1)).replace(day=1) - timedelta(days=1)
-                        days_in_month = days_in_month.day
-                        
-                        if day_of_month > days_in_month - 5:
-                            base_cost *= 1.2  # 20% increase at end of month
-                            
-                        # Add growth trend over time
-                        days_since_start = (date - start_date).days
-                        growth_factor = 1 + (days_since_start / 365) * 0.12  # 12% annual growth
-                        
-                        # Final cost
-                        cost = base_cost * growth_factor
-                        
-                        # Create the row
-                        row = [
-                            date_str,
-                            cto,
-                            cloud,
-                            product["pillar"],
-                            product["subpillar"],
-                            product["id"],
-                            product["name"],
-                            managed_service,
-                            env,
-                            round(cost, 2)
-                        ]
-                        
-                        rows.append(row)
-                        writer.writerow(row)
-    
-    # Create a no-header version if requested
-    if not with_header or True:  # Always create both versions
-        with open(output_file_no_header, 'w', newline='') as f:
-            writer = csv.writer(f)
-            writer.writerows(rows)
-    
-    print(f"Generated {len(rows)} rows of cost analysis data")
+    rng = np.random.default_rng()
+    dates = pd.date_range(start_date, end_date, freq='D')
+    
+    # Cartesian product of dates x products x environments x clouds, in that order
+    date_idx, product_idx, env_idx, cloud_idx = (
+        grid.ravel() for grid in np.meshgrid(
+            np.arange(len(dates)), np.arange(len(PRODUCTS)), np.arange(len(ENV_TYPES)),
+            np.arange(len(CLOUD_PROVIDERS)), indexing='ij'
+        )
+    )
+    
+    # 30% chance to include each combination
+    keep = rng.random(date_idx.size) <= 0.3
+    date_idx, product_idx, env_idx, cloud_idx = date_idx[keep], product_idx[keep], env_idx[keep], cloud_idx[keep]
+    n = date_idx.size
+    
+    cto = CTO_ORGS[rng.integers(0, len(CTO_ORGS), n)]
+    
+    # Pick a managed service from the row's cloud: a random index within
+    # that cloud's slice of the ragged services array
+    service_idx = SERVICE_OFFSETS[cloud_idx] + rng.integers(0, SERVICE_COUNTS[cloud_idx])
+    
+    # Base cost with some randomness: PROD is 100 + U(-20, 200) and NON-PROD
+    # is 40 + U(-10, 80), drawn as one uniform array scaled per environment
+    base_cost_low = np.array([80.0, 30.0])
+    base_cost_span = np.array([220.0, 90.0])
+    base_cost = base_cost_low[env_idx] + base_cost_span[env_idx] * rng.random(n)
+    
+    # Per-date multipliers: weekends cost less, costs rise toward end of month,
+    # and 12% annual growth trend over time
+    date_factor = (
+        np.where(dates.weekday >= 5, 0.6, 1.0)
+        * np.where(dates.day > dates.days_in_month - 5, 1.2, 1.0)
+        * (1 + ((dates - start_date).days / 365) * 0.12)
+    )
+    cost = np.round(base_cost * date_factor[date_idx], 2)
+    
+    df = pd.DataFrame(dict(zip(header, [
+        dates.strftime('%Y-%m-%d').to_numpy()[date_idx],
+        cto,
+        CLOUD_PROVIDERS[cloud_idx],
+        PRODUCT_PILLARS[product_idx],
+        PRODUCT_SUBPILLARS[product_idx],
+        PRODUCT_IDS[product_idx],
+        PRODUCT_NAMES[product_idx],
+        ALL_SERVICES[service_idx],
+        ENV_TYPES[env_idx],
+        cost
+    ])))
+    
+    # Write the requested version, and always create the no-header version
+    write_csv_files(df, output_file, output_file_no_header, with_header)
+    
+    print(f"Generated {len(df)} rows of cost analysis data")
     return output_file if with_header else output_file_no_header
 
 def generate_avg_daily_cost_data(with_header=True):
@@ -162,77 +186,55 @@ def generate_avg_daily_cost_data(with_header=True):
     start_date = datetime(2025, 2, 1)
     end_date = datetime(2025, 5, 4)  # Current date - 3 days
     
-    # Environment types
-    env_types = ["PROD", "NON-PROD"]
+    rng = np.random.default_rng()
+    dates = pd.date_range(start_date, end_date, freq='D')
+    shape = (len(dates), len(ENV_TYPES), len(CTO_ORGS))
     
-    # CTO orgs
-    cto_orgs = ["Technology", "Engineering", "Infrastructure"]
+    # Broadcast per-date and per-environment factors over a (dates, envs, ctos) grid
+    days_since_start = (dates - start_date).days.to_numpy()[:, None, None]
+    weekday = dates.weekday.to_numpy()[:, None, None]
+    is_prod = (ENV_TYPES == "PROD")[None, :, None]
     
-    # Open the file and write data
-    with open(output_file, 'w', newline='') as f:
-        writer = csv.writer(f)
-        
-        # Write header if requested
-        if with_header:
-            writer.writerow(header)
-        
-        # Generate data for each date
-        rows = []
-        
-        for date in date_range(start_date, end_date):
-            date_str = date.strftime('%Y-%m-%d')
-            
-            for env_type in env_types:
-                for cto in cto_orgs:
-                    # Different base costs for each environment
-                    base_daily_cost = 2500 + random.uniform(-300, 300) if env_type == "PROD" else 1200 + random.uniform(-200, 200)
-                    
-                    # Add weekly pattern - weekends cost less
-                    if date.weekday() >= 5:  # Saturday and Sunday
-                        base_daily_cost *= 0.7
-                    
-                    # Add trend over time
-                    days_since_start = (date - start_date).days
-                    growth_factor = 1 + (days_since_start / 365) * 0.15  # 15% annual growth
-                    
-                    # FY averages
-                    fy24_avg = base_daily_cost * 0.85  # FY24 was 15% lower
-                    fy25_avg = base_daily_cost * 0.92  # FY25 was 8% lower
-                    fy26_ytd_avg = base_daily_cost * 0.97  # FY26 YTD is slightly lower
-                    
-                    # Forecasted is based on YTD but with growth
-                    forecast_factor = 1 + (days_since_start / 180) * 0.08  # Growing at 8% per half-year
-                    fy26_forecast = base_daily_cost * forecast_factor
-                    
-                    # Overall FY26 average 
-                    fy26_avg = (fy26_ytd_avg + fy26_forecast) / 2
-                    
-                    # Final daily cost with some random variation
-                    daily_cost = base_daily_cost * growth_factor * random.uniform(0.9, 1.1)
-                    
-                    # Create the row
-                    row = [
-                        date_str,
-                        env_type,
-                        cto,
-                        round(fy24_avg, 2),
-                        round(fy25_avg, 2),
-                        round(fy26_ytd_avg, 2),
-                        round(fy26_forecast, 2),
-                        round(fy26_avg, 2),
-                        round(daily_cost, 2)
-                    ]
-                    
-                    rows.append(row)
-                    writer.writerow(row)
-    
-    # Create a no-header version if requested
-    if not with_header or True:  # Always create both versions
-        with open(output_file_no_header, 'w', newline='') as f:
-            writer = csv.writer(f)
-            writer.writerows(rows)
-    
-    print(f"Generated {len(rows)} rows of average daily cost data")
+    # Different base costs for each environment
+    base_daily_cost = np.where(
+        is_prod,
+        2500 + rng.uniform(-300, 300, shape),
+        1200 + rng.uniform(-200, 200, shape)
+    )
+    
+    # Add weekly pattern - weekends cost less
+    base_daily_cost *= np.where(weekday >= 5, 0.7, 1.0)
+    
+    # Add trend over time
+    growth_factor = 1 + (days_since_start / 365) * 0.15  # 15% annual growth
+    
+    # FY averages
+    fy24_avg = base_daily_cost * 0.85  # FY24 was 15% lower
+    fy25_avg = base_daily_cost * 0.92  # FY25 was 8% lower
+    fy26_ytd_avg = base_daily_cost * 0.97  # FY26 YTD is slightly lower
+    
+    # Forecasted is based on YTD but with growth
+    forecast_factor = 1 + (days_since_start / 180) * 0.08  # Growing at 8% per half-year
+    fy26_forecast = base_daily_cost * forecast_factor
+    
+    # Overall FY26 average 
+    fy26_avg = (fy26_ytd_avg + fy26_forecast) / 2
+    
+    # Final daily cost with some random variation
+    daily_cost = base_daily_cost * growth_factor * rng.uniform(0.9, 1.1, shape)
+    
+    date_idx, env_idx, cto_idx = np.indices(shape).reshape(3, -1)
+    df = pd.DataFrame(dict(zip(header, [
+        dates.strftime('%Y-%m-%d').to_numpy()[date_idx],
+        ENV_TYPES[env_idx],
+        CTO_ORGS[cto_idx],
+        *(np.round(values, 2).ravel() for values in (fy24_avg, fy25_avg, fy26_ytd_avg, fy26_forecast, fy26_avg, daily_cost))
+    ])))
+    
+    # Write the requested version, and always create the no-header version
+    write_csv_files(df, output_file, output_file_no_header, with_header)
+    
+    print(f"Generated {len(df)} rows of average daily cost data")
     return output_file if with_header else output_file_no_header
 
 def main():
@@ -8,7 +8,9 @@ PROJECT_ID=$(grep -A3 "project_id:" "${CONFIG_PATH}" | grep "project_id:" | awk
 DATASET=$(grep -A3 "dataset:" "${CONFIG_PATH}" | grep "dataset:" | awk '{print $2}' | tr -d '"')
 COST_TABLE=$(grep -A3 "table:" "${CONFIG_PATH}" | grep "table:" | awk '{print $2}' | tr -d '"')
 AVG_TABLE=$(grep -A3 "avg_table:" "${CONFIG_PATH}" | grep "avg_table:" | awk '{print $2}' | tr -d '"')
+COST_BY_ENV_TABLE=$(grep "^ *cost_by_env_table:" "${CONFIG_PATH}" | awk '{print $2}' | tr -d '"')
 SQL_FILE="app/data/create_avg_daily_view.sql"
+COST_BY_ENV_SQL_FILE="app/data/create_cost_by_env_table.sql"
 TEMP_SQL=$(mktemp)
 
 # Print configuration
@@ -58,6 +60,24 @@ if [ $? -ne 0 ]; then
   exit 1
 fi
 
+# Create the cost table with a precomputed environment_type column if configured
+if [ -n "$COST_BY_ENV_TABLE" ]; then
+  echo "Creating cost table with environment_type column: $COST_BY_ENV_TABLE"
+  cat "$COST_BY_ENV_SQL_FILE" | sed \
+    -e "s/{project_id}/$PROJECT_ID/g" \
+    -e "s/{dataset}/$DATASET/g" \
+    -e "s/{cost_table}/$COST_TABLE/g" \
+    -e "s/{cost_by_env_table}/$COST_BY_ENV_TABLE/g" \
+    > "$TEMP_SQL"
+  bq query --use_legacy_sql=false < "$TEMP_SQL"
+  
+  if [ $? -ne 0 ]; then
+    echo "Error: Failed to create $COST_BY_ENV_TABLE!"
+    rm "$TEMP_SQL"
+    exit 1
+  fi
+fi
+
 # Clean up
 rm "$TEMP_SQL"
 
@@ -0,0 +1,74 @@
+"""
+Data models for FinOps360 dashboard rendering.
+"""
+from dataclasses import dataclass
+
+
+@dataclass(slots=True)
+class DashboardScorecard:
+    """
+    Scorecard and recent comparison values rendered on the dashboard.
+
+    Field names match the template variables, so the whole scorecard can be
+    passed to the template with a single ``asdict`` call.
+    """
+    # Year-to-date scorecard
+    prod_ytd_cost: float = 0.0
+    nonprod_ytd_cost: float = 0.0
+    prod_fy26_ytd_cost: float = 0.0
+    nonprod_fy26_ytd_cost: float = 0.0
+    total_fy26_ytd_cost: float = 0.0
+    total_fy25_ytd_cost: float = 0.0
+    prod_fy25_cost: float = 0.0
+    nonprod_fy25_cost: float = 0.0
+    total_fy26_cost: float = 0.0
+    total_fy25_cost: float = 0.0
+    prod_ytd_percent: float = 0.0
+    nonprod_ytd_percent: float = 0.0
+    fy26_ytd_percent: float = 0.0
+    fy26_percent: float = 0.0
+    nonprod_percentage: float = 0.0
+    nonprod_percentage_change: float = 0.0
+
+    # Day-to-day comparison
+    day_prod_cost: float = 0.0
+    day_nonprod_cost: float = 0.0
+    day_prod_previous_cost: float = 0.0
+    day_nonprod_previous_cost: float = 0.0
+    day_prod_percent: float = 0.0
+    day_nonprod_percent: float = 0.0
+    day_prod_percent_calculated: float = 0.0
+    day_nonprod_percent_calculated: float = 0.0
+
+    # Week-to-week comparison
+    week_prod_cost: float = 0.0
+    week_nonprod_cost: float = 0.0
+    week_prod_previous_cost: float = 0.0
+    week_nonprod_previous_cost: float = 0.0
+    week_prod_percent: float = 0.0
+    week_nonprod_percent: float = 0.0
+    week_prod_percent_calculated: float = 0.0
+    week_nonprod_percent_calculated: float = 0.0
+
+    # Month-to-month comparison
+    month_prod_cost: float = 0.0
+    month_nonprod_cost: float = 0.0
+    month_prod_previous_cost: float = 0.0
+    month_nonprod_previous_cost: float = 0.0
+    month_prod_percent: float = 0.0
+    month_nonprod_percent: float = 0.0
+    month_prod_percent_calculated: float = 0.0
+    month_nonprod_percent_calculated: float = 0.0
+
+
+@dataclass(frozen=True, slots=True)
+class ChartOutput:
+    """
+    Rendered interactive chart passed to the dashboard template.
+
+    Attributes:
+        html: Chart markup (a plotly div, or an HTML comment when there is no chart)
+        json_data: Pre-serialized plotly figure JSON
+    """
+    html: str = ""
+    json_data: str = "{}"
@@ -5,14 +5,14 @@ SELECT
     SUM(CASE WHEN environment = 'NON-PROD' THEN cost ELSE 0 END) AS nonprod_ytd_cost,
     SUM(cost) AS total_ytd_cost,
     -- Calculate forecasted cost based on YTD trend (extrapolate to full year)
-    SUM(cost) * 365 / NULLIF(DATETIME_DIFF(DATE_SUB(CURRENT_DATE(), INTERVAL 3 DAY), '2025-02-01', DAY), 0) AS forecasted_cost,
+    SUM(cost) * 365 / NULLIF(DATE_DIFF(@ytd_end, @start_date, DAY), 0) AS forecasted_cost,
     SUM(CASE WHEN environment = 'NON-PROD' THEN cost ELSE 0 END) / NULLIF(SUM(cost), 0) * 100 AS nonprod_percentage
 FROM `{project_id}.{dataset}.{table}`
 WHERE 
-    date BETWEEN '2025-02-01' AND DATE_SUB(CURRENT_DATE(), INTERVAL 3 DAY)
+    date BETWEEN @start_date AND @ytd_end
     {cto_filter}
     {pillar_filter}
     {product_filter}
 GROUP BY cto_org
 ORDER BY total_ytd_cost DESC
-LIMIT {top_n}
\ No newline at end of file
+LIMIT @top_n
\ No newline at end of file
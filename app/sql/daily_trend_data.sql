@@ -1,18 +1,32 @@
--- Basic daily trend data query
+-- Daily trend data query, summed across CTOs to one row per date and environment.
+-- With @bucket_days > 1, dates are grouped into buckets of that many days
+-- (starting at @start_date) and daily_cost is the bucket's average daily cost.
+-- The bucket and environment are aggregated under bucket_date and env_type and
+-- renamed in the outer SELECT: date and environment_type are also columns of
+-- the avg table, so grouping by them as aliases would be ambiguous.
 SELECT
-    date,
-    CASE
-        WHEN environment_type LIKE 'PROD%' THEN 'PROD'
-        ELSE 'NON-PROD'
-    END AS environment_type,
+    bucket_date AS date,
+    env_type AS environment_type,
     daily_cost
-FROM `{project_id}.{dataset}.{avg_table}`
-WHERE date BETWEEN 
-    -- Safe fallback to fiscal year start if not specified
-    '2025-02-01' AND 
-    -- Safe fallback to current date minus 3 days if not specified
-    DATE_SUB(CURRENT_DATE(), INTERVAL 3 DAY)
-    {cto_filter}
-    {pillar_filter}
-    {product_filter}
-ORDER BY date, environment_type
\ No newline at end of file
+FROM (
+    SELECT
+        DATE_BUCKET(date, INTERVAL @bucket_days DAY, @start_date) AS bucket_date,
+        CASE
+            WHEN environment_type LIKE 'PROD%' THEN 'PROD'
+            ELSE 'NON-PROD'
+        END AS env_type,
+        SUM(daily_cost) / COUNT(DISTINCT date) AS daily_cost
+    FROM `{project_id}.{dataset}.{avg_table}`
+    -- Both bounds are DATE parameters on the date column, so BigQuery prunes the
+    -- scan to the fiscal year-to-date partitions
+    WHERE date BETWEEN 
+        -- Fiscal year start (data.fy_start_date), bound as the @start_date query parameter
+        @start_date AND 
+        -- Current date minus 3 days, bound as the @ytd_end query parameter
+        @ytd_end
+        {cto_filter}
+        {pillar_filter}
+        {product_filter}
+    GROUP BY bucket_date, env_type
+)
+ORDER BY bucket_date, env_type
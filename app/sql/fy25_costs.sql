@@ -1,14 +1,11 @@
 -- Enhanced FY25 costs query that includes YTD values for direct comparison
 -- Gets both total FY25 costs and YTD costs for the same period last year
 SELECT
-    CASE 
-        WHEN environment = 'PROD' THEN 'PROD'
-        ELSE 'NON-PROD'
-    END AS environment_type,
+    {environment_type} AS environment_type,
     SUM(cost) AS total_cost,
     -- YTD cost for direct comparison with this year's YTD
     SUM(CASE 
-        WHEN date BETWEEN '2024-02-01' AND CURRENT_DATE() - INTERVAL 1 YEAR
+        WHEN date BETWEEN '2024-02-01' AND @fy25_ytd_end
         THEN cost
         ELSE 0
     END) AS ytd_cost
@@ -1,12 +1,9 @@
--- FY26 YTD costs query (from 2025-02-01 to today-3)
+-- FY26 YTD costs query (from the fiscal year start to today-3)
 SELECT
-    CASE 
-        WHEN environment = 'PROD' THEN 'PROD'
-        ELSE 'NON-PROD'
-    END AS environment_type,
+    {environment_type} AS environment_type,
     SUM(cost) AS ytd_cost
 FROM `{project_id}.{dataset}.{table}`
-WHERE date BETWEEN '2025-02-01' AND DATE_SUB(CURRENT_DATE(), INTERVAL 3 DAY)
+WHERE date BETWEEN @start_date AND @ytd_end
     {cto_filter}
     {pillar_filter}
     {product_filter}
@@ -0,0 +1,17 @@
+-- Top products by total cost for the product breakdown chart: one row per
+-- product, summed across pillar teams and CTOs, highest total first
+SELECT
+    tr_product AS product_name,
+    SUM(CASE WHEN environment = 'PROD' THEN cost ELSE 0 END) AS prod_ytd_cost,
+    SUM(CASE WHEN environment = 'NON-PROD' THEN cost ELSE 0 END) AS nonprod_ytd_cost,
+    SUM(cost) AS total_ytd_cost
+FROM `{project_id}.{dataset}.{table}`
+WHERE 
+    date BETWEEN @start_date AND @ytd_end
+    {cto_filter}
+    {pillar_filter}
+    {product_filter}
+GROUP BY tr_product
+HAVING total_ytd_cost > 0
+ORDER BY total_ytd_cost DESC
+LIMIT @top_n
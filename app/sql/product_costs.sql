@@ -9,13 +9,17 @@ SELECT
     SUM(CASE WHEN environment = 'NON-PROD' THEN cost ELSE 0 END) AS nonprod_ytd_cost,
     SUM(cost) AS total_ytd_cost,
     -- Calculate forecasted cost based on YTD trend (extrapolate to full year)
-    SUM(cost) * 365 / NULLIF(DATETIME_DIFF(DATE_SUB(CURRENT_DATE(), INTERVAL 3 DAY), '2025-02-01', DAY), 0) AS forecasted_cost
+    SUM(cost) * 365 / NULLIF(DATE_DIFF(@ytd_end, @start_date, DAY), 0) AS forecasted_cost
 FROM `{project_id}.{dataset}.{table}`
 WHERE 
-    date BETWEEN '2025-02-01' AND DATE_SUB(CURRENT_DATE(), INTERVAL 3 DAY)
+    date BETWEEN @start_date AND @ytd_end
     {cto_filter}
     {pillar_filter}
     {product_filter}
-GROUP BY display_id, product_name, pillar_team, product_id, cto_org
-ORDER BY prod_ytd_cost DESC
-LIMIT {top_n}
\ No newline at end of file
+-- display_id is derived from grouped columns, so it is not part of the grouping key.
+-- cto stays in the key: the dashboard builds its pillar-to-CTO filter mapping
+-- from cto_org on these rows
+GROUP BY tr_product_pillar_team, tr_product_id, tr_product, cto
+HAVING total_ytd_cost > 0
+ORDER BY total_ytd_cost DESC
+LIMIT @top_n
\ No newline at end of file
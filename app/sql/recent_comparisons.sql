@@ -0,0 +1,15 @@
+-- Combined day-to-day, week-to-week and month-to-month comparison query
+SELECT
+    {environment_type} AS environment_type,
+    SUM(CASE WHEN date = @day_current THEN cost ELSE 0 END) AS day_current_cost,
+    SUM(CASE WHEN date = @day_previous THEN cost ELSE 0 END) AS day_previous_cost,
+    SUM(CASE WHEN date BETWEEN @this_week_start AND @this_week_end THEN cost ELSE 0 END) AS this_week_cost,
+    SUM(CASE WHEN date BETWEEN @prev_week_start AND @prev_week_end THEN cost ELSE 0 END) AS prev_week_cost,
+    SUM(CASE WHEN date BETWEEN @this_month_start AND @this_month_end THEN cost ELSE 0 END) AS this_month_cost,
+    SUM(CASE WHEN date BETWEEN @prev_month_start AND @prev_month_end THEN cost ELSE 0 END) AS prev_month_cost
+FROM `{project_id}.{dataset}.{table}`
+WHERE date BETWEEN @min_date AND @max_date
+    {cto_filter}
+    {pillar_filter}
+    {product_filter}
+GROUP BY environment_type
\ No newline at end of file
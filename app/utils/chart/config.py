@@ -1,18 +1,10 @@
 """
 Chart configuration for FinOps360 cost analysis dashboard.
 """
-from typing import Dict, Any, List, Optional, Union
+import functools
+from typing import Callable, Dict, Any, List, Optional, Union
 from app.utils.config_loader import load_config
 
-# Load chart settings from config.yaml
-try:
-    config = load_config("config.yaml")
-    # Get chart enabled setting from config
-    CHARTS_ENABLED = config.get('charts', {}).get('enabled', True)
-except Exception:
-    # Default if config can't be loaded
-    CHARTS_ENABLED = True
-
 # Chart dimensions
 CHART_HEIGHT = 500
 CHART_WIDTH = "100%"
@@ -189,14 +181,45 @@ def get_chart_config(chart_key: str) -> Dict[str, Any]:
 
 def is_chart_enabled(chart_key: str) -> bool:
     """Check if a specific chart is enabled."""
-    if not CHARTS_ENABLED:
+    if not are_charts_enabled():
         return False
     chart_config = get_chart_config(chart_key)
     return chart_config.get("enabled", False)
 
 def are_charts_enabled() -> bool:
-    """Check if charts are globally enabled."""
-    return CHARTS_ENABLED
+    """
+    Check if charts are globally enabled (charts.enabled in config.yaml).
+    
+    Read on demand rather than at import; load_config caches the parsed file
+    until it changes, so this is a stat call after the first use.
+    """
+    try:
+        return load_config("config.yaml").get('charts', {}).get('enabled', True)
+    except Exception:
+        # Default if config can't be loaded
+        return True
+
+def skip_if_disabled(chart_key: Optional[str] = None) -> Callable:
+    """
+    Decorator that makes a chart function return "" without rendering when
+    charts are disabled.
+    
+    Args:
+        chart_key: CHART_OPTIONS key whose enabled flag is also checked, or
+            None to check only the global charts.enabled setting
+        
+    Returns:
+        Decorator for functions returning a rendered chart string
+    """
+    def decorator(func: Callable[..., str]) -> Callable[..., str]:
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs) -> str:
+            enabled = is_chart_enabled(chart_key) if chart_key else are_charts_enabled()
+            if not enabled:
+                return ""
+            return func(*args, **kwargs)
+        return wrapper
+    return decorator
 
 def get_chart_dimensions() -> Dict[str, Union[int, str]]:
     """Get standard chart dimensions."""
@@ -5,13 +5,18 @@ import logging
 import pandas as pd
 import numpy as np
 import plotly.graph_objects as go
-import plotly.express as px
 import plotly.io as pio
 from plotly.utils import PlotlyJSONEncoder
 import json
 from datetime import datetime, timedelta
 from typing import Dict, Any, List, Optional, Tuple, Union
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+from app.models.dashboard import ChartOutput
 from app.utils.chart.config import (
     get_chart_config,
     is_chart_enabled,
@@ -19,9 +24,32 @@ from app.utils.chart.config import (
     get_chart_dimensions,
     get_chart_colors,
 )
+from app.utils.db import index_by_environment, split_by_environment
+from app.utils.kernels import grouped_sums
 
 logger = logging.getLogger(__name__)
 
+def figure_to_json(fig: go.Figure) -> str:
+    """
+    Serialize a plotly figure to a JSON string.
+    
+    Uses orjson (a C extension with native numpy support) when it is installed
+    and falls back to plotly's pure-Python encoder otherwise, or for figures
+    containing values orjson cannot serialize.
+
+    Args:
+        fig: Plotly figure
+
+    Returns:
+        JSON string of the figure
+    """
+    if orjson is not None:
+        try:
+            return orjson.dumps(fig.to_plotly_json(), option=orjson.OPT_SERIALIZE_NUMPY).decode()
+        except TypeError as e:
+            logger.debug(f"orjson could not serialize figure, using PlotlyJSONEncoder: {e}")
+    return json.dumps(fig, cls=PlotlyJSONEncoder)
+
 def create_interactive_daily_trend_chart(df: pd.DataFrame) -> str:
     """
     Create an interactive daily trend chart with separate styling for forecasted costs.
@@ -48,7 +76,7 @@ def create_interactive_daily_trend_chart(df: pd.DataFrame) -> str:
                 title="Daily Cost Analysis for PROD and NON-PROD Environments",
                 title_x=0.5
             )
-            return json.dumps(fig, cls=PlotlyJSONEncoder)
+            return figure_to_json(fig)
 
         # Create the figure
         fig = go.Figure()
@@ -60,7 +88,7 @@ def create_interactive_daily_trend_chart(df: pd.DataFrame) -> str:
 
         # Get unique environments
         environments = df['environment_type'].unique()
-        print(f"Debug - Found environments: {environments}")
+        logger.debug("Found environments: %s", environments)
 
         # Get today's date (3 days ago to match dashboard logic)
         today = datetime.now().date() - timedelta(days=3)
@@ -68,7 +96,7 @@ def create_interactive_daily_trend_chart(df: pd.DataFrame) -> str:
         # Check if NON-PROD is in the data
         has_nonprod = 'NON-PROD' in environments
         has_prod = 'PROD' in environments
-        print(f"Debug - Has PROD: {has_prod}, Has NON-PROD: {has_nonprod}")
+        logger.debug("Has PROD: %s, Has NON-PROD: %s", has_prod, has_nonprod)
 
         # Force both environments to be included
         if not has_nonprod or not has_prod:
@@ -78,28 +106,27 @@ def create_interactive_daily_trend_chart(df: pd.DataFrame) -> str:
 
             # Update our environments list to include both
             if not has_nonprod:
-                print("Debug - Adding missing NON-PROD data")
+                logger.debug("Adding missing NON-PROD data")
                 nonprod_data = sample_data[sample_data['environment_type'] == 'NON-PROD']
                 df = pd.concat([df, nonprod_data], ignore_index=True)
                 environments = df['environment_type'].unique()
 
             if not has_prod:
-                print("Debug - Adding missing PROD data")
+                logger.debug("Adding missing PROD data")
                 prod_data = sample_data[sample_data['environment_type'] == 'PROD']
                 df = pd.concat([df, prod_data], ignore_index=True)
                 environments = df['environment_type'].unique()
 
-            print(f"Debug - Updated environments: {environments}")
+            logger.debug("Updated environments: %s", environments)
 
-        # Process each environment type
-        for env in environments:
-            print(f"Debug - Processing environment: {env}")
-            env_data = df[df['environment_type'] == env]
-            print(f"Debug - {env} data rows: {len(env_data)}")
+        # Process each environment type, splitting the rows once
+        for env, env_data in split_by_environment(df).items():
+            logger.debug("Processing environment: %s", env)
+            logger.debug("%s data rows: %d", env, len(env_data))
 
             # Only use actual data - no forecast
             actual_data = env_data[pd.to_datetime(env_data['date']).dt.date <= today]
-            print(f"Debug - {env} actual data rows: {len(actual_data)}")
+            logger.debug("%s actual data rows: %d", env, len(actual_data))
 
             # Line color based on environment
             color = prod_color if env == 'PROD' else nonprod_color
@@ -114,7 +141,7 @@ def create_interactive_daily_trend_chart(df: pd.DataFrame) -> str:
                     line=dict(color=color, width=2.5, shape='spline', smoothing=0.3),
                     hovertemplate='%{x|%b %d, %Y}: $%{y:,.2f}<extra></extra>'
                 ))
-                print(f"Debug - Added trace for {env}")
+                logger.debug("Added trace for %s", env)
         
         # Update layout
         fig.update_layout(
@@ -219,7 +246,7 @@ def create_interactive_daily_trend_chart(df: pd.DataFrame) -> str:
         fig.update_layout(margin=dict(t=120))
 
         # Convert to JSON
-        plotly_json = json.dumps(fig, cls=PlotlyJSONEncoder)
+        plotly_json = figure_to_json(fig)
         return plotly_json
         
     except Exception as e:
@@ -259,55 +286,56 @@ def create_interactive_product_breakdown_chart(product_df: pd.DataFrame, top_n:
                 title="Top Products by Cost",
                 title_x=0.5
             )
-            return json.dumps(fig, cls=PlotlyJSONEncoder)
+            return figure_to_json(fig)
         
         # Ensure we have the necessary cost columns or create them
         if 'total_ytd_cost' not in product_df.columns and 'prod_ytd_cost' in product_df.columns and 'nonprod_ytd_cost' in product_df.columns:
             product_df['total_ytd_cost'] = product_df['prod_ytd_cost'] + product_df['nonprod_ytd_cost']
         
+        # Split total cost into per-environment columns from the environment labels
+        if 'environment' in product_df.columns:
+            environment = product_df['environment'].to_numpy()
+        else:
+            environment = np.full(len(product_df), '', dtype=object)
         if 'prod_ytd_cost' not in product_df.columns:
-            product_df['prod_ytd_cost'] = product_df.apply(
-                lambda row: row['total_ytd_cost'] if row.get('environment', '') == 'PROD' else 0, 
-                axis=1
+            product_df['prod_ytd_cost'] = np.where(
+                environment == 'PROD', product_df['total_ytd_cost'].to_numpy(dtype=np.float64), 0.0
             )
             
         if 'nonprod_ytd_cost' not in product_df.columns:
-            product_df['nonprod_ytd_cost'] = product_df.apply(
-                lambda row: row['total_ytd_cost'] if row.get('environment', '') == 'NON-PROD' else 0, 
-                axis=1
+            product_df['nonprod_ytd_cost'] = np.where(
+                environment == 'NON-PROD', product_df['total_ytd_cost'].to_numpy(dtype=np.float64), 0.0
             )
         
-        # Get top N products by total cost
+        # Get top N products by total cost (partial selection instead of a full sort)
         sort_column = 'total_ytd_cost' if 'total_ytd_cost' in product_df.columns else 'prod_ytd_cost'
-        top_products = product_df.sort_values(sort_column, ascending=False).head(top_n)
+        top_products = product_df.nlargest(top_n, sort_column)
         
         # If we need to aggregate by product and environment
         if len(top_products) > 0 and 'environment' in top_products.columns:
-            # Create a summary dataframe with one row per product
-            summary = []
-            for product_name in top_products['product_name'].unique():
-                product_rows = top_products[top_products['product_name'] == product_name]
-                
-                prod_cost = product_rows[product_rows['environment'] == 'PROD']['prod_ytd_cost'].sum() if 'prod_ytd_cost' in product_rows.columns else 0
-                nonprod_cost = product_rows[product_rows['environment'] == 'NON-PROD']['nonprod_ytd_cost'].sum() if 'nonprod_ytd_cost' in product_rows.columns else 0
-                
-                if 'total_ytd_cost' in product_rows.columns:
-                    total_cost = product_rows['total_ytd_cost'].sum()
-                else:
-                    total_cost = prod_cost + nonprod_cost
-                
-                summary.append({
-                    'product_name': product_name,
-                    'prod_ytd_cost': prod_cost,
-                    'nonprod_ytd_cost': nonprod_cost,
-                    'total_ytd_cost': total_cost,
-                    'nonprod_percentage': (nonprod_cost / total_cost * 100) if total_cost > 0 else 0
-                })
-            
-            if summary:
-                # Convert to DataFrame and sort
-                summary_df = pd.DataFrame(summary)
-                top_products = summary_df.sort_values('total_ytd_cost', ascending=False)
+            # One row per product, taking PROD and NON-PROD costs from rows of
+            # the matching environment, summed per factorized product code
+            environment = top_products['environment'].to_numpy()
+            codes, product_names = pd.factorize(top_products['product_name'], sort=False)
+            costs = np.column_stack([
+                np.where(environment == 'PROD', top_products['prod_ytd_cost'].to_numpy(dtype=np.float64), 0.0),
+                np.where(environment == 'NON-PROD', top_products['nonprod_ytd_cost'].to_numpy(dtype=np.float64), 0.0),
+                top_products['total_ytd_cost'].to_numpy(dtype=np.float64),
+            ])
+            # Rows without a product name (code -1) are dropped, as groupby would
+            named = codes >= 0
+            sums = grouped_sums(codes[named], costs[named], len(product_names))
+            top_products = pd.DataFrame({
+                'product_name': np.asarray(product_names),
+                'prod_ytd_cost': sums[:, 0],
+                'nonprod_ytd_cost': sums[:, 1],
+                'total_ytd_cost': sums[:, 2],
+            })
+            total = top_products['total_ytd_cost'].to_numpy()
+            top_products['nonprod_percentage'] = np.divide(
+                top_products['nonprod_ytd_cost'].to_numpy(), total, out=np.zeros_like(total), where=total > 0
+            ) * 100
+            top_products = top_products.sort_values('total_ytd_cost', ascending=False)
         
         # Check if we have any products
         if top_products.empty:
@@ -322,7 +350,7 @@ def create_interactive_product_breakdown_chart(product_df: pd.DataFrame, top_n:
                 title="Top Products by Cost",
                 title_x=0.5
             )
-            return json.dumps(fig, cls=PlotlyJSONEncoder)
+            return figure_to_json(fig)
         
         # Sort products by total cost
         sorted_products = top_products.sort_values('total_ytd_cost', ascending=True)
@@ -391,7 +419,7 @@ def create_interactive_product_breakdown_chart(product_df: pd.DataFrame, top_n:
         # No interactivity buttons needed as requested
         
         # Convert to JSON
-        return json.dumps(fig, cls=PlotlyJSONEncoder)
+        return figure_to_json(fig)
         
     except Exception as e:
         logger.error(f"Error creating interactive product breakdown chart: {e}")
@@ -430,7 +458,7 @@ def create_interactive_cto_breakdown_chart(cto_df: pd.DataFrame, top_n: int = 10
                 title="CTO Organization Costs",
                 title_x=0.5
             )
-            return json.dumps(fig, cls=PlotlyJSONEncoder)
+            return figure_to_json(fig)
         
         # Ensure we have the necessary cost columns or create them
         if 'total_ytd_cost' not in cto_df.columns and 'prod_ytd_cost' in cto_df.columns and 'nonprod_ytd_cost' in cto_df.columns:
@@ -453,7 +481,7 @@ def create_interactive_cto_breakdown_chart(cto_df: pd.DataFrame, top_n: int = 10
                 title="CTO Organization Costs",
                 title_x=0.5
             )
-            return json.dumps(fig, cls=PlotlyJSONEncoder)
+            return figure_to_json(fig)
         
         # Sort CTOs by total cost
         sorted_ctos = top_ctos.sort_values('total_ytd_cost', ascending=True)
@@ -516,7 +544,7 @@ def create_interactive_cto_breakdown_chart(cto_df: pd.DataFrame, top_n: int = 10
             )
         
         # Convert to JSON
-        return json.dumps(fig, cls=PlotlyJSONEncoder)
+        return figure_to_json(fig)
         
     except Exception as e:
         logger.error(f"Error creating interactive CTO breakdown chart: {e}")
@@ -555,7 +583,7 @@ def create_interactive_pillar_breakdown_chart(pillar_df: pd.DataFrame, top_n: in
                 title="Product Pillar Team Costs",
                 title_x=0.5
             )
-            return json.dumps(fig, cls=PlotlyJSONEncoder)
+            return figure_to_json(fig)
         
         # Ensure we have the necessary cost columns or create them
         if 'total_ytd_cost' not in pillar_df.columns and 'prod_ytd_cost' in pillar_df.columns and 'nonprod_ytd_cost' in pillar_df.columns:
@@ -578,7 +606,7 @@ def create_interactive_pillar_breakdown_chart(pillar_df: pd.DataFrame, top_n: in
                 title="Product Pillar Team Costs",
                 title_x=0.5
             )
-            return json.dumps(fig, cls=PlotlyJSONEncoder)
+            return figure_to_json(fig)
         
         # Sort pillars by total cost
         sorted_pillars = top_pillars.sort_values('total_ytd_cost', ascending=True)
@@ -645,7 +673,7 @@ def create_interactive_pillar_breakdown_chart(pillar_df: pd.DataFrame, top_n: in
             )
         
         # Convert to JSON
-        return json.dumps(fig, cls=PlotlyJSONEncoder)
+        return figure_to_json(fig)
         
     except Exception as e:
         logger.error(f"Error creating interactive pillar breakdown chart: {e}")
@@ -678,14 +706,12 @@ def create_interactive_environment_breakdown_chart(ytd_costs: pd.DataFrame) -> s
                 title="Cost Breakdown by Environment",
                 title_x=0.5
             )
-            return json.dumps(fig, cls=PlotlyJSONEncoder)
+            return figure_to_json(fig)
         
-        # Extract production and non-production costs
-        prod_costs = ytd_costs[ytd_costs['environment_type'] == 'PROD']['ytd_cost'].iloc[0] \
-            if 'PROD' in ytd_costs['environment_type'].values else 0
-            
-        nonprod_costs = ytd_costs[ytd_costs['environment_type'] == 'NON-PROD']['ytd_cost'].iloc[0] \
-            if 'NON-PROD' in ytd_costs['environment_type'].values else 0
+        # Extract production and non-production costs from one environment index
+        env_costs = index_by_environment(ytd_costs, ['ytd_cost'])
+        prod_costs = env_costs.get('PROD', {}).get('ytd_cost', 0)
+        nonprod_costs = env_costs.get('NON-PROD', {}).get('ytd_cost', 0)
         
         # Calculate total and percentages
         total_cost = prod_costs + nonprod_costs
@@ -780,7 +806,7 @@ def create_interactive_environment_breakdown_chart(ytd_costs: pd.DataFrame) -> s
         # )
         
         # Convert to JSON
-        return json.dumps(fig, cls=PlotlyJSONEncoder)
+        return figure_to_json(fig)
         
     except Exception as e:
         logger.error(f"Error creating interactive environment breakdown chart: {e}")
@@ -807,7 +833,7 @@ def get_project_dataset_config(project_id: str, dataset: str) -> Dict[str, Any]:
 
 # New enhanced chart functions based on chart_config.py
 
-def create_enhanced_daily_trend_chart(data: pd.DataFrame) -> Dict[str, Any]:
+def create_enhanced_daily_trend_chart(data: pd.DataFrame) -> ChartOutput:
     """
     Create an enhanced interactive time series chart for daily cost trends.
 
@@ -815,13 +841,13 @@ def create_enhanced_daily_trend_chart(data: pd.DataFrame) -> Dict[str, Any]:
         data: DataFrame with daily trend data
 
     Returns:
-        Dictionary with chart HTML and JSON data
+        ChartOutput with chart HTML and JSON data
     """
     if not are_charts_enabled() or not is_chart_enabled("daily_trend"):
-        return {"html": "", "json_data": "{}"}
+        return ChartOutput()
 
     if data.empty:
-        return {"html": "<!-- No data available for daily trend chart -->", "json_data": "{}"}
+        return ChartOutput(html="<!-- No data available for daily trend chart -->")
 
     # Get chart configuration
     chart_config = get_chart_config("daily_trend")
@@ -849,6 +875,28 @@ def create_enhanced_daily_trend_chart(data: pd.DataFrame) -> Dict[str, Any]:
     # Get today's date (3 days ago to match dashboard logic)
     today = datetime.now().date() - timedelta(days=3)
 
+    # Convert the value columns to numbers and the dates to timestamps once,
+    # then split the rows by environment and into actual and forecast parts
+    # once, instead of copying and filtering the whole frame for every series
+    series_source = data.copy()
+    for col in series_source.columns:
+        if col != 'date' and col != 'environment_type':
+            try:
+                series_source[col] = pd.to_numeric(series_source[col], errors='coerce').fillna(0)
+            except Exception:
+                pass  # Skip columns that can't be converted
+    series_source['date'] = pd.to_datetime(series_source['date'])
+
+    def _split_actual_forecast(frame: pd.DataFrame) -> Tuple[pd.DataFrame, pd.DataFrame]:
+        is_actual = (frame['date'].dt.normalize() <= pd.Timestamp(today)).to_numpy()
+        return frame[is_actual], frame[~is_actual]
+
+    env_frames = {
+        str(env).upper(): _split_actual_forecast(frame)
+        for env, frame in split_by_environment(series_source).items()
+    }
+    all_frames = None
+
     # Process each series from configuration
     for series_config in chart_config.get("series", []):
         series_name = series_config.get("name", "")
@@ -858,63 +906,52 @@ def create_enhanced_daily_trend_chart(data: pd.DataFrame) -> Dict[str, Any]:
         line_type = series_config.get("type", "line")
         dash_style = series_config.get("dash", "solid")
 
-        # Filter data for this series
-        series_data = data.copy()
-
-        # Ensure numeric types for all numeric columns
-        if 'daily_cost' in series_data.columns:
-            series_data['daily_cost'] = pd.to_numeric(series_data['daily_cost'], errors='coerce').fillna(0)
+        if column not in series_source.columns:
+            continue
 
-        # Convert all possible columns to numeric to avoid type errors
-        for col in series_data.columns:
-            if col != 'date' and col != 'environment_type':
-                try:
-                    series_data[col] = pd.to_numeric(series_data[col], errors='coerce').fillna(0)
-                except Exception:
-                    pass  # Skip columns that can't be converted
+        # Environment filters (case-insensitive) pick a pre-split frame
+        env_filter = filter_by.get('environment_type')
+        if env_filter is not None and 'environment_type' in series_source.columns:
+            actual_data, forecast_data = env_frames.get(
+                env_filter.upper(), (series_source.iloc[:0], series_source.iloc[:0])
+            )
+        else:
+            if all_frames is None:
+                all_frames = _split_actual_forecast(series_source)
+            actual_data, forecast_data = all_frames
 
-        # Filter data based on configuration
+        # Apply any other filters from the configuration
         for key, value in filter_by.items():
-            if key in series_data.columns:
-                if series_data[key].dtype == 'object':
-                    # Case-insensitive comparison for environment_type
-                    if key == 'environment_type':
-                        series_data = series_data[series_data[key].str.upper() == value.upper()]
-                    else:
-                        series_data = series_data[series_data[key].str.lower() == value.lower()]
-                else:
-                    series_data = series_data[series_data[key] == value]
-
-        if column in series_data.columns and not series_data.empty:
-            # Ensure the y-axis data is numeric
-            series_data[column] = pd.to_numeric(series_data[column], errors='coerce').fillna(0)
-
-            # Split into actual and forecast data
-            series_data['date'] = pd.to_datetime(series_data['date'])
-            actual_data = series_data[series_data['date'].dt.date <= today]
-            forecast_data = series_data[series_data['date'].dt.date > today]
-
-            # Add actual data trace
-            if not actual_data.empty:
-                fig.add_trace(go.Scatter(
-                    x=actual_data['date'],
-                    y=actual_data[column],
-                    mode='lines',
-                    name=f"{series_name} (Actual)",
-                    line=dict(color=color, dash=dash_style),
-                    hovertemplate='%{x|%b %d, %Y}: $%{y:,.2f} (Actual)<extra></extra>'
-                ))
+            if key == 'environment_type' or key not in series_source.columns:
+                continue
+            if series_source[key].dtype == 'object':
+                actual_data = actual_data[actual_data[key].str.lower() == value.lower()]
+                forecast_data = forecast_data[forecast_data[key].str.lower() == value.lower()]
+            else:
+                actual_data = actual_data[actual_data[key] == value]
+                forecast_data = forecast_data[forecast_data[key] == value]
+
+        # Add actual data trace
+        if not actual_data.empty:
+            fig.add_trace(go.Scattergl(
+                x=actual_data['date'],
+                y=actual_data[column],
+                mode='lines',
+                name=f"{series_name} (Actual)",
+                line=dict(color=color, dash=dash_style),
+                hovertemplate='%{x|%b %d, %Y}: $%{y:,.2f} (Actual)<extra></extra>'
+            ))
 
-            # Add forecast data with dotted line style
-            if not forecast_data.empty:
-                fig.add_trace(go.Scatter(
-                    x=forecast_data['date'],
-                    y=forecast_data[column],
-                    mode='lines',
-                    name=f"{series_name} (Forecast)",
-                    line=dict(color=color, dash='dash'),  # Always use dotted line for forecast data
-                    hovertemplate='%{x|%b %d, %Y}: $%{y:,.2f} (Forecast)<extra></extra>'
-                ))
+        # Add forecast data with dotted line style
+        if not forecast_data.empty:
+            fig.add_trace(go.Scattergl(
+                x=forecast_data['date'],
+                y=forecast_data[column],
+                mode='lines',
+                name=f"{series_name} (Forecast)",
+                line=dict(color=color, dash='dash'),  # Always use dotted line for forecast data
+                hovertemplate='%{x|%b %d, %Y}: $%{y:,.2f} (Forecast)<extra></extra>'
+            ))
     
     # Add vertical line at today's date to separate actual vs forecast data
     fig.add_shape(
@@ -988,14 +1025,14 @@ def create_enhanced_daily_trend_chart(data: pd.DataFrame) -> Dict[str, Any]:
     
     # Generate HTML and JSON data
     html = pio.to_html(fig, full_html=False, include_plotlyjs="cdn")
-    json_data = json.dumps(fig, cls=PlotlyJSONEncoder)
+    json_data = figure_to_json(fig)
     
-    return {"html": html, "json_data": json_data}
+    return ChartOutput(html=html, json_data=json_data)
 
 def create_enhanced_stacked_bar_chart(
     data: pd.DataFrame,
     chart_key: str
-) -> Dict[str, Any]:
+) -> ChartOutput:
     """
     Create an enhanced stacked bar chart for cost comparisons.
 
@@ -1004,17 +1041,17 @@ def create_enhanced_stacked_bar_chart(
         chart_key: Key identifying the chart type (cto_costs, pillar_costs, product_costs)
 
     Returns:
-        Dictionary with chart HTML and JSON data
+        ChartOutput with chart HTML and JSON data
     """
     # Get display_millions configuration
     from app.utils.config_loader import load_config
     config = load_config("config.yaml")
     display_millions = config.get('data', {}).get('display_millions', True)
     if not are_charts_enabled() or not is_chart_enabled(chart_key):
-        return {"html": "", "json_data": "{}"}
+        return ChartOutput()
 
     if data.empty:
-        return {"html": f"<!-- No data available for {chart_key} chart -->", "json_data": "{}"}
+        return ChartOutput(html=f"<!-- No data available for {chart_key} chart -->")
 
     # Get chart configuration
     chart_config = get_chart_config(chart_key)
@@ -1050,7 +1087,7 @@ def create_enhanced_stacked_bar_chart(
     # Get axis column configuration
     y_axis_column = chart_config.get("y_axis", {}).get("column", "")
     if not y_axis_column or y_axis_column not in data.columns:
-        return {"html": f"<!-- Missing y-axis column for {chart_key} chart -->", "json_data": "{}"}
+        return ChartOutput(html=f"<!-- Missing y-axis column for {chart_key} chart -->")
 
     # Sort data to ensure consistent display order
     data = data.sort_values(by="total_ytd_cost", ascending=True)  # Ascending for better horizontal display
@@ -1166,19 +1203,19 @@ def create_enhanced_stacked_bar_chart(
     
     # Generate HTML and JSON data
     html = pio.to_html(fig, full_html=False, include_plotlyjs="cdn")
-    json_data = json.dumps(fig, cls=PlotlyJSONEncoder)
+    json_data = figure_to_json(fig)
     
-    return {"html": html, "json_data": json_data}
+    return ChartOutput(html=html, json_data=json_data)
 
-def create_enhanced_cto_costs_chart(data: pd.DataFrame) -> Dict[str, Any]:
+def create_enhanced_cto_costs_chart(data: pd.DataFrame) -> ChartOutput:
     """Generate enhanced stacked bar chart for CTO organization costs."""
     return create_enhanced_stacked_bar_chart(data, "cto_costs")
 
-def create_enhanced_pillar_costs_chart(data: pd.DataFrame) -> Dict[str, Any]:
+def create_enhanced_pillar_costs_chart(data: pd.DataFrame) -> ChartOutput:
     """Generate enhanced stacked bar chart for pillar team costs."""
     return create_enhanced_stacked_bar_chart(data, "pillar_costs")
 
-def create_enhanced_product_costs_chart(data: pd.DataFrame) -> Dict[str, Any]:
+def create_enhanced_product_costs_chart(data: pd.DataFrame) -> ChartOutput:
     """Generate enhanced stacked bar chart for product costs."""
     return create_enhanced_stacked_bar_chart(data, "product_costs")
 
@@ -1188,7 +1225,7 @@ def generate_all_enhanced_charts(
     pillar_costs: List[Dict[str, Any]],
     product_costs: List[Dict[str, Any]],
     use_enhanced_charts: bool = True
-) -> Dict[str, Dict[str, Any]]:
+) -> Dict[str, ChartOutput]:
     """
     Generate all enhanced charts for the dashboard.
     
@@ -1200,7 +1237,7 @@ def generate_all_enhanced_charts(
         use_enhanced_charts: Whether to use the enhanced charts from chart_config
         
     Returns:
-        Dictionary with all chart data
+        Dictionary of ChartOutput by chart name
     """
     if not are_charts_enabled():
         return {}
@@ -1221,10 +1258,10 @@ def generate_all_enhanced_charts(
     else:
         # Use the original chart functions
         charts = {
-            "daily_trend": {"json_data": create_interactive_daily_trend_chart(daily_trend_data)},
-            "cto_costs": {"json_data": create_interactive_cto_breakdown_chart(cto_df)},
-            "pillar_costs": {"json_data": create_interactive_pillar_breakdown_chart(pillar_df)},
-            "product_costs": {"json_data": create_interactive_product_breakdown_chart(product_df)},
+            "daily_trend": ChartOutput(json_data=create_interactive_daily_trend_chart(daily_trend_data)),
+            "cto_costs": ChartOutput(json_data=create_interactive_cto_breakdown_chart(cto_df)),
+            "pillar_costs": ChartOutput(json_data=create_interactive_pillar_breakdown_chart(pillar_df)),
+            "product_costs": ChartOutput(json_data=create_interactive_product_breakdown_chart(product_df)),
         }
     
     return charts
\ No newline at end of file
@@ -1,17 +1,45 @@
 """
 Chart generation utilities for FinOps360 cost analysis dashboard.
 """
+import os
 import logging
-import base64
+import hashlib
+import functools
+import inspect
+import threading
+import time
 import json
 from io import BytesIO
-from typing import Dict, List, Optional, Tuple, Any
+from typing import Dict, Iterator, List, Optional, Tuple, Any
 
 import pandas as pd
 import numpy as np
+import matplotlib
+# Charts are only ever rendered to images, so use the non-interactive backend
+matplotlib.use('Agg')
 import matplotlib.pyplot as plt
 import matplotlib.dates as mdates
-import seaborn as sns
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+from PIL import Image
+
+# pybase64 is an optional, API-compatible SIMD base64 codec
+try:
+    import pybase64 as base64
+except ImportError:
+    import base64
+
+# tsdownsample is optional; without it trend series are plotted in full
+try:
+    from tsdownsample import MinMaxLTTBDownsampler
+except ImportError:
+    MinMaxLTTBDownsampler = None
+
+from app.utils.chart.config import skip_if_disabled
+
+# Apply the chart style once at import rather than on every render
+plt.style.use('ggplot')
+plt.rcParams.update({'figure.figsize': (10, 6), 'axes.grid': True, 'grid.alpha': 0.3})
 
 # Note: Plotly imports are only used in interactive_charts.py
 # import plotly.graph_objects as go
@@ -20,23 +48,268 @@ import seaborn as sns
 
 logger = logging.getLogger(__name__)
 
-def encode_figure_to_base64(fig: plt.Figure) -> str:
+# Rendered chart images, keyed by a hash of the chart inputs. Only used when
+# these matplotlib chart functions are called directly; the dashboard renders
+# its charts with app.utils.chart.generator
+CHART_CACHE_DIR = os.path.expanduser("~/.cache/finops/charts")
+
+# Part of every chart cache key; bump when chart rendering changes so images
+# drawn by older code are not served
+CHART_CACHE_VERSION = 1
+
+# Cached images older than this are re-rendered; beyond CHART_CACHE_MAX_FILES
+# the oldest are removed
+CHART_CACHE_TTL_HOURS = 12
+CHART_CACHE_MAX_FILES = 256
+
+# Chart image encoding. WebP is about a third of the size of the equivalent
+# PNG at the same encode cost; embed images as data:{CHART_IMAGE_MIME};base64
+CHART_IMAGE_FORMAT = "webp"
+CHART_IMAGE_MIME = f"image/{CHART_IMAGE_FORMAT}"
+CHART_IMAGE_DPI = 90
+CHART_IMAGE_OPTIONS = {'quality': 85, 'method': 4}
+
+# Environment types plotted on the trend charts, in legend order
+TREND_ENVIRONMENTS = ('NON-PROD', 'PROD')
+
+# Trend series longer than this are downsampled to TREND_MAX_POINTS before
+# plotting; more points than that cannot be told apart at the chart's width
+TREND_DOWNSAMPLE_THRESHOLD = 1500
+TREND_MAX_POINTS = 800
+
+# Subplot margins reset on each reused figure
+_SUBPLOT_PARAMS = ('left', 'right', 'bottom', 'top', 'wspace', 'hspace')
+
+# Cleaner style for the daily trend chart, layered over the default style
+# only while that chart renders
+_TREND_STYLE = plt.style.library['seaborn-v0_8-whitegrid']
+
+def _chart_cache_key(func_name: str, arguments: Dict[str, Any]) -> str:
+    """
+    Hash a chart function's name and arguments into a cache key.
+    
+    DataFrames are hashed by their column names and values, so an identical
+    frame produces the same key regardless of object identity.
+    
+    Args:
+        func_name: Name of the chart function
+        arguments: Bound arguments of the call, including defaults
+        
+    Returns:
+        Hex digest identifying the chart
+    """
+    digest = hashlib.blake2b(
+        f"{CHART_CACHE_VERSION}:{func_name}:{CHART_IMAGE_FORMAT}:{CHART_IMAGE_DPI}".encode(), digest_size=16
+    )
+    for name, value in arguments.items():
+        digest.update(name.encode())
+        if isinstance(value, pd.DataFrame):
+            digest.update(repr(value.columns.tolist()).encode())
+            digest.update(pd.util.hash_pandas_object(value, index=False).to_numpy().tobytes())
+        else:
+            digest.update(repr(value).encode())
+    return digest.hexdigest()
+
+def _prune_chart_cache(ttl_seconds: float) -> None:
+    """
+    Remove expired chart images, then the oldest ones beyond CHART_CACHE_MAX_FILES.
+    
+    Args:
+        ttl_seconds: Maximum age of a cached image
+    """
+    try:
+        entries = []
+        with os.scandir(CHART_CACHE_DIR) as it:
+            for entry in it:
+                if entry.name.endswith('.b64'):
+                    entries.append((entry.stat().st_mtime, entry.path))
+    except OSError as e:
+        logger.debug("Could not list chart cache %s: %s", CHART_CACHE_DIR, e)
+        return
+    
+    now = time.time()
+    entries.sort(reverse=True)
+    for index, (mtime, path) in enumerate(entries):
+        if index >= CHART_CACHE_MAX_FILES or now - mtime > ttl_seconds:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+def cached_figure(func):
+    """
+    Cache a chart function's base64 image on disk, keyed by its inputs.
+    
+    Re-rendering identical data (e.g. repeated refreshes on the same day)
+    then skips matplotlib drawing and PNG encoding. Empty results (errors)
+    are not cached, and images older than CHART_CACHE_TTL_HOURS are
+    re-rendered.
+    """
+    signature = inspect.signature(func)
+    
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        try:
+            bound = signature.bind(*args, **kwargs)
+            bound.apply_defaults()
+            path = os.path.join(CHART_CACHE_DIR, f"{_chart_cache_key(func.__name__, bound.arguments)}.b64")
+        except Exception as e:
+            logger.debug("Chart inputs could not be hashed, rendering uncached: %s", e)
+            return func(*args, **kwargs)
+        
+        ttl_seconds = CHART_CACHE_TTL_HOURS * 3600
+        try:
+            if time.time() - os.path.getmtime(path) > ttl_seconds:
+                os.remove(path)
+            else:
+                with open(path, 'r') as f:
+                    return f.read()
+        except OSError:
+            pass
+        
+        result = func(*args, **kwargs)
+        if result:
+            try:
+                os.makedirs(CHART_CACHE_DIR, exist_ok=True)
+                tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+                with open(tmp_path, 'w') as f:
+                    f.write(result)
+                os.replace(tmp_path, path)
+            except OSError as e:
+                logger.warning(f"Could not cache chart image {path}: {e}")
+            _prune_chart_cache(ttl_seconds)
+        return result
+    return wrapper
+
+class _FigurePool(threading.local):
+    """Per-thread stack of cleared figures available for reuse."""
+    def __init__(self):
+        self.figures: List[Figure] = []
+
+_figure_pool = _FigurePool()
+
+def _borrow_figure(figsize: Optional[Tuple[float, float]] = None) -> Tuple[Figure, plt.Axes]:
+    """
+    Get a figure with a single Axes, reusing one released by this thread when available.
+    
+    Figures are created outside pyplot, so a figure that is never returned
+    (for example when rendering fails) is simply garbage collected.
+    
+    Args:
+        figsize: Figure size in inches, defaulting to rcParams['figure.figsize']
+        
+    Returns:
+        Tuple of (figure, axes)
+    """
+    if _figure_pool.figures:
+        fig = _figure_pool.figures.pop()
+    else:
+        # Laid out and drawn directly at the output resolution
+        fig = Figure(dpi=CHART_IMAGE_DPI)
+        FigureCanvasAgg(fig)
+    fig.set_size_inches(figsize or plt.rcParams['figure.figsize'])
+    # tight_layout() on the previous chart moved the subplot margins
+    fig.subplots_adjust(**{name: plt.rcParams[f'figure.subplot.{name}'] for name in _SUBPLOT_PARAMS})
+    return fig, fig.add_subplot()
+
+def _release_figure(fig: Figure) -> None:
+    """
+    Clear a figure from _borrow_figure and return it to this thread's pool.
+    
+    Args:
+        fig: Figure to release
+    """
+    fig.clear()
+    _figure_pool.figures.append(fig)
+
+def encode_figure_to_base64(fig: Figure) -> str:
     """
     Encode a matplotlib figure to base64 for embedding in HTML.
     
+    Callers lay the figure out with tight_layout() first, so it is drawn in a
+    single render pass. The figure is drawn on its Agg canvas and the RGBA
+    buffer is handed to PIL directly, skipping savefig's per-call canvas and
+    dpi switching.
+    
     Args:
-        fig: Matplotlib figure
+        fig: Figure from _borrow_figure, released back to the pool once encoded
         
     Returns:
-        Base64-encoded string
+        Base64-encoded CHART_IMAGE_FORMAT image
     """
+    canvas = fig.canvas
+    canvas.draw()
+    image = Image.frombuffer("RGBA", canvas.get_width_height(), canvas.buffer_rgba(), "raw", "RGBA", 0, 1)
     buf = BytesIO()
-    fig.savefig(buf, format='png', bbox_inches='tight', dpi=100)
-    buf.seek(0)
-    img_str = base64.b64encode(buf.read()).decode('utf-8')
-    plt.close(fig)
+    image.save(buf, format=CHART_IMAGE_FORMAT, dpi=(CHART_IMAGE_DPI, CHART_IMAGE_DPI), **CHART_IMAGE_OPTIONS)
+    # Encode straight from the buffer's memory instead of copying it out first
+    img_str = base64.b64encode(buf.getbuffer()).decode('ascii')
+    _release_figure(fig)
     return img_str
 
+@functools.cache
+def _no_data_chart(message: str, title: str, figsize: Optional[Tuple[float, float]] = None) -> str:
+    """
+    Render the placeholder image shown when a chart has no data, once per process.
+    
+    Args:
+        message: Text shown in the middle of the chart
+        title: Chart title
+        figsize: Figure size in inches (default: rcParams['figure.figsize'])
+        
+    Returns:
+        Base64-encoded chart image
+    """
+    fig, ax = _borrow_figure(figsize)
+    ax.text(0.5, 0.5, message, ha='center', va='center', fontsize=14)
+    ax.set_title(title, fontsize=14)
+    fig.tight_layout()
+    return encode_figure_to_base64(fig)
+
+def _environment_groups(df: pd.DataFrame) -> Iterator[Tuple[str, pd.DataFrame]]:
+    """
+    Split trend data into per-environment frames, each sorted by date.
+    
+    Environment types are coded once as a categorical over
+    TREND_ENVIRONMENTS, so each split is an integer comparison on the codes
+    rather than a string comparison per row. Environments are yielded in the
+    order groupby would yield them.
+    
+    Args:
+        df: DataFrame with environment_type and date columns
+        
+    Yields:
+        (environment type, rows for that environment) for each environment present
+    """
+    codes = pd.Categorical(df['environment_type'], categories=TREND_ENVIRONMENTS).codes
+    for code, env in enumerate(TREND_ENVIRONMENTS):
+        mask = codes == code
+        if mask.any():
+            yield env, df[mask].sort_values('date', kind='stable')
+
+def _downsample_trend(group: pd.DataFrame) -> pd.DataFrame:
+    """
+    Reduce a long date-sorted trend series to TREND_MAX_POINTS rows with MinMaxLTTB.
+    
+    The points are chosen on daily_cost, so peaks and dips survive; the
+    other series of the selected rows are plotted alongside.
+    
+    Args:
+        group: Rows for one environment, sorted by date
+        
+    Returns:
+        The selected rows, or the group unchanged when it is short enough or
+        tsdownsample is not installed
+    """
+    if MinMaxLTTBDownsampler is None or len(group) <= TREND_DOWNSAMPLE_THRESHOLD:
+        return group
+    x = pd.to_datetime(group['date']).to_numpy(dtype='datetime64[ns]').view(np.int64)
+    y = group['daily_cost'].to_numpy(dtype=np.float64)
+    return group.iloc[MinMaxLTTBDownsampler().downsample(x, y, n_out=TREND_MAX_POINTS)]
+
+@skip_if_disabled("daily_trend")
+@cached_figure
+@plt.rc_context(_TREND_STYLE)
 def create_daily_trend_chart(df: pd.DataFrame) -> str:
     """
     Create a daily trend chart with both actual and forecasted costs.
@@ -50,18 +323,10 @@ def create_daily_trend_chart(df: pd.DataFrame) -> str:
     try:
         # Check if dataframe is empty
         if df.empty:
-            # Create empty chart with message
-            plt.style.use('ggplot')
-            fig, ax = plt.subplots(figsize=(12, 6))
-            ax.text(0.5, 0.5, 'No data available for trend chart', 
-                   ha='center', va='center', fontsize=14)
-            ax.set_title('Daily Cost Analysis for PROD and NON-PROD Environments', fontsize=14)
-            plt.tight_layout()
-            return encode_figure_to_base64(fig)
+            return _no_data_chart('No data available for trend chart',
+                                  'Daily Cost Analysis for PROD and NON-PROD Environments', (12, 6))
             
-        # Use a cleaner style for the plot
-        plt.style.use('seaborn-v0_8-whitegrid')
-        fig, ax = plt.subplots(figsize=(12, 6))
+        fig, ax = _borrow_figure((12, 6))
         
         # Define colors
         prod_color = '#3366cc'  # Blue for PROD
@@ -78,14 +343,16 @@ def create_daily_trend_chart(df: pd.DataFrame) -> str:
         legend_labels = []
         
         # Plot each environment type
-        for env, group in df.groupby('environment_type'):
+        for env, group in _environment_groups(df):
+            group = _downsample_trend(group)
             color = prod_color if env == 'PROD' else nonprod_color
             forecast_color = forecast_prod_color if env == 'PROD' else forecast_nonprod_color
+            dates = group['date'].to_numpy()
             
             # Plot actual daily cost
             line1, = ax.plot(
-                group['date'], 
-                group['daily_cost'], 
+                dates, 
+                group['daily_cost'].to_numpy(), 
                 linewidth=1.5,
                 color=color,
                 alpha=0.9
@@ -96,8 +363,8 @@ def create_daily_trend_chart(df: pd.DataFrame) -> str:
             # Check if optional columns exist and plot them only if they do
             if 'fy25_avg_daily_spend' in group.columns:
                 line2, = ax.plot(
-                    group['date'], 
-                    group['fy25_avg_daily_spend'], 
+                    dates, 
+                    group['fy25_avg_daily_spend'].to_numpy(), 
                     linestyle='--',
                     linewidth=1,
                     color='#999999',
@@ -108,8 +375,8 @@ def create_daily_trend_chart(df: pd.DataFrame) -> str:
             
             if 'fy26_ytd_avg_daily_spend' in group.columns:
                 line3, = ax.plot(
-                    group['date'], 
-                    group['fy26_ytd_avg_daily_spend'], 
+                    dates, 
+                    group['fy26_ytd_avg_daily_spend'].to_numpy(), 
                     linestyle='-.',
                     linewidth=1,
                     color=avg_color,
@@ -120,8 +387,8 @@ def create_daily_trend_chart(df: pd.DataFrame) -> str:
             
             if 'fy26_forecasted_avg_daily_spend' in group.columns:
                 line4, = ax.plot(
-                    group['date'], 
-                    group['fy26_forecasted_avg_daily_spend'], 
+                    dates, 
+                    group['fy26_forecasted_avg_daily_spend'].to_numpy(), 
                     linestyle=':',
                     linewidth=2,
                     color=forecast_color,
@@ -149,13 +416,15 @@ def create_daily_trend_chart(df: pd.DataFrame) -> str:
         # Show y-axis in dollar format
         ax.yaxis.set_major_formatter(plt.FuncFormatter(lambda x, _: f'${x:,.0f}'))
         
-        plt.tight_layout()
+        fig.tight_layout()
         return encode_figure_to_base64(fig)
     
     except Exception as e:
         logger.error(f"Error creating daily trend chart: {e}")
         return ""
 
+@skip_if_disabled()
+@cached_figure
 def create_forecast_chart(df: pd.DataFrame) -> str:
     """
     Create a chart showing actual vs forecasted costs.
@@ -169,26 +438,19 @@ def create_forecast_chart(df: pd.DataFrame) -> str:
     try:
         # Check if dataframe is empty
         if df.empty:
-            # Create empty chart with message
-            plt.style.use('ggplot')
-            fig, ax = plt.subplots(figsize=(10, 6))
-            ax.text(0.5, 0.5, 'No data available for forecast chart', 
-                   ha='center', va='center', fontsize=14)
-            ax.set_title('Cost Forecast (Next 30 Days)', fontsize=14)
-            plt.tight_layout()
-            return encode_figure_to_base64(fig)
+            return _no_data_chart('No data available for forecast chart', 'Cost Forecast (Next 30 Days)')
             
-        plt.style.use('ggplot')
-        fig, ax = plt.subplots(figsize=(10, 6))
+        fig, ax = _borrow_figure()
         legend_handles = []
         legend_labels = []
         
         # Plot each environment type with actual vs forecasted
-        for env, group in df.groupby('environment_type'):
+        for env, group in _environment_groups(df):
+            group = _downsample_trend(group)
             # Plot actual daily cost
             line1, = ax.plot(
-                group['date'],
-                group['daily_cost'],
+                group['date'].to_numpy(),
+                group['daily_cost'].to_numpy(),
                 marker='o',
                 markersize=4,
                 linewidth=2
@@ -223,7 +485,6 @@ def create_forecast_chart(df: pd.DataFrame) -> str:
         ax.set_title('Cost Forecast (Next 30 Days)', fontsize=14)
         ax.set_xlabel('Date', fontsize=12)
         ax.set_ylabel('Cost ($)', fontsize=12)
-        ax.grid(True, alpha=0.3)
         
         # Format date labels
         ax.xaxis.set_major_formatter(mdates.DateFormatter('%b %d'))
@@ -233,13 +494,15 @@ def create_forecast_chart(df: pd.DataFrame) -> str:
         if legend_handles:
             ax.legend(legend_handles, legend_labels)
         
-        plt.tight_layout()
+        fig.tight_layout()
         return encode_figure_to_base64(fig)
     
     except Exception as e:
         logger.error(f"Error creating forecast chart: {e}")
         return ""
 
+@skip_if_disabled()
+@cached_figure
 def create_environment_breakdown_chart(prod_df: pd.DataFrame, nonprod_df: pd.DataFrame) -> str:
     """
     Create a chart showing environment cost breakdown.
@@ -252,154 +515,79 @@ def create_environment_breakdown_chart(prod_df: pd.DataFrame, nonprod_df: pd.Dat
         Base64-encoded chart image
     """
     try:
-        plt.style.use('ggplot')
-        fig, ax = plt.subplots(figsize=(10, 6))
-        
         # Check if we have data
         has_prod_data = not prod_df.empty and 'ytd_cost' in prod_df.columns
         has_nonprod_data = not nonprod_df.empty and 'ytd_cost' in nonprod_df.columns
         
         if not (has_prod_data or has_nonprod_data):
-            # No data available, create empty chart with message
-            ax.text(0.5, 0.5, 'No environment cost data available', 
-                   ha='center', va='center', fontsize=14)
-            ax.set_title('Cost Breakdown by Environment', fontsize=14)
-            plt.tight_layout()
-            return encode_figure_to_base64(fig)
+            return _no_data_chart('No environment cost data available', 'Cost Breakdown by Environment')
+        
+        fig, ax = _borrow_figure()
         
         # Prepare data
         environments = ['PROD', 'NON-PROD']
-        ytd_costs = [
+        ytd_costs = np.array([
             prod_df['ytd_cost'].iloc[0] if has_prod_data else 0,
             nonprod_df['ytd_cost'].iloc[0] if has_nonprod_data else 0
-        ]
+        ], dtype=float)
+        total = ytd_costs.sum()
+        percentages = np.divide(ytd_costs, total, out=np.zeros_like(ytd_costs), where=total > 0) * 100
         
         # Create bars for YTD costs
         bars = ax.bar(environments, ytd_costs, label='YTD Actual')
         
         # Add value labels
-        for i, cost in enumerate(ytd_costs):
-            if cost > 0:
-                ax.text(i, cost / 2, f'${cost:,.0f}', ha='center', va='center', 
-                       color='white', fontweight='bold')
+        ax.bar_label(bars, labels=[f'${cost:,.0f}' if cost > 0 else '' for cost in ytd_costs],
+                     label_type='center', color='white', fontweight='bold')
             
         # Add percentage breakdown
-        total = sum(ytd_costs)
         if total > 0:
-            percentages = [cost / total * 100 for cost in ytd_costs]
-            
-            for i, percentage in enumerate(percentages):
-                if ytd_costs[i] > 0:
-                    ax.text(i, ytd_costs[i] + (max(ytd_costs) * 0.02 if max(ytd_costs) > 0 else 1), 
-                           f"{percentage:.1f}%", ha='center', va='bottom')
+            ax.bar_label(bars, labels=[f"{pct:.1f}%" if cost > 0 else '' for cost, pct in zip(ytd_costs, percentages)],
+                         label_type='edge', padding=3)
         
         # Format the plot
         ax.set_title('Cost Breakdown by Environment', fontsize=14)
         ax.set_ylabel('Cost ($)', fontsize=12)
-        ax.grid(True, alpha=0.3, axis='y')
         
         # Add legend if we have data
         if total > 0:
             ax.legend([bars[0]], ['YTD Actual'])
         
-        plt.tight_layout()
+        fig.tight_layout()
         return encode_figure_to_base64(fig)
     
     except Exception as e:
         logger.error(f"Error creating environment breakdown chart: {e}")
         return ""
 
-def create_product_breakdown_chart(product_df: pd.DataFrame, top_n: int = 10) -> str:
+@skip_if_disabled("product_costs")
+@cached_figure
+def create_product_breakdown_chart(product_df: pd.DataFrame) -> str:
     """
     Create a chart showing top products by cost.
     
     Args:
-        product_df: DataFrame with product cost data
-        top_n: Number of top products to display
+        product_df: DataFrame with one row per product, highest total cost first
+            (product_breakdown query, already limited to the top products)
         
     Returns:
         Base64-encoded chart image
     """
     try:
-        plt.style.use('ggplot')
-        fig, ax = plt.subplots(figsize=(10, 6))
-        
-        # Check for empty dataframe or missing columns
-        required_columns = ['product_name', 'total_ytd_cost', 'prod_ytd_cost', 'nonprod_ytd_cost']
-        has_required_data = (not product_df.empty and 
-                            all(col in product_df.columns for col in ['product_name', 'environment']) and
-                            ('total_ytd_cost' in product_df.columns or 'prod_ytd_cost' in product_df.columns))
-        
-        if not has_required_data:
-            # Create empty chart with message
-            ax.text(0.5, 0.5, 'No product cost data available', 
-                   ha='center', va='center', fontsize=14)
-            ax.set_title('Top Products by Cost', fontsize=14)
-            plt.tight_layout()
-            return encode_figure_to_base64(fig)
-        
-        # Ensure we have the necessary cost columns or create them
-        if 'total_ytd_cost' not in product_df.columns and 'prod_ytd_cost' in product_df.columns and 'nonprod_ytd_cost' in product_df.columns:
-            product_df['total_ytd_cost'] = product_df['prod_ytd_cost'] + product_df['nonprod_ytd_cost']
-        
-        if 'prod_ytd_cost' not in product_df.columns:
-            product_df['prod_ytd_cost'] = product_df.apply(
-                lambda row: row['total_ytd_cost'] if row.get('environment', '') == 'PROD' else 0, 
-                axis=1
-            )
-            
-        if 'nonprod_ytd_cost' not in product_df.columns:
-            product_df['nonprod_ytd_cost'] = product_df.apply(
-                lambda row: row['total_ytd_cost'] if row.get('environment', '') == 'NON-PROD' else 0, 
-                axis=1
-            )
-        
-        # Get top N products by total cost
-        sort_column = 'total_ytd_cost' if 'total_ytd_cost' in product_df.columns else 'prod_ytd_cost'
-        top_products = product_df.sort_values(sort_column, ascending=False).head(top_n)
+        required_columns = ['product_name', 'prod_ytd_cost', 'nonprod_ytd_cost']
+        if product_df.empty or not all(col in product_df.columns for col in required_columns):
+            return _no_data_chart('No product cost data available', 'Top Products by Cost')
         
-        # If we need to aggregate by product and environment
-        if len(top_products) > 0 and 'environment' in top_products.columns:
-            # Create a summary dataframe with one row per product
-            summary = []
-            for product_name in top_products['product_name'].unique():
-                product_rows = top_products[top_products['product_name'] == product_name]
-                
-                prod_cost = product_rows[product_rows['environment'] == 'PROD']['prod_ytd_cost'].sum() if 'prod_ytd_cost' in product_rows.columns else 0
-                nonprod_cost = product_rows[product_rows['environment'] == 'NON-PROD']['nonprod_ytd_cost'].sum() if 'nonprod_ytd_cost' in product_rows.columns else 0
-                
-                if 'total_ytd_cost' in product_rows.columns:
-                    total_cost = product_rows['total_ytd_cost'].sum()
-                else:
-                    total_cost = prod_cost + nonprod_cost
-                
-                summary.append({
-                    'product_name': product_name,
-                    'prod_ytd_cost': prod_cost,
-                    'nonprod_ytd_cost': nonprod_cost,
-                    'total_ytd_cost': total_cost
-                })
-            
-            if summary:
-                # Convert to DataFrame and sort
-                summary_df = pd.DataFrame(summary)
-                top_products = summary_df.sort_values('total_ytd_cost', ascending=True)
-        else:
-            # Sort in ascending order for horizontal bar chart (bottom to top)
-            top_products = top_products.sort_values('total_ytd_cost', ascending=True)
+        fig, ax = _borrow_figure()
         
-        # Check if we have any products
-        if top_products.empty:
-            ax.text(0.5, 0.5, 'No product cost data available', 
-                   ha='center', va='center', fontsize=14)
-            ax.set_title('Top Products by Cost', fontsize=14)
-            plt.tight_layout()
-            return encode_figure_to_base64(fig)
+        # Rows are aggregated, ranked and limited in BigQuery; reverse into
+        # ascending order for the horizontal bar chart (bottom to top)
+        top_products = product_df.iloc[::-1]
         
         # Get product names and costs
-        products = top_products['product_name'].tolist()
-        prod_costs = top_products['prod_ytd_cost'].tolist() 
-        nonprod_costs = top_products['nonprod_ytd_cost'].tolist()
+        products = top_products['product_name'].to_numpy()
+        prod_costs = top_products['prod_ytd_cost'].to_numpy(dtype=np.float64)
+        nonprod_costs = top_products['nonprod_ytd_cost'].to_numpy(dtype=np.float64)
         
         # Create horizontal stacked bars
         y_pos = np.arange(len(products))
@@ -413,18 +601,14 @@ def create_product_breakdown_chart(product_df: pd.DataFrame, top_n: int = 10) ->
         ax.set_title('Top Products by Cost', fontsize=14)
         
         # Add value labels
-        for i, (prod, nonprod) in enumerate(zip(prod_costs, nonprod_costs)):
-            if prod > 0:
-                ax.text(prod / 2, i, f'${prod:,.0f}', ha='center', va='center', 
-                       color='white', fontweight='bold', fontsize=8)
-            if nonprod > 0:
-                ax.text(prod + nonprod / 2, i, f'${nonprod:,.0f}', ha='center', va='center', 
-                       color='white', fontweight='bold', fontsize=8)
+        for bars, costs in ((prod_bars, prod_costs), (nonprod_bars, nonprod_costs)):
+            ax.bar_label(bars, labels=[f'${cost:,.0f}' if cost > 0 else '' for cost in costs],
+                         label_type='center', color='white', fontweight='bold', fontsize=8)
         
         # Add legend with explicit handles
         ax.legend([prod_bars, nonprod_bars], ['PROD', 'NON-PROD'])
         
-        plt.tight_layout()
+        fig.tight_layout()
         return encode_figure_to_base64(fig)
     
     except Exception as e:
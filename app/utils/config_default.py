@@ -1,6 +1,7 @@
 """
 Default configuration values for the FinOps360 dashboard.
 """
+import functools
 
 # Default application title
 DEFAULT_TITLE = "FinOps360 Cost Analysis Tool"
@@ -41,10 +42,13 @@ DEFAULT_FISCAL_YEAR = {
     "fy_end_date": "2026-01-31"
 }
 
+@functools.lru_cache(maxsize=1)
 def get_default_config():
     """
     Get the default configuration as a dictionary.
     
+    Built once per process; callers must not modify the returned dictionary.
+    
     Returns:
         Dictionary with default configuration values
     """
@@ -2,6 +2,7 @@
 Configuration utilities for FinOps360 cost analysis.
 """
 import os
+import functools
 import yaml
 import logging
 from typing import Dict, Any, Optional
@@ -10,6 +11,30 @@ from app.utils.config_default import get_default_config
 
 logger = logging.getLogger(__name__)
 
+# Use libyaml's C parser when PyYAML was built with it
+_YAML_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+def _merge_dicts(defaults: Dict[str, Any], overrides: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Merge configuration overrides into defaults, recursing into nested sections.
+    
+    Args:
+        defaults: Default configuration values
+        overrides: Configured values, which take precedence
+        
+    Returns:
+        New dictionary with every default key, in default order, followed by
+        any keys that only appear in the overrides
+    """
+    result = dict(defaults)
+    for key, value in overrides.items():
+        default_value = defaults.get(key)
+        if isinstance(value, dict) and isinstance(default_value, dict):
+            result[key] = _merge_dicts(default_value, value)
+        else:
+            result[key] = value
+    return result
+
 class FinOpsConfig:
     """Configuration class for FinOps360 cost analysis."""
     
@@ -33,28 +58,7 @@ class FinOpsConfig:
     
     def _apply_defaults(self, config_dict: Dict[str, Any]) -> Dict[str, Any]:
         """Apply default values for missing configuration."""
-        defaults = get_default_config()
-        result = {}
-        
-        # Recursive function to merge dictionaries
-        def merge_dicts(defaults, overrides, result_dict):
-            for key, default_value in defaults.items():
-                if key in overrides:
-                    if isinstance(default_value, dict) and isinstance(overrides[key], dict):
-                        result_dict[key] = {}
-                        merge_dicts(default_value, overrides[key], result_dict[key])
-                    else:
-                        result_dict[key] = overrides[key]
-                else:
-                    result_dict[key] = default_value
-            
-            # Add any keys from overrides that aren't in defaults
-            for key, value in overrides.items():
-                if key not in defaults:
-                    result_dict[key] = value
-                    
-        merge_dicts(defaults, config_dict, result)
-        return result
+        return _merge_dicts(get_default_config(), config_dict)
     
     def get(self, key: str, default: Any = None) -> Any:
         """Dictionary-like getter for compatibility with existing code."""
@@ -67,6 +71,9 @@ def load_config(config_path: str) -> FinOpsConfig:
     """
     Load configuration from a YAML file.
     
+    The parsed configuration is cached per file and modification time, so
+    repeated calls only stat the file and re-parse it after it changes.
+    
     Args:
         config_path: Path to the YAML configuration file
         
@@ -79,9 +86,29 @@ def load_config(config_path: str) -> FinOpsConfig:
         config_path = os.path.join(base_dir, config_path)
     
     try:
-        if os.path.exists(config_path):
+        mtime = os.path.getmtime(config_path)
+    except OSError:
+        mtime = None
+    
+    return _load_config_file(config_path, mtime)
+
+
+@functools.lru_cache(maxsize=4)
+def _load_config_file(config_path: str, mtime: Optional[float]) -> FinOpsConfig:
+    """
+    Parse a YAML configuration file (cached by path and modification time).
+    
+    Args:
+        config_path: Absolute path to the YAML configuration file
+        mtime: Modification time of the file, or None if it does not exist
+        
+    Returns:
+        FinOpsConfig object with configuration values
+    """
+    try:
+        if mtime is not None:
             with open(config_path, 'r') as f:
-                config_dict = yaml.safe_load(f) or {}
+                config_dict = yaml.load(f, Loader=_YAML_LOADER) or {}
                 logger.info(f"Loaded configuration from {config_path}")
         else:
             logger.warning(f"Configuration file {config_path} not found, using defaults")
@@ -95,4 +122,4 @@ def load_config(config_path: str) -> FinOpsConfig:
     except Exception as e:
         logger.error(f"Error loading configuration from {config_path}: {e}")
         logger.info("Using default configuration")
-        return FinOpsConfig({})
\ No newline at end of file
+        return FinOpsConfig({})
@@ -2,11 +2,14 @@
 Sample data generator for when BigQuery is not available.
 This provides placeholder data for the dashboard.
 """
+import logging
 from datetime import datetime, timedelta, date
 import pandas as pd
 import numpy as np
 from typing import Dict, Any, List, Tuple
 
+logger = logging.getLogger(__name__)
+
 
 def create_sample_ytd_costs() -> pd.DataFrame:
     """Create sample year-to-date costs DataFrame."""
@@ -26,7 +29,8 @@ def create_sample_ytd_costs() -> pd.DataFrame:
     }
     
     df = pd.DataFrame(data)
-    print(f"Generated sample YTD costs data: {df.to_dict()}")
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("Generated sample YTD costs data: %s", df.to_dict())
     return df
 
 
@@ -231,7 +235,7 @@ def create_sample_daily_trend_data() -> pd.DataFrame:
         current_date = start_date + timedelta(days=90)  # Use a fixed date if we're before FY26
     
     # Generate data with characteristic spikes and patterns
-    for i, date in enumerate(dates):
+    for i, day in enumerate(dates):
         # Add some seasonality 
         month_factor = 1.0 + 0.05 * np.sin(i / 30 * np.pi)  # Monthly cycle
         
@@ -257,17 +261,17 @@ def create_sample_daily_trend_data() -> pd.DataFrame:
             day_factor = 1.0 + 0.03 * np.sin(i / 7 * np.pi)  # Weekly pattern
             spike_factor = 1.0 + 0.02 * np.sin(i / 15 * np.pi)  # Bi-weekly pattern
         else:
-            day_factor = 1.0 + 0.08 * ((date.weekday() % 7) / 10)
+            day_factor = 1.0 + 0.08 * ((day.weekday() % 7) / 10)
         
         # Compute final cost with all factors
         prod_cost = prod_daily_base * day_factor * month_factor * spike_factor * random_factor_prod
         nonprod_cost = nonprod_daily_base * day_factor * month_factor * spike_factor * random_factor_nonprod
         
         # Make sure May 2nd and May 3rd 2025 have specific values for comparisons
-        if date == date(2025, 5, 3):
+        if day == date(2025, 5, 3):
             prod_cost = 12000.0
             nonprod_cost = 3800.0
-        elif date == date(2025, 5, 2):
+        elif day == date(2025, 5, 2):
             prod_cost = 11500.0
             nonprod_cost = 3700.0
         
@@ -289,24 +293,24 @@ def create_sample_daily_trend_data() -> pd.DataFrame:
         
         # Production data
         daily_data.append({
-            'date': date,
+            'date': day,
             'environment_type': 'PROD',
             'daily_cost': round(prod_cost, 2),
             'fy26_avg_daily_spend': round(prod_daily_base, 2),  # Constant average line
             'fy25_avg_daily_spend': round(prod_fy25_avg, 2),  # Constant baseline
             'fy24_avg_daily_spend': round(prod_fy24_avg, 2),  # Constant baseline
-            'fy26_ytd_avg_daily_spend': round(prod_cost, 2) if date <= current_date else 0.0
+            'fy26_ytd_avg_daily_spend': round(prod_cost, 2) if day <= current_date else 0.0
         })
 
         # Non-production data
         daily_data.append({
-            'date': date,
+            'date': day,
             'environment_type': 'NON-PROD',
             'daily_cost': round(nonprod_cost, 2),
             'fy26_avg_daily_spend': round(nonprod_daily_base, 2),  # Constant average line
             'fy25_avg_daily_spend': round(fy25_nonprod_cost, 2),
             'fy24_avg_daily_spend': round(fy24_nonprod_cost, 2),
-            'fy26_ytd_avg_daily_spend': round(nonprod_cost, 2) if date <= current_date else 0.0
+            'fy26_ytd_avg_daily_spend': round(nonprod_cost, 2) if day <= current_date else 0.0
         })
     
     return pd.DataFrame(daily_data)
\ No newline at end of file
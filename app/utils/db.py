@@ -2,13 +2,59 @@
 BigQuery utilities for FinOps360 cost analysis.
 """
 import os
+import time
+import functools
+import hashlib
 import logging
+import threading
+from datetime import date, datetime
 import pandas as pd
+import pyarrow as pa
 from google.cloud import bigquery
-from typing import Optional, List, Dict, Any, Union
+from typing import Optional, List, Dict, Any, Iterator, Union
+
+from app.utils.config_loader import load_config
+
+try:
+    from google.cloud import bigquery_storage
+except ImportError:
+    bigquery_storage = None
 
 logger = logging.getLogger(__name__)
 
+# Shared BigQuery Storage API client, created on first use
+_bqstorage_client = None
+_bqstorage_lock = threading.Lock()
+
+# Arrow-backed dtype for STRING result columns. pandas 3 (or pandas 2 with
+# future.infer_string) already converts Arrow strings to its Arrow-backed str
+# dtype; otherwise they would become object columns of Python strings.
+_STRING_DTYPE = None if pd.options.future.infer_string else pd.StringDtype("pyarrow")
+
+# On-disk query result cache defaults (overridden by the query_cache config section)
+QUERY_CACHE_DIR = "~/.cache/finops"
+QUERY_CACHE_TTL_HOURS = 12
+
+# Set by `python -m app --no-cache` to bypass the on-disk query result cache
+NO_QUERY_CACHE_ENV = "FINOPS_NO_QUERY_CACHE"
+
+# SQL templates live next to the app package in app/sql
+SQL_DIR = os.path.normpath(os.path.join(os.path.dirname(__file__), "..", "sql"))
+
+@functools.lru_cache(maxsize=None)
+def _read_sql_template(query_name: str) -> str:
+    """
+    Read a SQL template file, once per process.
+    
+    Args:
+        query_name: Name of the SQL file (without extension)
+        
+    Returns:
+        Unformatted SQL template text
+    """
+    with open(os.path.join(SQL_DIR, f"{query_name}.sql"), 'r') as f:
+        return f.read()
+
 def load_sql_query(query_name: str, **kwargs) -> str:
     """
     Load a SQL query from file and format it with parameters.
@@ -20,29 +66,15 @@ def load_sql_query(query_name: str, **kwargs) -> str:
     Returns:
         Formatted SQL query string
     """
-    # Determine the base path of the application
-    base_dir = os.path.normpath(os.path.join(os.path.dirname(__file__), "../.."))
-    sql_dir = os.path.join(base_dir, "app", "sql")
-    
-    # Full path to the SQL file
-    sql_file = os.path.join(sql_dir, f"{query_name}.sql")
-    
     try:
-        # Log query loading
-        logger.info(f"Loading SQL query: {query_name}")
-        
-        # Log parameters
-        if kwargs:
-            logger.info(f"Query parameters:")
-            for key, value in kwargs.items():
-                logger.info(f"  {key}: {value}")
+        logger.info(f"Loading SQL query: {query_name} {kwargs}" if kwargs else f"Loading SQL query: {query_name}")
         
-        with open(sql_file, 'r') as f:
-            query = f.read()
+        query = _read_sql_template(query_name)
         
-        # Format the query with the provided parameters
+        # Format the query with the provided parameters (format_map uses the
+        # kwargs dict as is instead of unpacking it into a new one)
         if kwargs:
-            query = query.format(**kwargs)
+            query = query.format_map(kwargs)
             
         return query
     except Exception as e:
@@ -65,13 +97,244 @@ def setup_bigquery_client(project_id: str, credentials_path: Optional[str] = Non
     
     return bigquery.Client(project=project_id)
 
-def run_query(client: bigquery.Client, query: str) -> pd.DataFrame:
+def get_bqstorage_client() -> Optional["bigquery_storage.BigQueryReadClient"]:
+    """
+    Get the shared BigQuery Storage API read client.
+    
+    The client (and its gRPC channel) is created once per process and reused
+    by every query download instead of being rebuilt for each query.
+    
+    Returns:
+        BigQueryReadClient, or None if google-cloud-bigquery-storage is not
+        installed or the client could not be created
+    """
+    global _bqstorage_client
+    if bigquery_storage is None:
+        return None
+    with _bqstorage_lock:
+        if _bqstorage_client is None:
+            try:
+                _bqstorage_client = bigquery_storage.BigQueryReadClient()
+                logger.info("Created BigQuery Storage API client")
+            except Exception as e:
+                logger.warning(f"BigQuery Storage API unavailable, using REST downloads: {e}")
+                return None
+        return _bqstorage_client
+
+def date_params(**dates: Union[date, str]) -> List[bigquery.ScalarQueryParameter]:
+    """
+    Build DATE query parameters for a parameterized query.
+    
+    Args:
+        **dates: Parameter names mapped to dates (or ISO date strings)
+        
+    Returns:
+        List of ScalarQueryParameter, one per date
+    """
+    return [bigquery.ScalarQueryParameter(name, "DATE", value) for name, value in dates.items()]
+
+# BigQuery parameter type for each Python value type, most specific first
+# (bool is an int subclass and datetime is a date subclass)
+_PARAM_TYPES = (
+    (bool, "BOOL"),
+    (int, "INT64"),
+    (float, "FLOAT64"),
+    (datetime, "DATETIME"),
+    (date, "DATE"),
+    (str, "STRING"),
+)
+
+def query_params(**values: Any) -> List[bigquery.ScalarQueryParameter]:
+    """
+    Build query parameters, inferring each BigQuery type from its Python value.
+    
+    Args:
+        **values: Parameter names mapped to bool, int, float, datetime, date or str values
+        
+    Returns:
+        List of ScalarQueryParameter, one per value
+        
+    Raises:
+        TypeError: If a value has no matching BigQuery type
+    """
+    params = []
+    for name, value in values.items():
+        param_type = next((bq_type for py_type, bq_type in _PARAM_TYPES if isinstance(value, py_type)), None)
+        if param_type is None:
+            raise TypeError(f"Unsupported type for query parameter {name}: {type(value).__name__}")
+        params.append(bigquery.ScalarQueryParameter(name, param_type, value))
+    return params
+
+def _query_cache_path(query: str, params: Optional[List[bigquery.ScalarQueryParameter]]) -> Optional[str]:
+    """
+    Get the on-disk cache file for a query and its parameters.
+    
+    Args:
+        query: SQL query text
+        params: Query parameters
+        
+    Returns:
+        Path of the Parquet cache file, or None if the cache is disabled
+    """
+    if os.environ.get(NO_QUERY_CACHE_ENV):
+        return None
+    cache_config = load_config("config.yaml").get('query_cache', {})
+    if not cache_config.get('enabled', False):
+        return None
+    
+    key = hashlib.blake2b(digest_size=16)
+    key.update(query.encode())
+    for param in params or ():
+        key.update(repr((param.name, param.type_, str(param.value))).encode())
+    cache_dir = os.path.expanduser(cache_config.get('directory') or QUERY_CACHE_DIR)
+    return os.path.join(cache_dir, f"{key.hexdigest()}.parquet")
+
+def _query_cache_ttl_seconds() -> float:
+    """Get the maximum age of a cached query result in seconds."""
+    ttl_hours = load_config("config.yaml").get('query_cache', {}).get('ttl_hours', QUERY_CACHE_TTL_HOURS)
+    return ttl_hours * 3600
+
+def _prune_query_cache(cache_dir: str) -> None:
+    """
+    Remove cached query results older than the cache TTL.
+    
+    Args:
+        cache_dir: Query cache directory
+    """
+    ttl_seconds = _query_cache_ttl_seconds()
+    now = time.time()
+    try:
+        with os.scandir(cache_dir) as it:
+            expired = [entry.path for entry in it
+                       if entry.name.endswith('.parquet') and now - entry.stat().st_mtime > ttl_seconds]
+    except OSError as e:
+        logger.debug("Could not list query cache %s: %s", cache_dir, e)
+        return
+    
+    for path in expired:
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+def _read_cached_result(path: str) -> Optional[pd.DataFrame]:
+    """
+    Read a cached query result if it exists and has not expired.
+    
+    Expired files are removed.
+    
+    Args:
+        path: Parquet cache file
+        
+    Returns:
+        Cached DataFrame, or None on a miss
+    """
+    try:
+        if time.time() - os.path.getmtime(path) > _query_cache_ttl_seconds():
+            os.remove(path)
+            return None
+        return pd.read_parquet(path)
+    except FileNotFoundError:
+        return None
+    except Exception as e:
+        logger.warning(f"Ignoring unreadable query cache file {path}: {e}")
+        return None
+
+def _write_cached_result(path: str, df: pd.DataFrame) -> None:
+    """
+    Store a query result in the on-disk cache, removing expired results
+    from the cache directory.
+    
+    Args:
+        path: Parquet cache file
+        df: Query result
+    """
+    tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        df.to_parquet(tmp_path, index=False)
+        os.replace(tmp_path, path)
+    except Exception as e:
+        logger.warning(f"Could not write query cache file {path}: {e}")
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+    _prune_query_cache(os.path.dirname(path))
+
+def index_by_environment(df: pd.DataFrame, columns: Optional[List[str]] = None) -> Dict[str, Dict[str, Any]]:
+    """
+    Index a query result by environment type.
+    
+    Converts the DataFrame to plain dicts once so per-environment values can
+    be read with dict lookups instead of boolean-mask scans.
+    
+    Args:
+        df: DataFrame with an environment_type column
+        columns: Columns to keep (default: all)
+        
+    Returns:
+        Mapping of environment type to that environment's first row as a dict,
+        or an empty dict if the DataFrame is empty or has no environment_type
+    """
+    if df.empty or 'environment_type' not in df.columns:
+        return {}
+    indexed = df.drop_duplicates('environment_type').set_index('environment_type')
+    if columns is not None:
+        indexed = indexed[[column for column in columns if column in indexed.columns]]
+    return indexed.to_dict('index')
+
+def split_by_environment(df: pd.DataFrame) -> Dict[str, pd.DataFrame]:
+    """
+    Split a query result into one frame per environment type.
+    
+    Groups once on a categorical view of environment_type (integer codes
+    rather than string hashing), so callers that need several environments'
+    rows can look them up instead of filtering the frame again each time.
+    
+    Args:
+        df: DataFrame with an environment_type column
+        
+    Returns:
+        Mapping of environment type to its rows, in order of first appearance,
+        or an empty dict if the DataFrame is empty or has no environment_type
+    """
+    if df.empty or 'environment_type' not in df.columns:
+        return {}
+    environment = df['environment_type'].astype('category')
+    return {env: group for env, group in df.groupby(environment, sort=False, observed=True)}
+
+def _arrow_types_mapper(arrow_type: pa.DataType) -> Optional[pd.api.extensions.ExtensionDtype]:
+    """
+    Map Arrow result column types to pandas dtypes.
+    
+    Strings keep their Arrow buffers; numeric columns use the default NumPy
+    dtypes so they can be passed straight to the numpy cost kernels.
+    
+    Args:
+        arrow_type: Arrow type of a result column
+        
+    Returns:
+        pandas dtype for the column, or None for the default conversion
+    """
+    if pa.types.is_string(arrow_type) or pa.types.is_large_string(arrow_type):
+        return _STRING_DTYPE
+    return None
+
+def run_query(
+    client: bigquery.Client,
+    query: str,
+    params: Optional[List[bigquery.ScalarQueryParameter]] = None,
+    use_bqstorage: bool = True
+) -> pd.DataFrame:
     """
     Run a BigQuery query and return results as a DataFrame.
     
     Args:
         client: BigQuery client
         query: SQL query to execute
+        params: Query parameters referenced as @name in the query (optional)
+        use_bqstorage: Download results through the BigQuery Storage API.
+            Pass False for queries that return a handful of aggregated rows,
+            where the REST response is faster than opening a read session.
         
     Returns:
         DataFrame with query results
@@ -81,37 +344,87 @@ def run_query(client: bigquery.Client, query: str) -> pd.DataFrame:
         logger.warning("Using mock BigQuery client - returning empty DataFrame to trigger sample data")
         return pd.DataFrame()
         
+    # Serve repeat queries from the on-disk cache within the TTL
+    cache_path = _query_cache_path(query, params)
+    if cache_path:
+        cached = _read_cached_result(cache_path)
+        if cached is not None:
+            logger.info(f"Using cached query result: {cache_path}")
+            return cached
+        
     try:
         # Log the query for debugging purposes
         logger.info(f"Executing query: \n{query}\n")
         
-        # Execute the query
-        job = client.query(query)
+        # Execute the query. Dates are bound as parameters so the query text
+        # stays identical between runs and can be served from the result cache
+        job_config = bigquery.QueryJobConfig(query_parameters=params or [], use_query_cache=True)
+        job = client.query(query, job_config=job_config)
         
         # Log query execution details
         logger.info(f"Query job ID: {job.job_id}")
         logger.info(f"Query state: {job.state}")
         
-        # Convert to dataframe with error handling for db-dtypes
-        try:
-            # Try with optimized storage client
-            df = job.to_dataframe(create_bqstorage_client=True)
-        except ImportError as e:
-            if "db-dtypes" in str(e):
-                logger.warning("db-dtypes package not found. Using standard conversion method.")
-                # Fall back to standard conversion without BigQuery Storage API
-                df = job.to_dataframe(create_bqstorage_client=False)
-            else:
-                # Re-raise other import errors
-                raise
+        # Download the result as an Arrow table through the shared Storage API
+        # client (falls back to the REST path when it is unavailable) and
+        # convert it to pandas column by column, keeping string columns
+        # Arrow-backed. DATE columns come back as datetime.date objects, so
+        # db-dtypes is not needed. Each column gets its own block and its
+        # Arrow buffers are released as it is converted, so the table and
+        # the DataFrame are not both held in full at peak.
+        bqstorage_client = get_bqstorage_client() if use_bqstorage else None
+        arrow_table = job.to_arrow(bqstorage_client=bqstorage_client, create_bqstorage_client=False)
+        df = arrow_table.to_pandas(types_mapper=_arrow_types_mapper, split_blocks=True, self_destruct=True)
+        del arrow_table
         
         # Log result summary
         logger.info(f"Query returned {len(df)} rows")
         if not df.empty:
             logger.info(f"Columns: {df.columns.tolist()}")
+            if cache_path:
+                _write_cached_result(cache_path, df)
         
         return df
     except Exception as e:
         logger.error(f"Error running query: {e}")
         logger.error(f"Query: {query}")
-        return pd.DataFrame()
\ No newline at end of file
+        return pd.DataFrame()
+
+def iter_query(
+    client: bigquery.Client,
+    query: str,
+    params: Optional[List[bigquery.ScalarQueryParameter]] = None,
+    page_size: int = 50000,
+    use_bqstorage: bool = True
+) -> Iterator[pd.DataFrame]:
+    """
+    Run a BigQuery query and yield its results one page at a time.
+    
+    For large result sets that a caller can aggregate incrementally, so the
+    full result never has to be held in memory at once. Results are not read
+    from or written to the on-disk query cache. Unlike run_query, errors are
+    raised to the caller, since a partial result cannot be told apart from a
+    complete one.
+    
+    Args:
+        client: BigQuery client
+        query: SQL query to execute
+        params: Query parameters referenced as @name in the query (optional)
+        page_size: Rows per page when results are read through the REST API
+        use_bqstorage: Download results through the BigQuery Storage API,
+            which yields one frame per Arrow record batch instead of per page
+        
+    Yields:
+        DataFrame for each page or record batch of results
+    """
+    # Check if client is a mock (sample data mode)
+    if hasattr(client, "__class__") and client.__class__.__name__ == "MagicMock":
+        logger.warning("Using mock BigQuery client - no rows to stream")
+        return
+    
+    logger.info(f"Executing streamed query: \n{query}\n")
+    job_config = bigquery.QueryJobConfig(query_parameters=params or [], use_query_cache=True)
+    rows = client.query(query, job_config=job_config).result(page_size=page_size)
+    bqstorage_client = get_bqstorage_client() if use_bqstorage else None
+    for batch in rows.to_arrow_iterable(bqstorage_client=bqstorage_client):
+        yield batch.to_pandas(types_mapper=_arrow_types_mapper)
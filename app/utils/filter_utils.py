@@ -4,7 +4,10 @@ Utilities for handling search filters in the FinOps360 dashboard.
 import logging
 from typing import Dict, Any, List, Optional, Tuple
 
+from google.cloud import bigquery
+
 from app.utils.config_loader import load_config
+from app.utils.db import query_params
 
 logger = logging.getLogger(__name__)
 
@@ -15,7 +18,8 @@ def format_sql_filters(
     include_where: bool = False
 ) -> Dict[str, str]:
     """
-    Format SQL filter conditions safely, escaping single quotes to prevent SQL injection.
+    Format SQL filter conditions that reference the @cto, @pillar and @product
+    query parameters, so filter values never become part of the SQL text.
     
     Args:
         cto: CTO organization filter value
@@ -26,12 +30,6 @@ def format_sql_filters(
     Returns:
         Dictionary with filter conditions ready for SQL substitution
     """
-    # Helper to escape single quotes in SQL strings
-    def escape_sql_string(s: str) -> str:
-        if s is None:
-            return ""
-        return s.replace("'", "''")
-    
     # Start with empty filters
     filters = {
         'cto_filter': "",
@@ -44,27 +42,43 @@ def format_sql_filters(
     
     # Add CTO filter if provided
     if cto:
-        safe_cto = escape_sql_string(cto)
         prefix = "WHERE" if include_where and not has_filters else "AND"
-        filters['cto_filter'] = f"{prefix} cto = '{safe_cto}'"
+        filters['cto_filter'] = f"{prefix} cto = @cto"
         has_filters = True
     
     # Add Pillar filter if provided  
     if pillar:
-        safe_pillar = escape_sql_string(pillar)
         prefix = "WHERE" if include_where and not has_filters else "AND"
-        filters['pillar_filter'] = f"{prefix} tr_product_pillar_team = '{safe_pillar}'"
+        filters['pillar_filter'] = f"{prefix} tr_product_pillar_team = @pillar"
         has_filters = True
     
     # Add Product filter if provided
     if product:
-        safe_product = escape_sql_string(product)
         prefix = "WHERE" if include_where and not has_filters else "AND"
-        filters['product_filter'] = f"{prefix} tr_product_id = '{safe_product}'"
+        filters['product_filter'] = f"{prefix} tr_product_id = @product"
         has_filters = True
     
     return filters
 
+def filter_query_params(
+    cto: Optional[str] = None,
+    pillar: Optional[str] = None,
+    product: Optional[str] = None
+) -> List[bigquery.ScalarQueryParameter]:
+    """
+    Build the query parameters referenced by the conditions from format_sql_filters.
+    
+    Args:
+        cto: CTO organization filter value
+        pillar: Pillar team filter value
+        product: Product ID filter value
+        
+    Returns:
+        List of STRING query parameters for the filters that are set
+    """
+    values = {'cto': cto, 'pillar': pillar, 'product': product}
+    return query_params(**{name: value for name, value in values.items() if value})
+
 def get_filter_values(filters: Dict[str, Any]) -> Tuple[Optional[str], Optional[str], Optional[str], bool]:
     """
     Extract filter values from request parameters.
@@ -0,0 +1,112 @@
+"""
+Numeric kernels for FinOps360 cost tables.
+
+Kernels are compiled with numba when it is installed and fall back to
+vectorized numpy otherwise, so numba stays an optional dependency.
+"""
+import logging
+from typing import Tuple
+
+import numpy as np
+
+try:
+    import numba
+except ImportError:
+    numba = None
+
+logger = logging.getLogger(__name__)
+
+# Below this many rows the numpy version is faster than dispatching to numba
+NUMBA_MIN_ROWS = 10_000
+
+
+def _cost_totals_numpy(prod: np.ndarray, nonprod: np.ndarray, total: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Vectorized numpy implementation of cost_totals.
+    """
+    total = np.where((total == 0) & ((prod > 0) | (nonprod > 0)), prod + nonprod, total)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        percentage = np.where(total > 0, nonprod / total * 100, 0.0)
+    return total, percentage
+
+
+if numba is not None:
+    @numba.njit(cache=True, parallel=True)
+    def _cost_totals_numba(prod, nonprod, total):
+        n = total.shape[0]
+        out_total = np.empty(n, dtype=np.float64)
+        out_percentage = np.empty(n, dtype=np.float64)
+        for i in numba.prange(n):
+            t = total[i]
+            if t == 0 and (prod[i] > 0 or nonprod[i] > 0):
+                t = prod[i] + nonprod[i]
+            out_total[i] = t
+            out_percentage[i] = nonprod[i] / t * 100 if t > 0 else 0.0
+        return out_total, out_percentage
+else:
+    _cost_totals_numba = None
+
+
+def cost_totals(prod: np.ndarray, nonprod: np.ndarray, total: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Compute row totals and nonprod percentages for a cost breakdown.
+
+    Totals of 0 are replaced with prod + nonprod where either is positive,
+    and the nonprod percentage is 0 wherever the total is not positive.
+
+    Args:
+        prod: Production costs
+        nonprod: Non-production costs
+        total: Reported total costs
+
+    Returns:
+        Tuple of (totals, nonprod percentages) as float64 arrays
+    """
+    prod = np.asarray(prod, dtype=np.float64)
+    nonprod = np.asarray(nonprod, dtype=np.float64)
+    total = np.asarray(total, dtype=np.float64)
+    if _cost_totals_numba is not None and total.shape[0] >= NUMBA_MIN_ROWS:
+        return _cost_totals_numba(prod, nonprod, total)
+    return _cost_totals_numpy(prod, nonprod, total)
+
+
+def _grouped_sums_numpy(codes: np.ndarray, values: np.ndarray, n_groups: int) -> np.ndarray:
+    """
+    Vectorized numpy implementation of grouped_sums.
+    """
+    return np.column_stack([
+        np.bincount(codes, weights=values[:, j], minlength=n_groups) for j in range(values.shape[1])
+    ]).reshape(n_groups, values.shape[1])
+
+
+if numba is not None:
+    @numba.njit(cache=True)
+    def _grouped_sums_numba(codes, values, n_groups):
+        out = np.zeros((n_groups, values.shape[1]), dtype=np.float64)
+        for i in range(codes.shape[0]):
+            group = codes[i]
+            for j in range(values.shape[1]):
+                out[group, j] += values[i, j]
+        return out
+else:
+    _grouped_sums_numba = None
+
+
+def grouped_sums(codes: np.ndarray, values: np.ndarray, n_groups: int) -> np.ndarray:
+    """
+    Sum columns of values per group, for integer group codes such as those
+    from pd.factorize.
+
+    Args:
+        codes: Group code of each row, in [0, n_groups)
+        values: 2-D array of values to sum, one row per code
+        n_groups: Number of groups
+
+    Returns:
+        float64 array of shape (n_groups, number of value columns)
+    """
+    codes = np.asarray(codes, dtype=np.intp)
+    values = np.asarray(values, dtype=np.float64)
+    if _grouped_sums_numba is not None and codes.shape[0] >= NUMBA_MIN_ROWS:
+        return _grouped_sums_numba(codes, values, n_groups)
+    return _grouped_sums_numpy(codes, values, n_groups)